@@ -1,83 +1,36 @@
 import asyncio
-import base64
 import json
 import multiprocessing as mp
 import os
-import pathlib
 import threading
 import time
+import uuid
 from collections import deque
-from typing import List, Optional, Tuple
+from contextlib import asynccontextmanager
+from multiprocessing.connection import wait as wait_connections
+from typing import Dict, List, Optional, Tuple
 
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from fastapi import FastAPI, Form, Request
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 import macro_core
+from cycle_metrics import MetricsRegistry
+from env_crypto import decrypt_env_vars, encrypt_env_vars
+from log_transport import LogBatcher, unpack
+from scan_engine import train_key
+from seat_history import DEFAULT_QUERY_LIMIT, history_path, seat_openings
 
-app = FastAPI(title="SRT Macro Controller")
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    POOL.ensure()
+    MONITOR.start()
+    yield
+    MONITOR.shutdown()
+    POOL.shutdown()
 
-# 환경변수 암호화 관련
-ENV_FILE = pathlib.Path(".env.encrypted")
-KEY_FILE = pathlib.Path(".env.key")
 
-
-def get_encryption_key() -> bytes:
-    """암호화 키를 가져오거나 생성합니다."""
-    if KEY_FILE.exists():
-        return KEY_FILE.read_bytes()
-    # 새 키 생성 (기기 고유 정보 기반)
-    import platform
-    
-    machine_id = f"{platform.node()}{os.getcwd()}"
-    # PBKDF2를 사용하여 키 생성
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=b"srt_macro_salt",
-        iterations=100000,
-    )
-    key = base64.urlsafe_b64encode(kdf.derive(machine_id.encode()))
-    KEY_FILE.write_bytes(key)
-    KEY_FILE.chmod(0o600)  # 소유자만 읽기/쓰기
-    return key
-
-
-def encrypt_env_vars(env_vars: dict[str, str]) -> bool:
-    """환경변수를 암호화하여 저장합니다."""
-    try:
-        key = get_encryption_key()
-        fernet = Fernet(key)
-        
-        env_json = json.dumps(env_vars, ensure_ascii=False)
-        encrypted = fernet.encrypt(env_json.encode())
-        
-        ENV_FILE.write_bytes(encrypted)
-        ENV_FILE.chmod(0o600)  # 소유자만 읽기/쓰기
-        return True
-    except Exception as e:
-        print(f"[env] 암호화 저장 실패: {e}")
-        return False
-
-
-def decrypt_env_vars() -> Optional[dict[str, str]]:
-    """암호화된 환경변수를 복호화하여 반환합니다."""
-    if not ENV_FILE.exists():
-        return None
-    try:
-        key = get_encryption_key()
-        fernet = Fernet(key)
-        
-        encrypted = ENV_FILE.read_bytes()
-        decrypted = fernet.decrypt(encrypted)
-        env_vars = json.loads(decrypted.decode())
-        return env_vars
-    except Exception as e:
-        print(f"[env] 복호화 실패: {e}")
-        return None
+app = FastAPI(title="SRT Macro Controller", lifespan=lifespan)
 
 
 def load_env_vars() -> dict[str, str]:
@@ -116,48 +69,257 @@ def apply_env_vars_to_os() -> None:
             os.environ[key] = value
 
 
-# Simple process manager to run/stop the macro
-class MacroState:
+# 로그인까지 마친 브라우저 워커를 미리 띄워두는 풀 (MACRO_POOL_SIZE, 기본 0 = 사용 안 함)
+class PoolWorker:
     def __init__(self) -> None:
+        self.job_q: mp.Queue = mp.Queue()
+        self.status_q: mp.Queue = mp.Queue()
+        self.logs_q: mp.Queue = mp.Queue()
+        self.spawned_at = time.time()
+        self.warm_at: Optional[float] = None
+        self.failed = False
+        # Do not run as daemon (Playwright spawns children)
+        self.proc = mp.Process(target=run_pool_worker, args=(self.job_q, self.status_q, self.logs_q))
+        self.proc.start()
+
+    @property
+    def alive(self) -> bool:
+        return not self.failed and self.proc.is_alive()
+
+    @property
+    def warm(self) -> bool:
+        return self.warm_at is not None and self.alive
+
+    def poll(self) -> None:
+        """작업 배정 전 상태 메시지(warm/error/finished)를 확인합니다."""
+        try:
+            while True:
+                msg = self.status_q.get_nowait()
+                if not isinstance(msg, dict):
+                    continue
+                status = msg.get("status")
+                if status == "warm":
+                    self.warm_at = msg.get("at") or time.time()
+                elif status in ("error", "finished"):
+                    self.failed = True
+        except Exception:
+            pass
+
+    def stop(self) -> None:
+        try:
+            self.job_q.put(None)
+        except Exception:
+            pass
+        self.proc.join(timeout=3)
+        if self.proc.is_alive():
+            self.proc.terminate()
+            self.proc.join(timeout=3)
+
+
+class WorkerPool:
+    def __init__(self, size: int) -> None:
+        self.size = max(0, size)
+        self._workers: List[PoolWorker] = []
+        self._lock = threading.Lock()
+
+    def ensure(self) -> None:
+        """죽은 워커를 정리하고 풀 크기만큼 워커를 채웁니다."""
+        if self.size == 0:
+            return
+        env_check = check_env_vars()
+        if not env_check.get("MEMBER_NUMBER") or not env_check.get("PASSWORD"):
+            return
+        with self._lock:
+            alive = []
+            for worker in self._workers:
+                worker.poll()
+                if worker.alive:
+                    alive.append(worker)
+                else:
+                    worker.stop()
+            self._workers = alive
+            if len(self._workers) < self.size:
+                apply_env_vars_to_os()
+            while len(self._workers) < self.size:
+                self._workers.append(PoolWorker())
+
+    def acquire(self) -> Optional[PoolWorker]:
+        """warm 상태인 워커 하나를 풀에서 꺼냅니다. 없으면 None."""
+        with self._lock:
+            for worker in self._workers:
+                worker.poll()
+            warm = [w for w in self._workers if w.warm]
+            if not warm:
+                return None
+            worker = min(warm, key=lambda w: w.warm_at or 0)
+            self._workers.remove(worker)
+            return worker
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            for worker in self._workers:
+                worker.poll()
+            warm = sum(1 for w in self._workers if w.warm)
+            return {
+                "size": self.size,
+                "warm": warm,
+                "starting": sum(1 for w in self._workers if w.alive) - warm,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+
+POOL = WorkerPool(int(os.getenv("MACRO_POOL_SIZE", "0")))
+# 모든 작업의 새로고침 구간별 소요 시간 (/metrics, /status)
+METRICS = MetricsRegistry()
+
+
+LogEntry = Tuple[int, str]
+
+
+class _LogListener:
+    """SSE 구독자 하나. 쌓인 줄을 루프 콜백 한 번에 배치로 넘깁니다."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.pending: List[LogEntry] = []
+        self.scheduled = False
+        self.dropped = 0
+        # 구독 시점의 마지막 순번 (이후 줄부터 pending으로 들어옴)
+        self.start_seq = 0
+
+
+class LogChannel:
+    """순번이 붙은 로그 링 버퍼와 SSE 구독자 팬아웃."""
+
+    def __init__(self, maxlen: int = 500) -> None:
+        self.buffer: deque[LogEntry] = deque(maxlen=maxlen)
+        self.seq = 0
+        # 느린 구독자 큐가 가득 차서 버린 줄 수 (재연결 시 링 버퍼에서 다시 받을 수 있음)
+        self.dropped = 0
+        self._listeners: List[_LogListener] = []
+        self._lock = threading.Lock()
+
+    def append(self, line: str) -> None:
+        self.extend([line])
+
+    def extend(self, lines: List[str]) -> None:
+        """여러 줄을 순번을 붙여 저장하고, 구독자마다 대기 중인 전달이 없을 때만 콜백을 예약합니다."""
+        if not lines:
+            return
+        with self._lock:
+            batch = []
+            for line in lines:
+                self.seq += 1
+                batch.append((self.seq, line))
+            self.buffer.extend(batch)
+            wake = []
+            for listener in self._listeners:
+                listener.pending.extend(batch)
+                if not listener.scheduled:
+                    listener.scheduled = True
+                    wake.append(listener)
+        for listener in wake:
+            try:
+                listener.loop.call_soon_threadsafe(self._deliver, listener)
+            except Exception:
+                pass
+
+    def _deliver(self, listener: _LogListener) -> None:
+        with self._lock:
+            batch, listener.pending = listener.pending, []
+            listener.scheduled = False
+        if not batch:
+            return
+        try:
+            listener.queue.put_nowait(batch)
+        except asyncio.QueueFull:
+            listener.dropped += len(batch)
+            self.dropped += len(batch)
+
+    def since(self, seq: int, limit: Optional[int] = None) -> List[LogEntry]:
+        """seq 이후의 줄을 버퍼에서 꺼냅니다 (버퍼에서 밀려난 줄은 제외)."""
+        with self._lock:
+            entries = [entry for entry in self.buffer if entry[0] > seq]
+        return entries[:limit] if limit is not None else entries
+
+    async def wait_after(self, seq: int, timeout: float) -> None:
+        """seq 이후 줄이 들어오거나 timeout이 지날 때까지 기다립니다 (long-poll)."""
+        if self.seq > seq or timeout <= 0:
+            return
+        listener = self.subscribe()
+        try:
+            if listener.start_seq <= seq:
+                await asyncio.wait_for(listener.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.unsubscribe(listener)
+
+    def subscribe(self, maxsize: int = 256) -> _LogListener:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = asyncio.get_event_loop()
+        listener = _LogListener(loop, maxsize)
+        with self._lock:
+            listener.start_seq = self.seq
+            self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener: _LogListener) -> None:
+        with self._lock:
+            self._listeners = [item for item in self._listeners if item is not listener]
+
+
+# Simple process manager to run/stop the macro (작업 하나 = 프로세스 하나)
+class MacroState:
+    def __init__(self, job_id: str = "", sink: Optional[LogChannel] = None) -> None:
+        self.job_id = job_id
         self.proc: Optional[mp.Process] = None
         self.started_at: Optional[float] = None
         self.last_error: Optional[str] = None
         self._status_q: Optional[mp.Queue] = None
         self._logs_q: Optional[mp.Queue] = None
         self._log_thread: Optional[threading.Thread] = None
-        self._log_buffer: deque[str] = deque(maxlen=500)
-        self._listeners: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        # 워커가 붙인 마지막 로그 순번 (중복/역순 배치 무시)
+        self.log_seq = 0
+        self.logs = LogChannel()
+        # 모든 작업의 로그를 모아 보는 채널 (/logs)
+        self._sink = sink
         # 현재 실행 중인 파라미터 저장
         self.current_params: Optional[dict] = None
+        # 작업별 시작 정보 (warm/cold, time-to-first-scan)
+        self.current_job: Optional[dict] = None
+        # 새로고침 조절기 최근 상태 (딜레이, 사이클 지연, 달성 조회 수)
+        self.governor: Optional[dict] = None
+        # start()가 끝난 뒤부터 StatusMonitor가 status_q/프로세스를 감시
+        self.monitored = False
+        # start/stop(요청 스레드)과 refresh(StatusMonitor 스레드)가 proc을 동시에 바꾸지 않도록
+        self._lock = threading.RLock()
 
     @property
     def running(self) -> bool:
-        if self.proc is None:
-            return False
-        # 프로세스가 종료되었는지 확인
-        if not self.proc.is_alive():
-            # 프로세스가 종료되었으면 상태 정리
-            if self._status_q is not None:
-                try:
-                    while True:
-                        msg = self._status_q.get_nowait()
-                        if isinstance(msg, dict):
-                            status = msg.get("status")
-                            if status == "error":
-                                error_msg = msg.get("message") or "실행 중 오류 발생"
-                                self.last_error = self._clean_error_message(error_msg)
-                except Exception:
-                    pass
-            # 상태 정리
-            self.proc = None
-            self.started_at = None
-            self._status_q = None
-            self._logs_q = None
-            self.current_params = None
-            return False
-        return True
+        # 프로세스 종료는 StatusMonitor가 sentinel로 감지해 proc을 정리함
+        return self.proc is not None
+
+    def _clear(self) -> None:
+        self.proc = None
+        self.started_at = None
+        self._status_q = None
+        self._logs_q = None
+        self.current_params = None
 
     def start(self, **kwargs) -> bool:
+        with self._lock:
+            return self._start(**kwargs)
+
+    def _start(self, **kwargs) -> bool:
         if self.running:
             return False
         # Reset previous error
@@ -171,142 +333,139 @@ class MacroState:
             "standard_date": kwargs.get("standard_date"),
             "standard_time": kwargs.get("standard_time"),
             "seat_types": kwargs.get("seat_types"),
+            "scan_mode": kwargs.get("scan_mode"),
+            "block_profile": kwargs.get("block_profile"),
+            "time_windows": kwargs.get("time_windows"),
         }
-        # Queues for status and logs
-        status_q: mp.Queue = mp.Queue()
-        logs_q: mp.Queue = mp.Queue()
-        kwargs = dict(kwargs)
-        kwargs["status_q"] = status_q
-        kwargs["logs_q"] = logs_q
-        # Do not run as daemon (Playwright spawns children)
-        self.proc = mp.Process(target=run_macro, kwargs=kwargs)
-        self.proc.start()
         self.started_at = time.time()
+        worker = POOL.acquire()
+        try:
+            if worker is not None:
+                # 이미 로그인된 워커에 조회 조건만 전달
+                status_q, logs_q = worker.status_q, worker.logs_q
+                self.proc = worker.proc
+                worker.job_q.put(dict(kwargs))
+            else:
+                # Queues for status and logs
+                status_q = mp.Queue()
+                logs_q = mp.Queue()
+                kwargs = dict(kwargs)
+                kwargs["status_q"] = status_q
+                kwargs["logs_q"] = logs_q
+                # Do not run as daemon (Playwright spawns children)
+                self.proc = mp.Process(target=run_macro, kwargs=kwargs)
+                self.proc.start()
+        except Exception as e:
+            self.last_error = f"프로세스를 시작하지 못했습니다: {e}"
+            self._clear()
+            return False
+        # 꺼낸 워커 자리를 다시 채움
+        POOL.ensure()
+        self.current_job = {
+            "id": self.job_id,
+            "started_at": self.started_at,
+            "warm": worker is not None,
+            "time_to_first_scan": None,
+            # 마지막으로 도달한 단계와 단계별 도달 시각 (시작 후 초)
+            "stage": None,
+            "stages": {},
+        }
         self._status_q = status_q
         self._logs_q = logs_q
         # Start log pump thread
         self._start_log_pump()
+        # 시작 오류와 진행 단계는 StatusMonitor가 status_q에서 받아 반영
+        return True
 
-        # Wait briefly for immediate startup errors
-        try:
-            msg = status_q.get(timeout=8)
-        except Exception:
-            # No immediate message; if process already died, treat as error
-            if not self.running:
-                exitcode = self.proc.exitcode if self.proc else None
-                self.last_error = f"프로세스가 즉시 종료되었습니다. exitcode={exitcode}"
-                self.proc = None
-                self.started_at = None
-                self._status_q = None
-                self._logs_q = None
+    def stop(self) -> bool:
+        with self._lock:
+            proc = self.proc
+            if proc is None:
                 return False
+            if proc.is_alive():
+                proc.terminate()
+                try:
+                    proc.join(timeout=5)
+                except Exception:
+                    pass
+            self._clear()
             return True
 
-        # Handle message
-        if isinstance(msg, dict):
-            status = msg.get("status")
-            if status == "error":
-                error_msg = msg.get("message") or "시작 중 알 수 없는 오류"
-                self.last_error = self._clean_error_message(error_msg)
-                if self.proc and self.proc.is_alive():
-                    self.proc.terminate()
-                    try:
-                        self.proc.join(timeout=3)
-                    except Exception:
-                        pass
-                self.proc = None
-                self.started_at = None
-                self._status_q = None
-                self._logs_q = None
-                self.current_params = None
-                return False
-            if status == "finished":
-                self.last_error = "작업이 즉시 종료되었습니다. 조건을 확인하세요."
-                self.proc = None
-                self.started_at = None
-                self._status_q = None
-                self._logs_q = None
-                self.current_params = None
-                return False
-        return True
-
-    def stop(self) -> bool:
-        if not self.proc:
-            return False
-        if self.proc.is_alive():
-            self.proc.terminate()
+    def refresh(self) -> None:
+        """status_q를 비워 오류/종료를 반영하고, 프로세스가 끝났으면 정리합니다. (StatusMonitor 스레드에서 호출)"""
+        with self._lock:
+            q = self._status_q
+            if q is not None:
+                try:
+                    while True:
+                        msg = q.get_nowait()
+                        if isinstance(msg, dict):
+                            self._handle_status(msg)
+                except Exception:
+                    pass
+            proc = self.proc
+            if proc is not None and not proc.is_alive():
+                exitcode = proc.exitcode
+                if self.last_error is None and exitcode:
+                    self.last_error = f"프로세스가 종료되었습니다. exitcode={exitcode}"
+                    self._record_stage({"stage": macro_core.STAGE_FAILED})
+                self._clear()
+
+    def _handle_status(self, msg: dict) -> None:
+        if self._record_stats(msg):
+            return
+        status = msg.get("status")
+        if status not in ("error", "finished"):
+            return
+        if status == "error":
+            error_msg = msg.get("message") or "실행 중 오류 발생"
+            self.last_error = self._clean_error_message(error_msg)
+            self._record_stage({"stage": macro_core.STAGE_FAILED})
+        elif self.last_error is None and not self._reached(macro_core.STAGE_SCANNING):
+            self.last_error = "작업이 조회를 시작하기 전에 종료되었습니다. 조건을 확인하세요."
+        proc = self.proc
+        if proc is not None and proc.is_alive():
+            proc.terminate()
             try:
-                self.proc.join(timeout=5)
+                proc.join(timeout=3)
             except Exception:
                 pass
-        self.proc = None
-        self.started_at = None
-        self._status_q = None
-        self._logs_q = None
-        self.current_params = None
+        self._clear()
+
+    def _record_stats(self, msg: dict) -> bool:
+        """진행 통계 메시지(first_scan/governor/metrics)를 반영합니다. 통계 메시지였으면 True."""
+        status = msg.get("status")
+        if status == "first_scan":
+            self._record_first_scan(msg)
+        elif status == "governor":
+            self.governor = {k: v for k, v in msg.items() if k != "status"}
+        elif status == "metrics":
+            METRICS.observe_many(msg.get("samples") or {})
+            METRICS.add_counters(msg.get("counters") or {})
+        elif status == "stage":
+            self._record_stage(msg)
+        else:
+            return False
         return True
 
-    def refresh(self) -> None:
-        """Drain status queue to capture late errors/finish events."""
-        if self.proc is not None and not self.proc.is_alive():
-            if self._status_q is not None or self._logs_q is not None:
-                q = self._status_q
-                if q is not None:
-                    try:
-                        while True:
-                            msg = q.get_nowait()
-                            if isinstance(msg, dict):
-                                status = msg.get("status")
-                                if status == "error":
-                                    error_msg = msg.get("message") or "실행 중 오류 발생"
-                                    self.last_error = self._clean_error_message(error_msg)
-                    except Exception:
-                        pass
-                self.proc = None
-                self.started_at = None
-                self._status_q = None
-                self._logs_q = None
-                self.current_params = None
-                return
-        
-        q = self._status_q
-        if q is None:
+    def _record_stage(self, msg: dict) -> None:
+        """단계별 첫 도달 시각을 작업 시작 기준 초로 기록합니다."""
+        stage = msg.get("stage")
+        if self.current_job is None or not stage or self._reached(stage):
             return
-        try:
-            while True:
-                msg = q.get_nowait()
-                if not isinstance(msg, dict):
-                    continue
-                status = msg.get("status")
-                if status == "error":
-                    error_msg = msg.get("message") or "실행 중 오류 발생"
-                    self.last_error = self._clean_error_message(error_msg)
-                    if self.proc and self.proc.is_alive():
-                        self.proc.terminate()
-                        try:
-                            self.proc.join(timeout=3)
-                        except Exception:
-                            pass
-                    self.proc = None
-                    self.started_at = None
-                    self._status_q = None
-                    self._logs_q = None
-                    self.current_params = None
-                elif status == "finished":
-                    if self.proc and self.proc.is_alive():
-                        self.proc.terminate()
-                        try:
-                            self.proc.join(timeout=3)
-                        except Exception:
-                            pass
-                    self.proc = None
-                    self.started_at = None
-                    self._status_q = None
-                    self._logs_q = None
-                    self.current_params = None
-        except Exception:
-            pass
-    
+        at = msg.get("at") or time.time()
+        self.current_job["stages"][stage] = round(at - self.current_job["started_at"], 3)
+        self.current_job["stage"] = stage
+
+    def _reached(self, stage: str) -> bool:
+        return self.current_job is not None and stage in self.current_job["stages"]
+
+    def _record_first_scan(self, msg: dict) -> None:
+        if self.current_job is None or self.current_job["time_to_first_scan"] is not None:
+            return
+        at = msg.get("at") or time.time()
+        self.current_job["time_to_first_scan"] = round(at - self.current_job["started_at"], 3)
+
     def _clean_error_message(self, error_msg: str) -> str:
         lines = error_msg.split('\n')
         cleaned_lines = []
@@ -331,55 +490,301 @@ class MacroState:
                 if q is None:
                     break
                 try:
-                    line = q.get(timeout=0.5)
+                    item = q.get(timeout=0.5)
                 except Exception:
                     if not self.running:
                         break
                     continue
-                if line is None:
+                if item is None:
                     break
-                try:
-                    s = str(line)
-                except Exception:
-                    s = repr(line)
-                self._append_log(s)
+                lines = []
+                for seq, _ts, text in unpack(item):
+                    if seq:
+                        if seq <= self.log_seq:
+                            continue
+                        self.log_seq = seq
+                    lines.append(text)
+                self._append_logs(lines)
             self._logs_q = None
 
         self._log_thread = threading.Thread(target=_worker, daemon=True)
         self._log_thread.start()
 
-    def _append_log(self, line: str) -> None:
-        self._log_buffer.append(line)
-        def _safe_put(q: asyncio.Queue, item: str):
+    def _append_logs(self, lines: List[str]) -> None:
+        self.logs.extend(lines)
+        if self._sink is not None:
+            self._sink.extend([f"[{self.job_id}] {line}" for line in lines])
+
+    def summary(self) -> dict:
+        proc = self.proc
+        running = proc is not None
+        return {
+            "id": self.job_id,
+            "running": running,
+            "pid": proc.pid if proc else None,
+            "started_at": self.started_at,
+            "last_error": self.last_error,
+            "params": self.current_params,
+            "job": self.current_job,
+            "governor": self.governor if running else None,
+        }
+
+
+class JobManager:
+    """작업 ID별 MacroState 관리. 동시에 실행할 수 있는 작업 수는 MACRO_MAX_JOBS로 제한합니다."""
+
+    def __init__(self, max_jobs: int, keep_finished: int = 20) -> None:
+        self.max_jobs = max(1, max_jobs)
+        self.keep_finished = keep_finished
+        self.jobs: Dict[str, MacroState] = {}
+        self.logs = LogChannel(maxlen=1000)
+        self.history: deque[dict] = deque(maxlen=20)
+        self._lock = threading.Lock()
+
+    def get(self, job_id: str) -> Optional[MacroState]:
+        return self.jobs.get(job_id)
+
+    def running_jobs(self) -> List[MacroState]:
+        return [state for state in list(self.jobs.values()) if state.running]
+
+    @property
+    def at_capacity(self) -> bool:
+        return len(self.running_jobs()) >= self.max_jobs
+
+    @property
+    def latest(self) -> Optional[MacroState]:
+        """가장 최근에 시작한 작업 (실행 중인 작업 우선)."""
+        running = self.running_jobs()
+        if running:
+            return running[-1]
+        return next(reversed(self.jobs.values()), None)
+
+    def start(self, **kwargs) -> Tuple[Optional[MacroState], bool]:
+        """새 작업을 시작합니다. 한도를 넘으면 (None, False)."""
+        with self._lock:
+            if self.at_capacity:
+                return None, False
+            state = MacroState(uuid.uuid4().hex[:8], sink=self.logs)
+            self.jobs[state.job_id] = state
+            ok = state.start(**kwargs)
+            state.monitored = True
+            if state.current_job is not None:
+                self.history.append(state.current_job)
+            self._prune()
+        MONITOR.wake()
+        return state, ok
+
+    def stop(self, job_id: str) -> bool:
+        state = self.jobs.get(job_id)
+        stopped = state.stop() if state is not None else False
+        MONITOR.wake()
+        return stopped
+
+    def stop_all(self) -> int:
+        stopped = 0
+        for state in self.running_jobs():
+            if state.stop():
+                stopped += 1
+        MONITOR.wake()
+        return stopped
+
+    def snapshot(self) -> dict:
+        return {
+            "max_jobs": self.max_jobs,
+            "running": len(self.running_jobs()),
+            "jobs": [state.summary() for state in reversed(list(self.jobs.values()))],
+        }
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, state in self.jobs.items() if state.proc is None]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self.jobs[job_id]
+
+
+JOBS = JobManager(int(os.getenv("MACRO_MAX_JOBS", "1")))
+
+
+def build_status() -> dict:
+    running_jobs = JOBS.running_jobs()
+    latest = JOBS.latest
+    return {
+        "running": bool(running_jobs),
+        "pid": latest.proc.pid if latest and latest.proc else None,
+        "started_at": latest.started_at if latest else None,
+        "last_error": latest.last_error if latest else None,
+        "pool": POOL.snapshot(),
+        "job": latest.current_job if latest and latest.running else None,
+        "governor": latest.governor if latest and latest.running else None,
+        "recent_jobs": list(JOBS.history),
+        "max_jobs": JOBS.max_jobs,
+        "running_jobs": [state.job_id for state in running_jobs],
+        "at_capacity": len(running_jobs) >= JOBS.max_jobs,
+        "phase_timings": METRICS.summary(),
+        # 리소스 차단 프로필의 누적 차단/수신 통계
+        "resource_counters": METRICS.counter_summary(),
+    }
+
+
+def queue_reader(q) -> Optional[object]:
+    """mp.Queue의 읽기 파이프(Connection). 메시지가 도착하면 readable이 됩니다.
+
+    CPython multiprocessing.Queue의 비공개 속성(_reader)에 기대므로, 없으면 None을 돌려주고
+    StatusMonitor가 해당 작업을 interval마다 폴링합니다.
+    """
+    reader = getattr(q, "_reader", None)
+    return reader if callable(getattr(reader, "fileno", None)) else None
+
+
+class StatusMonitor:
+    """작업 프로세스 sentinel과 status_q를 함께 기다렸다가 상태 스냅샷을 갱신하고 구독자에게 보냅니다.
+
+    요청 처리 경로에서는 큐를 비우거나 is_alive()를 호출하지 않고 마지막 스냅샷만 읽습니다.
+    """
+
+    def __init__(self, jobs: JobManager, interval: float = 1.0) -> None:
+        self.jobs = jobs
+        # 풀/구간 통계처럼 이벤트 없이 바뀌는 값은 interval마다 다시 계산
+        self.interval = interval
+        self.snapshot_json = ""
+        # 스냅샷 JSON 한 줄씩 (SSE /status/stream)
+        self.events = LogChannel(maxlen=1)
+        self._wake_r, self._wake_w = mp.Pipe(duplex=False)
+        self._wake_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self.wake()
+        if self._thread is not None:
+            self._thread.join(timeout=3)
+
+    def wake(self) -> None:
+        """감시 대상이 바뀌었을 때(작업 시작/중지) 대기 중인 wait를 깨웁니다."""
+        with self._wake_lock:
             try:
-                q.put_nowait(item)
+                self._wake_w.send_bytes(b"")
             except Exception:
                 pass
-        for loop, q in list(self._listeners):
+
+    def current(self) -> str:
+        if not self.snapshot_json:
+            self.publish()
+        return self.snapshot_json
+
+    def publish(self) -> None:
+        """스냅샷을 다시 만들고, 바뀌었으면 구독자에게 보냅니다."""
+        snapshot_json = json.dumps(build_status(), ensure_ascii=False, default=str)
+        if snapshot_json != self.snapshot_json:
+            self.snapshot_json = snapshot_json
+            self.events.append(snapshot_json)
+
+    def _handles(self) -> Tuple[Dict[object, Optional[MacroState]], List[MacroState]]:
+        """wait할 핸들과, 큐 핸들을 얻지 못해 매 interval 폴링할 작업 목록."""
+        handles: Dict[object, Optional[MacroState]] = {self._wake_r: None}
+        polled: List[MacroState] = []
+        for state in list(self.jobs.jobs.values()):
+            proc, q = state.proc, state._status_q
+            if not state.monitored or proc is None:
+                continue
+            handles[proc.sentinel] = state
+            if q is None:
+                continue
+            reader = queue_reader(q)
+            if reader is not None:
+                handles[reader] = state
+            else:
+                polled.append(state)
+        return handles, polled
+
+    def _run(self) -> None:
+        self.publish()
+        while not self._stop.is_set():
+            handles, polled = self._handles()
             try:
-                loop.call_soon_threadsafe(_safe_put, q, line)
+                ready = wait_connections(list(handles), timeout=self.interval)
+            except Exception:
+                ready = []
+                time.sleep(self.interval)
+            if self._wake_r in ready:
+                while self._wake_r.poll():
+                    self._wake_r.recv_bytes()
+            states = {handles[h] for h in ready if handles.get(h) is not None}
+            for state in states.union(polled):
+                try:
+                    state.refresh()
+                except Exception as e:
+                    # 한 작업의 오류로 감시 스레드가 죽으면 다른 작업도 정리되지 않음
+                    state._append_logs([f"[monitor] 상태 갱신 실패: {e!r}"])
+            try:
+                self.publish()
             except Exception:
                 pass
 
-    def subscribe(self) -> asyncio.Queue:
-        q: asyncio.Queue = asyncio.Queue(maxsize=1000)
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = asyncio.get_event_loop()
-        self._listeners.append((loop, q))
-        return q
 
-    def unsubscribe(self, q: asyncio.Queue) -> None:
-        self._listeners = [(lp, qq) for (lp, qq) in self._listeners if qq is not q]
-        try:
-            while True:
-                q.get_nowait()
-        except Exception:
-            pass
+MONITOR = StatusMonitor(JOBS)
 
 
-STATE = MacroState()
+class _StreamToQueue:
+    def __init__(self, q):
+        self.q = q
+        self._buf = ""
+
+    def write(self, s):
+        if self.q is None:
+            return
+        self._buf += str(s)
+        while "\n" in self._buf:
+            line, self._buf = self._buf.split("\n", 1)
+            if line:
+                try:
+                    self.q.put(line)
+                except Exception:
+                    pass
+
+    def flush(self):
+        if self.q is None:
+            return
+        if self._buf:
+            try:
+                self.q.put(self._buf)
+            except Exception:
+                pass
+            self._buf = ""
+
+
+def _run_in_worker(target, status_q: Optional[mp.Queue], logs_q: Optional[mp.Queue], banner: str, **kwargs) -> None:
+    """워커 프로세스에서 stdout/stderr를 logs_q로 돌리고 target을 실행한 뒤 종료 상태를 보고합니다."""
+    import sys
+
+    # 줄 단위 put 대신 순번을 붙여 묶어 보냄
+    transport = LogBatcher(logs_q) if logs_q is not None else None
+    if transport is not None:
+        sys.stdout = _StreamToQueue(transport)  # type: ignore
+        sys.stderr = _StreamToQueue(transport)  # type: ignore
+        transport.put(banner)
+    error_message: Optional[str] = None
+    try:
+        target(status_q=status_q, logs_q=transport, **kwargs)
+    except Exception as e:
+        error_message = str(e)
+        if transport is not None:
+            transport.put(f"[ERROR] {error_message}")
+    finally:
+        # finished보다 로그가 먼저 도착하도록 남은 배치를 먼저 보냄
+        if transport is not None:
+            transport.close()
+    if status_q is not None:
+        if error_message is not None:
+            status_q.put({"status": "error", "message": error_message})
+        status_q.put({"status": "finished"})
 
 
 def run_macro(**kwargs) -> None:
@@ -392,77 +797,42 @@ def run_macro(**kwargs) -> None:
     standard_date = kwargs.pop("standard_date", None)
     standard_time = kwargs.pop("standard_time", None)
     seat_types = kwargs.pop("seat_types", None)
+    scan_mode = kwargs.pop("scan_mode", None)
+    block_profile = kwargs.pop("block_profile", None)
+    time_windows = kwargs.pop("time_windows", None)
     status_q: Optional[mp.Queue] = kwargs.pop("status_q", None)
     logs_q: Optional[mp.Queue] = kwargs.pop("logs_q", None)
-    
-    import sys
 
-    class _StreamToQueue:
-        def __init__(self, q):
-            self.q = q
-            self._buf = ""
+    _run_in_worker(
+        macro_core.main,
+        status_q,
+        logs_q,
+        "[macro] starting...",
+        arrival=arrival,
+        departure=departure,
+        from_train_number=from_train_number,
+        to_train_number=to_train_number,
+        standard_date=standard_date,
+        standard_time=standard_time,
+        seat_types=seat_types,
+        scan_mode=scan_mode,
+        block_profile=block_profile,
+        time_windows=time_windows,
+    )
 
-        def write(self, s):
-            if self.q is None:
-                return
-            self._buf += str(s)
-            while "\n" in self._buf:
-                line, self._buf = self._buf.split("\n", 1)
-                if line:
-                    try:
-                        self.q.put(line)
-                    except Exception:
-                        pass
-
-        def flush(self):
-            if self.q is None:
-                return
-            if self._buf:
-                try:
-                    self.q.put(self._buf)
-                except Exception:
-                    pass
-                self._buf = ""
 
-    if logs_q is not None:
-        sys.stdout = _StreamToQueue(logs_q)  # type: ignore
-        sys.stderr = _StreamToQueue(logs_q)  # type: ignore
-        try:
-            logs_q.put("[macro] starting...")
-        except Exception:
-            pass
-    try:
-        macro_core.main(
-            arrival=arrival,
-            departure=departure,
-            from_train_number=from_train_number,
-            to_train_number=to_train_number,
-            standard_date=standard_date,
-            standard_time=standard_time,
-            seat_types=seat_types,
-            status_q=status_q,
-            logs_q=logs_q,
-        )
-        if status_q is not None:
-            status_q.put({"status": "finished"})
-    except Exception as e:
-        error_message = str(e)
-        if status_q is not None:
-            status_q.put({"status": "error", "message": error_message})
-            status_q.put({"status": "finished"})
-        if logs_q is not None:
-            try:
-                logs_q.put(f"[ERROR] {error_message}")
-            except Exception:
-                pass
-        return
+def run_pool_worker(job_q: mp.Queue, status_q: mp.Queue, logs_q: mp.Queue) -> None:
+    apply_env_vars_to_os()
+    _run_in_worker(macro_core.run_warm_worker, status_q, logs_q, "[pool] warming up...", job_q=job_q)
 
 
 def render_page(message: str = "", **form_params) -> HTMLResponse:
-    STATE.refresh()
-    running = STATE.running
-    pid = STATE.proc.pid if STATE.proc else None
-    last_error = STATE.last_error
+    running_jobs = JOBS.running_jobs()
+    running = bool(running_jobs)
+    at_capacity = len(running_jobs) >= JOBS.max_jobs
+    latest = JOBS.latest
+    pid = latest.proc.pid if latest and latest.proc else None
+    last_error = latest.last_error if latest else None
     
     env_check = check_env_vars()
     env_warning = ""
@@ -478,10 +848,13 @@ def render_page(message: str = "", **form_params) -> HTMLResponse:
         seat_types=macro_core.DEFAULT_SEAT_TYPES,
         from_train_number=macro_core.DEFAULT_FROM_TRAIN_NUMBER,
         to_train_number=macro_core.DEFAULT_TO_TRAIN_NUMBER,
+        scan_mode=os.getenv("MACRO_SCAN_MODE") or macro_core.DEFAULT_SCAN_MODE,
+        block_profile=os.getenv("PLAYWRIGHT_BLOCK_PROFILE") or macro_core.DEFAULT_BLOCK_PROFILE,
+        time_windows="",
     )
     
-    if STATE.current_params:
-        defaults.update(STATE.current_params)
+    if latest and latest.current_params:
+        defaults.update(latest.current_params)
     
     if form_params:
         defaults.update({k: v for k, v in form_params.items() if v is not None})
@@ -674,7 +1047,7 @@ def render_page(message: str = "", **form_params) -> HTMLResponse:
             <div class="status-bar">
               <div class="status-indicator">
                 <div class="dot {('running' if running else 'stopped')}"></div>
-                <span>{('실행 중' if running else '대기 중')}</span>
+                <span>{(f'실행 중 ({len(running_jobs)}/{JOBS.max_jobs})' if running and JOBS.max_jobs > 1 else '실행 중' if running else '대기 중')}</span>
                 {f'<span style="color:var(--text-muted); font-weight:400; font-size:0.9em; margin-left:0.5rem">PID {pid}</span>' if running and pid else ''}
               </div>
               <button class="btn-secondary" onclick="openEnvModal()" style="flex:0 0 auto; padding:0.5rem 1rem; font-size:0.875rem;">🔑 환경변수 설정</button>
@@ -706,6 +1079,27 @@ def render_page(message: str = "", **form_params) -> HTMLResponse:
                     <option value="special" {'selected' if defaults['seat_types']=='special' else ''}>특실만</option>
                   </select>
                 </div>
+                <div class="form-group">
+                  <label>감지 방식</label>
+                  <select name="scan_mode">
+                    <option value="dom" {'selected' if defaults['scan_mode']=='dom' else ''}>새로고침 후 테이블 스캔</option>
+                    <option value="watch" {'selected' if defaults['scan_mode']=='watch' else ''}>MutationObserver 감시</option>
+                    <option value="response" {'selected' if defaults['scan_mode']=='response' else ''}>응답 HTML 직접 파싱</option>
+                    <option value="http" {'selected' if defaults['scan_mode']=='http' else ''}>HTTP 직접 조회 (브라우저는 예약만)</option>
+                  </select>
+                </div>
+                <div class="form-group">
+                  <label>리소스 차단</label>
+                  <select name="block_profile">
+                    <option value="none" {'selected' if defaults['block_profile']=='none' else ''}>차단 안 함</option>
+                    <option value="media" {'selected' if defaults['block_profile']=='media' else ''}>이미지/폰트 차단</option>
+                    <option value="aggressive" {'selected' if defaults['block_profile']=='aggressive' else ''}>이미지/폰트/CSS/외부 도메인 차단</option>
+                  </select>
+                </div>
+                <div class="form-group">
+                  <label>추가 시간대 (선택, 탭별 동시 조회)</label>
+                  <input name="time_windows" value="{defaults['time_windows'] or ''}" placeholder="예: 20, 22 또는 20251025 08">
+                </div>
                 <div class="form-group">
                   <label>조회 범위 (시작~종료)</label>
                   <div style="display:flex; gap:0.5rem; align-items:center;">
@@ -717,8 +1111,8 @@ def render_page(message: str = "", **form_params) -> HTMLResponse:
               </div>
               
               <div class="actions">
-                <button class="btn-primary" type="submit" form="startForm" {'disabled' if running else ''}>
-                  {('실행 중...' if running else '🚀 매크로 시작')}
+                <button class="btn-primary" type="submit" form="startForm" {'disabled' if at_capacity else ''}>
+                  {('실행 중...' if at_capacity else '🚀 매크로 시작')}
                 </button>
                 <button class="btn-danger" type="submit" form="stopForm" {'disabled' if not running else ''}>
                   ⏹ 정지
@@ -771,6 +1165,9 @@ def start(
     seat_types: str = Form("both"),
     from_train_number: int = Form(1),
     to_train_number: int = Form(1),
+    scan_mode: str = Form(""),
+    block_profile: str = Form(""),
+    time_windows: str = Form(""),
 ):
     apply_env_vars_to_os()
     
@@ -780,16 +1177,19 @@ def start(
             "⚠️ 환경변수가 설정되지 않았습니다. '환경변수 설정'을 통해 입력해주세요.",
             arrival=arrival, departure=departure, standard_date=standard_date,
             standard_time=standard_time, seat_types=seat_types,
-            from_train_number=from_train_number, to_train_number=to_train_number
+            from_train_number=from_train_number, to_train_number=to_train_number,
+            scan_mode=scan_mode, block_profile=block_profile, time_windows=time_windows,
         )
     
     if from_train_number > to_train_number:
         return render_page("조회 시작 순번은 종료 순번보다 클 수 없습니다.")
 
-    if STATE.running:
-        return render_page("이미 실행 중입니다.")
+    if JOBS.at_capacity:
+        if JOBS.max_jobs == 1:
+            return render_page("이미 실행 중입니다.")
+        return render_page(f"동시에 실행할 수 있는 작업({JOBS.max_jobs}개)이 모두 실행 중입니다.")
 
-    ok = STATE.start(
+    state, ok = JOBS.start(
         arrival=arrival,
         departure=departure,
         from_train_number=from_train_number,
@@ -797,18 +1197,23 @@ def start(
         standard_date=standard_date,
         standard_time=standard_time,
         seat_types=seat_types,
+        scan_mode=scan_mode or None,
+        block_profile=block_profile or None,
+        time_windows=time_windows.strip() or None,
     )
+    if state is None:
+        return render_page("이미 실행 중입니다.")
     if not ok:
         return render_page("시작할 수 없습니다. (로그 확인 필요)")
         
-    return render_page("매크로가 시작되었습니다.")
+    return render_page(f"매크로가 시작되었습니다. (작업 {state.job_id})")
 
 
 @app.post("/stop")
 def stop():
-    if not STATE.running:
+    if not JOBS.running_jobs():
         return render_page("실행 중이 아닙니다.")
-    STATE.stop()
+    JOBS.stop_all()
     return render_page("정지했습니다.")
 
 
@@ -916,6 +1321,7 @@ async def save_env(request: Request):
         if encrypt_env_vars(env_vars):
             for key, value in env_vars.items():
                 if value: os.environ[key] = value
+            POOL.ensure()
             return JSONResponse({"success": True})
         else:
             return JSONResponse({"success": False, "message": "저장 실패"}, status_code=500)
@@ -925,68 +1331,256 @@ async def save_env(request: Request):
 
 @app.get("/status")
 def status():
-    STATE.refresh()
-    return JSONResponse({
-        "running": STATE.running,
-        "pid": STATE.proc.pid if STATE.proc else None,
-        "started_at": STATE.started_at,
-        "last_error": STATE.last_error,
+    return Response(MONITOR.current(), media_type="application/json")
+
+
+@app.get("/status/stream")
+async def status_stream(request: Request):
+    """상태가 바뀔 때마다 /status와 같은 JSON을 보냅니다."""
+    return _log_stream(MONITOR.events, request, notices=False)
+
+
+@app.get("/metrics")
+def metrics():
+    pool = POOL.snapshot()
+    body = METRICS.render_prometheus({
+        "srt_macro_jobs_running": len(JOBS.running_jobs()),
+        "srt_macro_jobs_max": JOBS.max_jobs,
+        "srt_macro_pool_warm": pool.get("warm", 0),
+        "srt_macro_log_dropped_lines": JOBS.logs.dropped,
     })
+    return Response(body, media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
-@app.get("/logs")
-async def logs_stream():
-    q = STATE.subscribe()
+@app.get("/history")
+def history(
+    train_no: str,
+    date: Optional[str] = None,
+    route: Optional[str] = None,
+    seat_class: Optional[str] = None,
+    since: Optional[float] = None,
+    limit: int = DEFAULT_QUERY_LIMIT,
+):
+    """열차의 잔여석이 언제 열렸고 얼마나 유지됐는지 (좌석 변동 이력 기준, 관측 세션 안에서만 짝지음)."""
+    path = history_path()
+    if path is None:
+        return JSONResponse({"success": False, "message": "좌석 이력 기록이 꺼져 있습니다 (MACRO_HISTORY_PATH=off)."}, status_code=404)
+    return JSONResponse(seat_openings(path, train_key(train_no), date, route, seat_class, since, limit))
+
+
+def _sse_event(entries: List[LogEntry]) -> str:
+    """여러 줄을 data: 줄 여러 개로 묶은 이벤트 하나. id는 마지막 줄의 순번."""
+    data = "".join(f"data: {line}\n" for _, line in entries)
+    return f"id: {entries[-1][0]}\n{data}\n"
+
+
+def _resume_seq(request: Request) -> int:
+    """재연결 시 브라우저가 보내는 Last-Event-ID (첫 연결은 ?last_event_id=)."""
+    value = request.headers.get("last-event-id") or request.query_params.get("last_event_id") or ""
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return -1
+
+
+def _log_stream(channel: LogChannel, request: Request, notices: bool = True) -> StreamingResponse:
+    listener = channel.subscribe()
+    resume = _resume_seq(request)
+
     async def event_gen():
-        yield "data: [logs] connected\n\n"
+        last = listener.start_seq
         try:
+            if resume < 0:
+                if notices:
+                    yield "data: [logs] connected\n\n"
+            else:
+                backlog = channel.since(resume)
+                if notices and backlog and backlog[0][0] > resume + 1:
+                    yield f"data: [logs] 버퍼에서 밀려난 {backlog[0][0] - resume - 1}줄은 이어받지 못했습니다.\n\n"
+                if backlog:
+                    yield _sse_event(backlog)
+                    last = backlog[-1][0]
             while True:
                 try:
-                    line = await asyncio.wait_for(q.get(), timeout=10.0)
-                    yield f"data: {line}\n\n"
+                    batch = await asyncio.wait_for(listener.queue.get(), timeout=10.0)
                 except asyncio.TimeoutError:
                     yield ": ping\n\n"
+                    continue
+                if batch[0][0] > last + 1:
+                    # 큐가 넘쳐 버린 구간은 링 버퍼에서 다시 채움
+                    batch = channel.since(last)
+                batch = [entry for entry in batch if entry[0] > last]
+                if batch:
+                    yield _sse_event(batch)
+                    last = batch[-1][0]
         finally:
-            STATE.unsubscribe(q)
+            channel.unsubscribe(listener)
     return StreamingResponse(event_gen(), media_type="text/event-stream", headers={
         "Cache-Control": "no-cache",
         "Connection": "keep-alive",
     })
 
 
+@app.get("/logs")
+async def logs_stream(request: Request):
+    return _log_stream(JOBS.logs, request)
+
+
+# /logs.json long-poll 최대 대기 (초)
+MAX_LOG_WAIT = 30.0
+
+
+async def _log_page(channel: LogChannel, since: Optional[int], limit: Optional[int], wait: float) -> dict:
+    """since 이후의 줄을 limit개까지 돌려줍니다. 새 줄이 없으면 wait초까지 기다립니다.
+
+    cursor는 다음 요청의 since로 그대로 넘기면 되는 값입니다.
+    """
+    cursor = max(0, since or 0)
+    if cursor > channel.seq:
+        # 서버가 재시작되어 순번이 다시 시작된 경우 처음부터
+        cursor = 0
+    await channel.wait_after(cursor, min(max(0.0, wait), MAX_LOG_WAIT))
+    entries = channel.since(cursor)
+    oldest = channel.buffer[0][0] if channel.buffer else channel.seq + 1
+    more = limit is not None and 0 < limit < len(entries)
+    if more:
+        entries = entries[:limit]
+    return {
+        "lines": [line for _, line in entries],
+        "cursor": entries[-1][0] if entries else cursor,
+        "more": more,
+        # 버퍼에서 밀려나 돌려주지 못한 줄 수
+        "missed": max(0, oldest - cursor - 1) if since is not None else 0,
+    }
+
+
 @app.get("/logs.json")
-def logs_json():
+async def logs_json(since: Optional[int] = None, limit: Optional[int] = None, wait: float = 0.0):
+    page = await _log_page(JOBS.logs, since, limit, wait)
+    latest = JOBS.latest
     return JSONResponse({
-        "running": STATE.running,
-        "lines": list(STATE._log_buffer),
-        "last_error": STATE.last_error,
+        "running": bool(JOBS.running_jobs()),
+        **page,
+        "last_error": latest.last_error if latest else None,
     })
 
 
+def _job_not_found(job_id: str) -> JSONResponse:
+    return JSONResponse({"success": False, "message": f"작업을 찾을 수 없습니다: {job_id}"}, status_code=404)
+
+
+@app.get("/jobs")
+def list_jobs():
+    return JSONResponse(JOBS.snapshot())
+
+
+@app.post("/jobs")
+def create_job(
+    arrival: str = Form(...),
+    departure: str = Form(...),
+    standard_date: str = Form(...),
+    standard_time: str = Form(...),
+    seat_types: str = Form("both"),
+    from_train_number: int = Form(1),
+    to_train_number: int = Form(1),
+    scan_mode: str = Form(""),
+    block_profile: str = Form(""),
+    time_windows: str = Form(""),
+):
+    apply_env_vars_to_os()
+
+    env_check = check_env_vars()
+    if not env_check.get("MEMBER_NUMBER") or not env_check.get("PASSWORD"):
+        return JSONResponse({"success": False, "message": "환경변수가 설정되지 않았습니다."}, status_code=400)
+    if from_train_number > to_train_number:
+        return JSONResponse({"success": False, "message": "조회 시작 순번은 종료 순번보다 클 수 없습니다."}, status_code=400)
+
+    state, ok = JOBS.start(
+        arrival=arrival,
+        departure=departure,
+        from_train_number=from_train_number,
+        to_train_number=to_train_number,
+        standard_date=standard_date,
+        standard_time=standard_time,
+        seat_types=seat_types,
+        scan_mode=scan_mode or None,
+        block_profile=block_profile or None,
+        time_windows=time_windows.strip() or None,
+    )
+    if state is None:
+        return JSONResponse(
+            {"success": False, "message": f"동시에 실행할 수 있는 작업({JOBS.max_jobs}개)이 모두 실행 중입니다."},
+            status_code=429,
+        )
+    if not ok:
+        return JSONResponse({"success": False, "id": state.job_id, "message": state.last_error}, status_code=500)
+    return JSONResponse({"success": True, "id": state.job_id})
+
+
+@app.get("/jobs/{job_id}/status")
+def job_status(job_id: str):
+    state = JOBS.get(job_id)
+    if state is None:
+        return _job_not_found(job_id)
+    return JSONResponse(state.summary())
+
+
+@app.get("/jobs/{job_id}/logs")
+async def job_logs_stream(job_id: str, request: Request):
+    state = JOBS.get(job_id)
+    if state is None:
+        return _job_not_found(job_id)
+    return _log_stream(state.logs, request)
+
+
+@app.get("/jobs/{job_id}/logs.json")
+async def job_logs_json(job_id: str, since: Optional[int] = None, limit: Optional[int] = None, wait: float = 0.0):
+    state = JOBS.get(job_id)
+    if state is None:
+        return _job_not_found(job_id)
+    page = await _log_page(state.logs, since, limit, wait)
+    return JSONResponse({
+        "id": job_id,
+        "running": state.running,
+        **page,
+        "last_error": state.last_error,
+    })
+
+
+@app.post("/jobs/{job_id}/stop")
+def stop_job(job_id: str):
+    if JOBS.get(job_id) is None:
+        return _job_not_found(job_id)
+    return JSONResponse({"success": JOBS.stop(job_id)})
+
+
 @app.get("/client.js")
 def client_js():
     js = """
     (function(){
         const logEl = document.getElementById('logbox');
         let es = null;
-        let lastLog = "";
+        let lastId = 0;
         
-        function append(line) {
+        function append(lines) {
             if(!logEl) return;
-            if(line === lastLog) return; // Deduplicate
-            lastLog = line;
-            
-            const div = document.createElement('div');
-            div.textContent = line;
-            logEl.appendChild(div);
+            const frag = document.createDocumentFragment();
+            lines.forEach(line => {
+                const div = document.createElement('div');
+                div.textContent = line;
+                frag.appendChild(div);
+            });
+            logEl.appendChild(frag);
             logEl.scrollTop = logEl.scrollHeight;
         }
         
+        // 이벤트 하나에 여러 줄이 묶여 옴. 재연결 시 마지막 id 이후부터 이어받음
         function connect() {
             if(es) es.close();
-            es = new EventSource('/logs');
+            es = new EventSource('/logs?last_event_id=' + lastId);
             es.onmessage = function(e) {
-                append(e.data);
+                if(e.lastEventId) lastId = parseInt(e.lastEventId, 10) || lastId;
+                append(e.data.split('\\n'));
             };
             es.onerror = function() {
                 es.close();
@@ -994,67 +1588,83 @@ def client_js():
             };
         }
         
-        // Initial logs
-        fetch('/logs.json').then(r=>r.json()).then(d => {
-            if(d.lines) d.lines.forEach(append);
-            connect();
-        });
+        connect();
         
-        // Status poller
-        setInterval(() => {
-            fetch('/status').then(r=>r.json()).then(d => {
-                const dot = document.querySelector('.dot');
-                const text = document.querySelector('.status-indicator span');
-                const startBtn = document.querySelector('button[form="startForm"]');
-                const stopBtn = document.querySelector('button[form="stopForm"]');
-                
-                if(d.running) {
-                    dot.className = 'dot running';
-                    text.textContent = '실행 중';
-                    if(startBtn) {
-                        startBtn.disabled = true;
-                        startBtn.textContent = '실행 중...';
-                    }
-                    if(stopBtn) stopBtn.disabled = false;
-                } else {
-                    dot.className = 'dot stopped';
-                    text.textContent = '대기 중';
-                    if(startBtn) {
-                        startBtn.disabled = false;
-                        startBtn.textContent = '🚀 매크로 시작';
-                    }
-                    if(stopBtn) stopBtn.disabled = true;
+        const STAGE_LABELS = {
+            browser_launched: '브라우저 실행', logged_in: '로그인 완료', search_ready: '조회 준비',
+            scanning: '조회 중', reserved: '예약 완료', failed: '실패'
+        };
+        
+        // 상태 스트림: 상태가 바뀔 때만 스냅샷이 옴 (이벤트에 여러 개가 묶이면 마지막 것만 반영)
+        function applyStatus(d) {
+            const dot = document.querySelector('.dot');
+            const text = document.querySelector('.status-indicator span');
+            const startBtn = document.querySelector('button[form="startForm"]');
+            const stopBtn = document.querySelector('button[form="stopForm"]');
+            
+            if(d.running) {
+                dot.className = 'dot running';
+                text.textContent = d.max_jobs > 1 ? '실행 중 (' + d.running_jobs.length + '/' + d.max_jobs + ')' : '실행 중';
+                if(d.job && d.job.stage) text.textContent += ' · ' + (STAGE_LABELS[d.job.stage] || d.job.stage);
+                if(startBtn) {
+                    startBtn.disabled = d.at_capacity;
+                    startBtn.textContent = d.at_capacity ? '실행 중...' : '🚀 매크로 시작';
                 }
-                
-                // Update PID if available
-                const pidSpan = document.querySelector('#status-pid');
-                if(d.running && d.pid) {
-                    if(!pidSpan) {
-                        const span = document.createElement('span');
-                        span.id = 'status-pid';
-                        span.style.color = 'var(--text-muted)';
-                        span.style.fontWeight = '400';
-                        span.style.fontSize = '0.9em';
-                        span.style.marginLeft = '0.5rem';
-                        span.textContent = 'PID ' + d.pid;
-                        document.querySelector('.status-indicator').appendChild(span);
-                    } else {
-                        pidSpan.textContent = 'PID ' + d.pid;
-                    }
-                } else if(pidSpan) {
-                    pidSpan.remove();
+                if(stopBtn) stopBtn.disabled = false;
+            } else {
+                dot.className = 'dot stopped';
+                text.textContent = '대기 중';
+                if(startBtn) {
+                    startBtn.disabled = false;
+                    startBtn.textContent = '🚀 매크로 시작';
                 }
-                
-                // If error occurred, show it (optional, but page reload handles it mostly)
-                if(d.last_error) {
-                    const errDiv = document.querySelector('.alert-error');
-                    if(!errDiv) {
-                        // Reload to show error
-                        // window.location.reload();
-                    }
+                if(stopBtn) stopBtn.disabled = true;
+            }
+            
+            // Update PID if available
+            const pidSpan = document.querySelector('#status-pid');
+            if(d.running && d.pid) {
+                if(!pidSpan) {
+                    const span = document.createElement('span');
+                    span.id = 'status-pid';
+                    span.style.color = 'var(--text-muted)';
+                    span.style.fontWeight = '400';
+                    span.style.fontSize = '0.9em';
+                    span.style.marginLeft = '0.5rem';
+                    span.textContent = 'PID ' + d.pid;
+                    document.querySelector('.status-indicator').appendChild(span);
+                } else {
+                    pidSpan.textContent = 'PID ' + d.pid;
                 }
-            });
-        }, 1000);
+            } else if(pidSpan) {
+                pidSpan.remove();
+            }
+            
+            // If error occurred, show it (optional, but page reload handles it mostly)
+            if(d.last_error) {
+                const errDiv = document.querySelector('.alert-error');
+                if(!errDiv) {
+                    // Reload to show error
+                    // window.location.reload();
+                }
+            }
+        }
+        
+        let statusEs = null;
+        function connectStatus() {
+            if(statusEs) statusEs.close();
+            statusEs = new EventSource('/status/stream?last_event_id=0');
+            statusEs.onmessage = function(e) {
+                const lines = e.data.split('\\n');
+                applyStatus(JSON.parse(lines[lines.length - 1]));
+            };
+            statusEs.onerror = function() {
+                statusEs.close();
+                setTimeout(connectStatus, 3000);
+            };
+        }
+        
+        connectStatus();
     })();
     """
     return Response(js, media_type="text/javascript")
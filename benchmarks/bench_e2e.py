@@ -0,0 +1,155 @@
+"""목 SRT 서버를 대상으로 한 end-to-end 벤치마크.
+
+로컬 목 서버(mock_srt_server.py)를 띄우고 macro_core.main_async를 스캔 모드별로 실행해
+초당 조회 사이클, time-to-first-scan, 잔여석 오픈 → 예약 클릭 지연을 측정합니다.
+
+실행: uv run python benchmarks/bench_e2e.py [--modes dom,watch,response,http] [--release after:8] [--latency 0.15]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import requests  # noqa: E402
+import uvicorn  # noqa: E402
+
+from mock_srt_server import MockConfig, MockSrt, create_app  # noqa: E402
+
+
+def bench_env(base_url: str) -> Dict[str, Optional[str]]:
+    """목 서버 주소와 벤치마크용 설정 환경변수 (None은 지움)."""
+    return {
+        "SRT_BASE_URL": base_url,
+        "MACRO_PERSIST_SESSION": "false",
+        "MEMBER_NUMBER": os.getenv("MEMBER_NUMBER") or "0000000000",
+        "PASSWORD": os.getenv("PASSWORD") or "mock-password",
+        "PLAYWRIGHT_HEADLESS": os.getenv("PLAYWRIGHT_HEADLESS") or "true",
+        "PLAYWRIGHT_BROWSER_CHANNEL": os.getenv("PLAYWRIGHT_BROWSER_CHANNEL", ""),
+        # 예약 성공 시 데스크톱 브라우저를 열지 않음
+        "BROWSER_OPEN_COMMAND": "true %s",
+        # 벤치마크 실행이 좌석 이력 DB를 남기지 않도록
+        "MACRO_HISTORY_PATH": "off",
+        "DISCORD_WEB_HOOK": None,
+    }
+
+
+def configure_env(base_url: str) -> None:
+    """macro_core import 전에 목 서버 주소와 벤치마크용 설정을 환경변수로 지정합니다."""
+    for key, value in bench_env(base_url).items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+class MockServerThread:
+    """uvicorn으로 목 서버를 백그라운드 스레드에서 실행합니다."""
+
+    def __init__(self, mock: MockSrt, port: int) -> None:
+        self.server = uvicorn.Server(uvicorn.Config(create_app(mock), host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> "MockServerThread":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def drain(q: queue.Queue) -> List[dict]:
+    messages = []
+    while True:
+        try:
+            messages.append(q.get_nowait())
+        except queue.Empty:
+            return messages
+
+
+def run_mode(macro_core, base_url: str, config: MockConfig, scan_mode: str, timeout: float, verbose: bool) -> Dict[str, Optional[float]]:
+    requests.post(f"{base_url}/__mock/reset", json=vars(config), timeout=5).raise_for_status()
+    status_q: queue.Queue = queue.Queue()
+    started = time.time()
+    log_sink = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    error = None
+    with log_sink:
+        try:
+            asyncio.run(asyncio.wait_for(
+                macro_core.main_async(
+                    standard_date=date.today().strftime("%Y%m%d"),
+                    standard_time="18",
+                    from_train_number=1,
+                    to_train_number=config.rows,
+                    scan_mode=scan_mode,
+                    status_q=status_q,
+                ),
+                timeout,
+            ))
+        except (asyncio.TimeoutError, RuntimeError) as e:
+            error = type(e).__name__
+    stats = requests.get(f"{base_url}/__mock/stats", timeout=5).json()
+
+    messages = [m for m in drain(status_q) if isinstance(m, dict)]
+    first_scan = next((m["at"] for m in messages if m.get("status") == "first_scan"), None)
+    span = (stats["last_search_at"] or 0) - (stats["first_search_at"] or 0)
+    clicks = [c for c in stats["clicks"] if c["success"]]
+    return {
+        "searches": stats["searches"],
+        "cycles_per_s": (stats["searches"] - 1) / span if span > 0 else None,
+        "time_to_first_scan": first_scan - started if first_scan else None,
+        "release_to_click": clicks[0]["release_to_click"] if clicks else None,
+        "reserved": bool(clicks),
+        "error": error,
+    }
+
+
+def fmt(value: Optional[float], unit: str = "") -> str:
+    return f"{value:.2f}{unit}" if isinstance(value, (int, float)) else "-"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default="dom,watch,response,http")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency", type=float, default=0.15)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--popup-rate", type=float, default=0.0)
+    parser.add_argument("--release", default="after:8")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--verbose", action="store_true", help="매크로 로그 출력")
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    configure_env(base_url)
+    import macro_core
+
+    config = MockConfig(latency=args.latency, jitter=args.jitter, popup_rate=args.popup_rate, release=args.release)
+    print(f"mock: latency {args.latency}s (+{args.jitter}s), popup {args.popup_rate:.0%}, release {args.release}")
+    print(f"{'mode':<10} {'cycles/s':>9} {'first scan':>11} {'release→click':>14} {'searches':>9}  result")
+    with MockServerThread(MockSrt(config), args.port):
+        for scan_mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            r = run_mode(macro_core, base_url, config, scan_mode, args.timeout, args.verbose)
+            result = "reserved" if r["reserved"] else (r["error"] or "not reserved")
+            print(
+                f"{scan_mode:<10} {fmt(r['cycles_per_s']):>9} {fmt(r['time_to_first_scan'], 's'):>11} "
+                f"{fmt(r['release_to_click'], 's'):>14} {r['searches']:>9}  {result}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""HAR 기록/재생 벤치마크.
+
+record: 실제 사이트(또는 SRT_BASE_URL의 목 서버)에 로그인 → 조회 → 새로고침 N회를 HAR로 기록
+replay: 기록한 HAR를 오프라인으로 재생하면서 새로고침/스캔 경로의 소요 시간을 측정
+        (--scale로 기록된 응답 시간을 늘리거나 줄여 느린/빠른 서버 상황을 재현)
+
+실행:
+  uv run python benchmarks/bench_har.py record --har srt_session.har --refreshes 5
+  uv run python benchmarks/bench_har.py replay --har srt_session.har --scale 2.0 --refreshes 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.async_api import async_playwright  # noqa: E402
+
+import macro_core  # noqa: E402
+from preference import Preference, ScanPlan  # noqa: E402
+from scan_engine import RESULT_TABLE_SELECTOR, scan_result_table  # noqa: E402
+
+
+def summarize(name: str, samples: List[float]) -> None:
+    if not samples:
+        print(f"{name:<14} (샘플 없음)")
+        return
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{name:<14} mean {statistics.mean(ordered):8.1f}ms  p50 {statistics.median(ordered):8.1f}ms  p95 {p95:8.1f}ms")
+
+
+async def refresh_and_scan(page, args) -> tuple[float, float, int]:
+    """조회 버튼 클릭 → 테이블 표시 → 스냅샷 스캔. (새로고침 ms, 스캔 ms, 잔여석 수)"""
+    started = time.perf_counter()
+    await macro_core.submit_search(page)
+    await page.wait_for_selector(f"{RESULT_TABLE_SELECTOR} > tr:nth-child({args.from_train})", timeout=15000)
+    refreshed = time.perf_counter()
+    rows = await scan_result_table(page)
+    hits = ScanPlan(Preference.from_env(args.from_train, args.to_train, [6, 7])).rank(rows)
+    return (refreshed - started) * 1000, (time.perf_counter() - refreshed) * 1000, len(hits)
+
+
+async def record(args) -> None:
+    member_number, password = macro_core.get_credentials()
+    async with async_playwright() as playwright:
+        browser = await macro_core.launch(playwright)
+        context = await macro_core.new_context(browser, har_mode=macro_core.HAR_MODE_RECORD, har_path=args.har)
+        page = await macro_core.new_search_page(context, navigate=False)
+        await macro_core.ensure_logged_in(page, context, member_number, password, check_first=False)
+        await macro_core.search_schedule(page, args.arrival, args.departure, args.date, args.time, navigate=False)
+        for i in range(args.refreshes):
+            refresh_ms, _, hits = await refresh_and_scan(page, args)
+            print(f"새로고침 {i + 1}/{args.refreshes}: {refresh_ms:.0f}ms, 잔여석 {hits}")
+        await context.close()
+        await browser.close()
+    print(f"HAR 저장: {args.har}")
+
+
+async def replay(args) -> None:
+    async with async_playwright() as playwright:
+        browser = await macro_core.launch(playwright)
+        context = await macro_core.new_context(
+            browser, har_mode=macro_core.HAR_MODE_REPLAY, har_path=args.har, har_time_scale=args.scale
+        )
+        page = await macro_core.new_search_page(context)
+        await macro_core.search_schedule(page, args.arrival, args.departure, args.date, args.time, navigate=False)
+
+        refresh_samples, scan_samples = [], []
+        for _ in range(args.refreshes):
+            refresh_ms, scan_ms, _ = await refresh_and_scan(page, args)
+            refresh_samples.append(refresh_ms)
+            scan_samples.append(scan_ms)
+
+        print(f"har: {args.har}, scale x{args.scale}, refreshes {args.refreshes}")
+        summarize("refresh", refresh_samples)
+        summarize("scan", scan_samples)
+        await context.close()
+        await browser.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("--har", default=os.getenv("PLAYWRIGHT_HAR_PATH") or "srt_session.har")
+    parser.add_argument("--scale", type=float, default=1.0, help="재생 시 응답 시간 배율 (0이면 지연 없음)")
+    parser.add_argument("--refreshes", type=int, default=5)
+    parser.add_argument("--arrival", default=macro_core.DEFAULT_ARRIVAL)
+    parser.add_argument("--departure", default=macro_core.DEFAULT_DEPARTURE)
+    parser.add_argument("--date", default=macro_core.DEFAULT_STANDARD_DATE)
+    parser.add_argument("--time", default=macro_core.DEFAULT_STANDARD_TIME)
+    parser.add_argument("--from-train", type=int, default=macro_core.DEFAULT_FROM_TRAIN_NUMBER)
+    parser.add_argument("--to-train", type=int, default=macro_core.DEFAULT_TO_TRAIN_NUMBER)
+    args = parser.parse_args()
+
+    asyncio.run(record(args) if args.mode == "record" else replay(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""좌석 변동 이력 저장소 벤치마크.
+
+임시 SQLite 파일에 가짜 변동 이력을 rows개 쌓으면서
+- 조회 루프가 부르는 HistorySession.record() 호출 지연
+- 백그라운드 배치 기록 처리량
+- 열차 하나의 열림 구간 조회(/history) 시간
+을 확인합니다.
+
+실행: uv run python benchmarks/bench_history.py [--rows 1000000] [--trains 40]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scan_engine import SEAT_AVAILABLE, SEAT_SOLD_OUT, SPECIAL_SEAT_COL, STANDARD_SEAT_COL  # noqa: E402
+from seat_history import SeatHistory, seat_openings  # noqa: E402
+from seat_snapshot import SeatChange  # noqa: E402
+
+# 한 스캔 사이클에서 나오는 변동 수 (대부분 0~2개지만 처리량 확인을 위해 크게)
+CHANGES_PER_CYCLE = 50
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--trains", type=int, default=40)
+    parser.add_argument("--dates", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "seat_history.db")
+        history = SeatHistory(path)
+        sessions = {
+            f"202601{day:02d}": history.session("수서-부산", f"202601{day:02d}") for day in range(1, args.dates + 1)
+        }
+        rng = random.Random(0)
+        states = {}
+        at = time.time() - 30 * 86400
+        latencies = []
+
+        started = time.perf_counter()
+        for _ in range(args.rows // CHANGES_PER_CYCLE):
+            changes = []
+            for _ in range(CHANGES_PER_CYCLE):
+                key = (str(300 + rng.randrange(args.trains)), f"202601{1 + rng.randrange(args.dates):02d}")
+                seat_type = rng.choice((SPECIAL_SEAT_COL, STANDARD_SEAT_COL))
+                after = SEAT_SOLD_OUT if states.get((key, seat_type)) == SEAT_AVAILABLE else SEAT_AVAILABLE
+                states[(key, seat_type)] = after
+                at += rng.expovariate(1 / 2.0)
+                changes.append((key[1], SeatChange(key[0], f"SRT {key[0]}", seat_type, "", after, at)))
+            for travel_date, change in changes:
+                call_started = time.perf_counter()
+                sessions[travel_date].record([change])
+                latencies.append(time.perf_counter() - call_started)
+        enqueued = time.perf_counter() - started
+        history.flush(timeout=600)
+        written = time.perf_counter() - started
+        history.close()
+
+        latencies.sort()
+        print(f"record() 호출 {len(latencies)}회: 중앙값 {statistics.median(latencies) * 1e6:.1f}us, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.1f}us")
+        print(f"큐 적재 {enqueued:.2f}s, 기록 완료 {written:.2f}s "
+              f"({history.written / written:,.0f}행/s, 실패 {history.failed})")
+        print(f"DB 크기 {Path(path).stat().st_size / 1024 / 1024:.1f}MB")
+
+        for train_no, travel_date in (("301", None), ("301", "20260115")):
+            started = time.perf_counter()
+            result = seat_openings(path, train_no, travel_date)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"열차 {train_no} 날짜 {travel_date or '전체'}: 열림 {result['count']}회, "
+                  f"평균 {result['avg_duration'] or 0:.1f}s, 조회 {elapsed:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Discord 알림 전송 벤치마크 (로컬 웹훅 대역 서버 사용).
+
+느린/불안정한 웹훅을 흉내 내는 로컬 서버를 띄우고
+- 요청마다 바로 보내는 동기 전송과 큐 전송(Notifier.notify)의 호출 지연
+- 실패 후 재시도, 오류 알림 묶음 전송, 종료 전 flush
+를 확인합니다.
+
+실행: uv run python benchmarks/bench_notifier.py [--latency 0.5] [--fail-first 2] [--burst 20]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from notifier import Notifier  # noqa: E402
+
+
+class WebhookStandIn:
+    """지연(latency)과 처음 N번 실패(fail_first, 500/429)를 설정할 수 있는 웹훅 대역."""
+
+    def __init__(self, port: int, latency: float, fail_first: int, fail_status: int) -> None:
+        self.latency = latency
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.requests = 0
+        self.received: List[str] = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                time.sleep(stand_in.latency)
+                stand_in.requests += 1
+                if stand_in.requests <= stand_in.fail_first:
+                    payload = json.dumps({"retry_after": 0.1}).encode()
+                    self.send_response(stand_in.fail_status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                stand_in.received.append(json.loads(body or b"{}").get("content", ""))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{port}/webhook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "WebhookStandIn":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--latency", type=float, default=0.5, help="웹훅 응답 지연 (초)")
+    parser.add_argument("--fail-first", type=int, default=2, help="처음 N번 요청은 실패 응답")
+    parser.add_argument("--fail-status", type=int, default=500)
+    parser.add_argument("--burst", type=int, default=20, help="연달아 보내는 오류 알림 수")
+    args = parser.parse_args()
+
+    with WebhookStandIn(args.port, args.latency, args.fail_first, args.fail_status) as stand_in:
+        started = time.perf_counter()
+        requests.post(stand_in.url, json={"content": "동기 전송"}, timeout=5)
+        print(f"동기 전송 호출:     {(time.perf_counter() - started) * 1000:8.1f}ms")
+
+        notifier = Notifier(webhook_url=stand_in.url, backoff=0.1)
+        started = time.perf_counter()
+        notifier.notify("SRT 예약 성공! 10분 내에 결제하세요.")
+        print(f"큐 전송 호출:       {(time.perf_counter() - started) * 1000:8.1f}ms")
+
+        started = time.perf_counter()
+        for i in range(args.burst):
+            notifier.notify(f"[ERROR] 오류 {i + 1}", coalesce=True)
+        print(f"오류 {args.burst}건 큐 전송: {(time.perf_counter() - started) * 1000:8.1f}ms")
+
+        started = time.perf_counter()
+        flushed = notifier.flush(timeout=30)
+        print(f"flush:              {(time.perf_counter() - started) * 1000:8.1f}ms ({'완료' if flushed else '시간 초과'})")
+        notifier.close()
+
+        print(
+            f"웹훅 요청 {stand_in.requests}회, 수신 {len(stand_in.received)}건 "
+            f"(sent {notifier.sent}, failed {notifier.failed}, coalesced {notifier.coalesced}, dropped {notifier.dropped})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""결과 테이블 스캔 벤치마크: 기존 per-locator 루프 vs 단일 evaluate 스캔.
+
+실행: uv run python benchmarks/bench_scan.py [반복횟수]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.async_api import Page, async_playwright  # noqa: E402
+
+import macro_core  # noqa: E402
+from preference import Preference, ScanPlan  # noqa: E402
+from scan_engine import RESULT_TABLE_SELECTOR, scan_result_table  # noqa: E402
+
+FROM_TRAIN_NUMBER = 1
+TO_TRAIN_NUMBER = 10
+SEAT_TYPE_LIST = [6, 7]
+PLAN = ScanPlan(Preference.from_env(FROM_TRAIN_NUMBER, TO_TRAIN_NUMBER, SEAT_TYPE_LIST))
+
+
+def build_result_html(rows: int = 10, available: tuple = ()) -> str:
+    """SRT 조회 결과와 같은 구조의 테이블 HTML. available: 예약 가능한 (row_idx, seat_col) 목록."""
+    trs = []
+    for row_idx in range(1, rows + 1):
+        cells = [
+            "<td>일반</td>",
+            "<td>SRT</td>",
+            f"<td>{300 + row_idx}</td>",
+            f"<td>수서<br><em class='time'>{(5 + row_idx) % 24:02d}:00</em></td>",
+            f"<td>동대구<br><em class='time'>{(7 + row_idx) % 24:02d}:00</em></td>",
+        ]
+        for seat_col in (6, 7):
+            if (row_idx, seat_col) in available:
+                cells.append("<td><a href='#' class='btn_small btn_burgundy_dark'><span>예약하기</span></a></td>")
+            else:
+                cells.append("<td><a href='#' class='btn_small btn_silver'><span>매진</span></a></td>")
+        cells.append("<td>-</td>")
+        trs.append(f"<tr>{''.join(cells)}</tr>")
+    return (
+        "<html><body><form id='result-form'><table><tbody>"
+        + "".join(trs)
+        + "</tbody></table></form></body></html>"
+    )
+
+
+async def per_locator_scan(page: Page) -> int:
+    """기존 방식: (행, 좌석) 쌍마다 locator.count() 호출."""
+    found = 0
+    for row_idx in range(FROM_TRAIN_NUMBER, TO_TRAIN_NUMBER + 1):
+        for seat_type in SEAT_TYPE_LIST:
+            selector = (
+                f"{RESULT_TABLE_SELECTOR} > tr:nth-child({row_idx}) "
+                f"> td:nth-child({seat_type}) a:has-text('예약하기')"
+            )
+            if await page.locator(selector).count() > 0:
+                found += 1
+    return found
+
+
+async def snapshot_scan(page: Page) -> int:
+    """새 방식: 테이블 전체를 한 번의 evaluate로 읽음."""
+    rows = await scan_result_table(page)
+    return len(PLAN.rank(rows))
+
+
+async def measure(name: str, fn: Callable[[Page], Awaitable[int]], page: Page, iterations: int) -> List[float]:
+    await fn(page)  # warm-up
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await fn(page)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:<16} mean {statistics.mean(samples):7.2f}ms  p50 {statistics.median(samples):7.2f}ms  p95 {p95:7.2f}ms")
+    return samples
+
+
+async def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    async with async_playwright() as playwright:
+        browser, context = await macro_core.launch_browser(playwright)
+        page = await context.new_page()
+        await page.set_content(build_result_html(available=((9, 7),)))
+
+        assert await per_locator_scan(page) == await snapshot_scan(page) == 1
+
+        print(f"iterations: {iterations}, rows {FROM_TRAIN_NUMBER}~{TO_TRAIN_NUMBER}, seat types {SEAT_TYPE_LIST}")
+        legacy = await measure("per-locator", per_locator_scan, page, iterations)
+        snapshot = await measure("snapshot", snapshot_scan, page, iterations)
+        print(f"speedup (mean): x{statistics.mean(legacy) / statistics.mean(snapshot):.1f}")
+
+        await context.close()
+        await browser.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
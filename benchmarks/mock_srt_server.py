@@ -0,0 +1,275 @@
+"""로컬 SRT 목 서버.
+
+로그인(selectLoginForm.do), 일정 조회(selectScheduleList.do), 예약/결제 페이지를
+실제 사이트와 같은 셀렉터 구조로 흉내 냅니다. 응답 지연, 접속대기 팝업 빈도,
+잔여석이 풀리는 패턴을 설정할 수 있습니다.
+
+실행: uv run python benchmarks/mock_srt_server.py --port 8800 --latency 0.15 --release after:10
+매크로 연결: SRT_BASE_URL=http://127.0.0.1:8800
+
+잔여석 패턴 (--release):
+- never: 풀리지 않음
+- after:S: 시작 S초 후부터 계속 열림
+- window:S:D: S초 후 D초 동안만 열림
+- every:P:D: P초마다 D초 동안 열림
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+
+LOGIN_PATH = "/cmc/01/selectLoginForm.do"
+LOGIN_SUBMIT_PATH = "/cmc/01/login.do"
+SEARCH_PATH = "/hpg/hra/01/selectScheduleList.do"
+RESERVE_PATH = "/hpg/hra/02/confirmReservationInfo.do"
+RESERVATION_LIST_PATH = "/hpg/hra/02/selectReservationList.do"
+SESSION_COOKIE = "JSESSIONID"
+
+
+@dataclass
+class MockConfig:
+    latency: float = 0.15  # 조회 응답 지연 (초)
+    jitter: float = 0.05  # 지연에 더하는 0~jitter 랜덤 (초)
+    popup_rate: float = 0.0  # 조회 응답에 접속대기 팝업을 띄울 확률
+    popup_ms: int = 800  # 팝업이 사라지기까지 (ms)
+    rows: int = 10
+    release: str = "after:10"
+    release_row: int = 2
+    release_col: int = 7
+
+
+@dataclass
+class MockStats:
+    started_at: float = field(default_factory=time.time)
+    searches: int = 0
+    first_search_at: Optional[float] = None
+    last_search_at: Optional[float] = None
+    popups: int = 0
+    clicks: List[dict] = field(default_factory=list)
+    reserved_at: Optional[float] = None
+
+
+def parse_release(spec: str) -> Tuple[str, List[float]]:
+    kind, _, rest = (spec or "never").partition(":")
+    args = [float(x) for x in rest.split(":") if x]
+    return kind, args
+
+
+def open_since(spec: str, elapsed: float) -> Optional[float]:
+    """elapsed(초) 시점에 잔여석이 열려 있으면 이번에 열린 시점(초)을, 아니면 None."""
+    kind, args = parse_release(spec)
+    if kind == "after" and elapsed >= args[0]:
+        return args[0]
+    if kind == "window" and args[0] <= elapsed < args[0] + args[1]:
+        return args[0]
+    if kind == "every":
+        period, duration = args
+        k = math.floor(elapsed / period)
+        if k >= 1 and elapsed - k * period < duration:
+            return k * period
+    return None
+
+
+class MockSrt:
+    def __init__(self, config: Optional[MockConfig] = None) -> None:
+        self.reset(config or MockConfig())
+
+    def reset(self, config: MockConfig) -> None:
+        self.config = config
+        self.stats = MockStats()
+        self.sessions: set = set()
+
+    def elapsed(self) -> float:
+        return time.time() - self.stats.started_at
+
+    def seat_open(self) -> Optional[float]:
+        if self.stats.reserved_at is not None:
+            return None
+        return open_since(self.config.release, self.elapsed())
+
+    async def delay(self) -> None:
+        await asyncio.sleep(self.config.latency + random.uniform(0, self.config.jitter))
+
+
+def _page(body: str, title: str = "SRT") -> HTMLResponse:
+    return HTMLResponse(f"<!doctype html><html lang=ko><head><meta charset='utf-8'><title>{title}</title></head><body>{body}</body></html>")
+
+
+def _login_form() -> str:
+    return f"""
+    <div id="wrap"><form method="post" action="{LOGIN_SUBMIT_PATH}"><fieldset>
+      <div class="login_wrap">
+        <input id="srchDvNm01" name="srchDvNm">
+        <input id="hmpgPwdCphd01" name="hmpgPwdCphd" type="password">
+        <input type="submit" value="확인">
+      </div>
+    </fieldset></form></div>
+    """
+
+
+def _result_rows(mock: MockSrt) -> str:
+    config = mock.config
+    available = mock.seat_open() is not None
+    trs = []
+    for row_idx in range(1, config.rows + 1):
+        cells = [
+            "<td>일반</td>",
+            "<td>SRT</td>",
+            f"<td>{300 + row_idx}</td>",
+            f"<td>수서<br><em class='time'>{(5 + row_idx) % 24:02d}:00</em></td>",
+            f"<td>동대구<br><em class='time'>{(7 + row_idx) % 24:02d}:00</em></td>",
+        ]
+        for seat_col in (6, 7):
+            if available and (row_idx, seat_col) == (config.release_row, config.release_col):
+                cells.append(
+                    f"<td><a href='{RESERVE_PATH}?row={row_idx}&col={seat_col}' class='btn_small btn_burgundy_dark'>"
+                    "<span>예약하기</span></a></td>"
+                )
+            else:
+                cells.append("<td><a href='#' class='btn_small btn_silver'><span>매진</span></a></td>")
+        cells.append("<td>-</td>")
+        trs.append(f"<tr>{''.join(cells)}</tr>")
+    return f"<form id='result-form'><table><thead><tr><th>구분</th></tr></thead><tbody>{''.join(trs)}</tbody></table></form>"
+
+
+def _search_page(mock: MockSrt, fields: dict, with_results: bool) -> HTMLResponse:
+    today = date.today()
+    dates = [(today + timedelta(days=i)).strftime("%Y%m%d") for i in range(31)]
+    if fields.get("dptDt") and fields["dptDt"] not in dates:
+        dates.insert(0, fields["dptDt"])
+    date_options = "".join(
+        f"<option value='{d}' {'selected' if d == fields.get('dptDt') else ''}>{d}</option>" for d in dates
+    )
+    time_options = "".join(
+        f"<option value='{h:02d}0000' {'selected' if f'{h:02d}0000' == fields.get('dptTm') else ''}>{h:02d}</option>"
+        for h in range(0, 24, 2)
+    )
+    popup = ""
+    if with_results and random.random() < mock.config.popup_rate:
+        mock.stats.popups += 1
+        popup = (
+            "<div id='waiting' style='position:fixed;top:0;left:0;right:0;padding:2rem;background:#fff'>접속대기 중입니다</div>"
+            f"<script>setTimeout(() => document.getElementById('waiting').style.display = 'none', {mock.config.popup_ms});</script>"
+        )
+    body = f"""
+    <div class="header"><a href="/cmc/01/logout.do">로그아웃</a></div>
+    {popup}
+    <form id="search-form" method="post" action="{SEARCH_PATH}">
+      <input type="hidden" name="pageId" value="TK0101010000">
+      <input id="dptRsStnCdNm" name="dptRsStnCdNm" value="{fields.get('dptRsStnCdNm', '')}">
+      <input id="arvRsStnCdNm" name="arvRsStnCdNm" value="{fields.get('arvRsStnCdNm', '')}">
+      <select id="dptDt" name="dptDt">{date_options}</select>
+      <select id="dptTm" name="dptTm">{time_options}</select>
+      <input type="submit" id="submit" value="조회하기">
+    </form>
+    {_result_rows(mock) if with_results else ''}
+    """
+    return _page(body, title="일정 조회")
+
+
+def create_app(mock: Optional[MockSrt] = None) -> FastAPI:
+    mock = mock or MockSrt()
+    app = FastAPI(title="Mock SRT")
+    app.state.mock = mock
+
+    def logged_in(request: Request) -> bool:
+        return request.cookies.get(SESSION_COOKIE) in mock.sessions
+
+    @app.get(LOGIN_PATH)
+    def login_form():
+        return _page(_login_form(), title="로그인")
+
+    @app.post(LOGIN_SUBMIT_PATH)
+    def login_submit():
+        session_id = uuid.uuid4().hex
+        mock.sessions.add(session_id)
+        response = RedirectResponse("/main.do", status_code=302)
+        response.set_cookie(SESSION_COOKIE, session_id, path="/")
+        return response
+
+    @app.get("/main.do")
+    def main_page(request: Request):
+        if not logged_in(request):
+            return RedirectResponse(LOGIN_PATH, status_code=302)
+        return _page("<div class='header'><a href='/cmc/01/logout.do'>로그아웃</a></div><h1>SRT</h1>")
+
+    @app.get(SEARCH_PATH)
+    def search_form(request: Request):
+        if not logged_in(request):
+            return RedirectResponse(LOGIN_PATH, status_code=302)
+        return _search_page(mock, {}, with_results=False)
+
+    @app.post(SEARCH_PATH)
+    async def search(request: Request):
+        if not logged_in(request):
+            return _page(_login_form(), title="로그인")
+        fields = dict(await request.form())
+        await mock.delay()
+        now = time.time()
+        mock.stats.searches += 1
+        mock.stats.first_search_at = mock.stats.first_search_at or now
+        mock.stats.last_search_at = now
+        return _search_page(mock, fields, with_results=True)
+
+    @app.get(RESERVE_PATH)
+    async def reserve(request: Request, row: int, col: int):
+        await mock.delay()
+        opened = mock.seat_open()
+        click = {"at": time.time(), "row": row, "col": col, "release_to_click": None, "success": False}
+        if opened is not None and (row, col) == (mock.config.release_row, mock.config.release_col):
+            click["release_to_click"] = round(mock.elapsed() - opened, 3)
+            click["success"] = True
+            mock.stats.reserved_at = click["at"]
+        mock.stats.clicks.append(click)
+        if not click["success"]:
+            return _page("<p>잔여석이 없습니다.</p>", title="예약 실패")
+        return _page(
+            "<input type='hidden' id='isFalseGotoMain' value='Y'>"
+            "<div class='payment'><input type='button' value='결제하기'></div>",
+            title="결제",
+        )
+
+    @app.get(RESERVATION_LIST_PATH)
+    def reservation_list():
+        return _page("<h1>예약 내역</h1>", title="예약 내역")
+
+    @app.post("/__mock/reset")
+    async def reset(request: Request):
+        payload = await request.json() if await request.body() else {}
+        mock.reset(MockConfig(**payload))
+        return JSONResponse({"config": asdict(mock.config)})
+
+    @app.get("/__mock/stats")
+    def stats():
+        return JSONResponse({"config": asdict(mock.config), "elapsed": mock.elapsed(), **asdict(mock.stats)})
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency", type=float, default=MockConfig.latency)
+    parser.add_argument("--jitter", type=float, default=MockConfig.jitter)
+    parser.add_argument("--popup-rate", type=float, default=MockConfig.popup_rate)
+    parser.add_argument("--release", default=MockConfig.release)
+    args = parser.parse_args()
+
+    mock = MockSrt(MockConfig(latency=args.latency, jitter=args.jitter, popup_rate=args.popup_rate, release=args.release))
+    uvicorn.run(create_app(mock), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""새로고침 사이클 구간별 소요 시간 측정.
+
+워커(macro_core)는 PhaseTimer로 구간별 샘플과 사이클별 카운터(리소스 차단 통계)를 모아
+status_q로 주기적으로 보내고, api_server는 MetricsRegistry에 누적해 Prometheus 텍스트(/metrics)와
+p50/p95/p99 요약·카운터 합계(/status)로 노출합니다.
+"""
+
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+# 한 사이클의 구간
+PHASE_SLEEP = "sleep"
+PHASE_SUBMIT = "submit"
+PHASE_WAITING_POPUP = "waiting_popup"
+PHASE_RESPONSE = "response"
+PHASE_HTTP_FETCH = "http_fetch"
+PHASE_TABLE_READY = "table_ready"
+PHASE_SCAN = "scan"
+PHASE_RESERVE_CLICK = "reserve_click"
+PHASE_SUCCESS_CHECK = "success_check"
+PHASE_CYCLE = "cycle"
+PHASES = (
+    PHASE_SLEEP,
+    PHASE_SUBMIT,
+    PHASE_WAITING_POPUP,
+    PHASE_RESPONSE,
+    PHASE_HTTP_FETCH,
+    PHASE_TABLE_READY,
+    PHASE_SCAN,
+    PHASE_RESERVE_CLICK,
+    PHASE_SUCCESS_CHECK,
+    PHASE_CYCLE,
+)
+
+# 사이클마다 더하는 카운터 -> (설명, 라벨 이름). 라벨이 없으면 ""
+COUNTER_BLOCKED_REQUESTS = "blocked_requests"
+COUNTER_RECEIVED_RESPONSES = "received_responses"
+COUNTER_RECEIVED_BYTES = "received_bytes"
+COUNTERS: Dict[str, Tuple[str, str]] = {
+    COUNTER_BLOCKED_REQUESTS: ("Requests aborted by the resource blocking profile.", "type"),
+    COUNTER_RECEIVED_RESPONSES: ("Responses received while a blocking profile is active.", ""),
+    COUNTER_RECEIVED_BYTES: ("Content-Length bytes received while a blocking profile is active.", ""),
+}
+# (카운터, 라벨 값)
+CounterKey = Tuple[str, str]
+
+# 히스토그램 버킷 상한 (초)
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_NAME = "srt_macro_phase_seconds"
+COUNTER_PREFIX = "srt_macro_"
+
+
+class PhaseTimer:
+    """워커 쪽 구간 타이머. drain()할 때까지 구간별 샘플(초)과 카운터를 모읍니다."""
+
+    def __init__(self) -> None:
+        self._samples: Dict[str, List[float]] = {}
+        self._counters: Dict[CounterKey, float] = {}
+
+    def observe(self, phase: str, seconds: float) -> None:
+        self._samples.setdefault(phase, []).append(seconds)
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - started)
+
+    def count(self, counter: str, amount: float, label: str = "") -> None:
+        if amount:
+            key = (counter, label)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def drain(self) -> Dict[str, List[float]]:
+        """모은 샘플을 반환하고 비웁니다."""
+        samples, self._samples = self._samples, {}
+        return samples
+
+    def drain_counters(self) -> Dict[CounterKey, float]:
+        """모은 카운터 증가분을 반환하고 비웁니다."""
+        counters, self._counters = self._counters, {}
+        return counters
+
+
+class Histogram:
+    """누적 버킷 히스토그램 + 백분위 계산용 최근 샘플."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS, recent: int = 2000) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: Deque[float] = deque(maxlen=recent)
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """최근 샘플 기준 nearest-rank 백분위 (샘플이 없으면 None)."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != math.inf else "+Inf"
+
+
+class MetricsRegistry:
+    """api_server 쪽 구간별 히스토그램 모음."""
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[CounterKey, float] = {}
+
+    def observe_many(self, samples: Dict[str, List[float]]) -> None:
+        for phase, values in samples.items():
+            histogram = self.histograms.setdefault(phase, Histogram())
+            for value in values:
+                histogram.observe(float(value))
+
+    def add_counters(self, counters: Dict[CounterKey, float]) -> None:
+        for key, amount in counters.items():
+            self.counters[tuple(key)] = self.counters.get(tuple(key), 0) + amount
+
+    def counter_summary(self) -> Dict[str, object]:
+        """카운터 합계. 라벨이 있는 카운터는 라벨 값별 dict."""
+        result: Dict[str, object] = {}
+        for (counter, label), value in sorted(self.counters.items()):
+            if COUNTERS.get(counter, ("", ""))[1]:
+                result.setdefault(counter, {})[label] = value  # type: ignore[index]
+            else:
+                result[counter] = value
+        return result
+
+    def summary(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """구간별 count와 p50/p95/p99 (밀리초)."""
+        result: Dict[str, Dict[str, Optional[float]]] = {}
+        for phase in sorted(self.histograms, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES)):
+            histogram = self.histograms[phase]
+            entry: Dict[str, Optional[float]] = {"count": histogram.count}
+            for q in (50, 95, 99):
+                value = histogram.percentile(q)
+                entry[f"p{q}_ms"] = round(value * 1000, 1) if value is not None else None
+            result[phase] = entry
+        return result
+
+    def render_prometheus(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        lines = [
+            f"# HELP {METRIC_NAME} Duration of each refresh cycle phase in seconds.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for phase, histogram in self.histograms.items():
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{METRIC_NAME}_bucket{{phase="{phase}",le="{_format_value(bound)}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_bucket{{phase="{phase}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{METRIC_NAME}_sum{{phase="{phase}"}} {_format_value(histogram.sum)}')
+            lines.append(f'{METRIC_NAME}_count{{phase="{phase}"}} {histogram.count}')
+        for counter, (help_text, label_name) in COUNTERS.items():
+            values = sorted((label, value) for (name, label), value in self.counters.items() if name == counter)
+            if not values:
+                continue
+            name = f"{COUNTER_PREFIX}{counter}_total"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for label, value in values:
+                labels = f'{{{label_name}="{label}"}}' if label_name else ""
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        for name, value in (gauges or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
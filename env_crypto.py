@@ -0,0 +1,105 @@
+"""환경변수/세션 파일 암호화 (Fernet, 기기 고유 키)."""
+
+import base64
+import json
+import os
+import pathlib
+from typing import Optional
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+# 환경변수 암호화 관련
+ENV_FILE = pathlib.Path(".env.encrypted")
+KEY_FILE = pathlib.Path(".env.key")
+# 로그인 세션(storage_state) 스냅샷
+SESSION_FILE = pathlib.Path(os.getenv("MACRO_SESSION_FILE", ".storage_state.encrypted"))
+
+
+def get_encryption_key() -> bytes:
+    """암호화 키를 가져오거나 생성합니다."""
+    if KEY_FILE.exists():
+        return KEY_FILE.read_bytes()
+    # 새 키 생성 (기기 고유 정보 기반)
+    import platform
+    
+    machine_id = f"{platform.node()}{os.getcwd()}"
+    # PBKDF2를 사용하여 키 생성
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=b"srt_macro_salt",
+        iterations=100000,
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(machine_id.encode()))
+    KEY_FILE.write_bytes(key)
+    KEY_FILE.chmod(0o600)  # 소유자만 읽기/쓰기
+    return key
+
+
+def encrypt_env_vars(env_vars: dict[str, str]) -> bool:
+    """환경변수를 암호화하여 저장합니다."""
+    try:
+        key = get_encryption_key()
+        fernet = Fernet(key)
+        
+        env_json = json.dumps(env_vars, ensure_ascii=False)
+        encrypted = fernet.encrypt(env_json.encode())
+        
+        ENV_FILE.write_bytes(encrypted)
+        ENV_FILE.chmod(0o600)  # 소유자만 읽기/쓰기
+        return True
+    except Exception as e:
+        print(f"[env] 암호화 저장 실패: {e}")
+        return False
+
+
+def decrypt_env_vars() -> Optional[dict[str, str]]:
+    """암호화된 환경변수를 복호화하여 반환합니다."""
+    if not ENV_FILE.exists():
+        return None
+    try:
+        key = get_encryption_key()
+        fernet = Fernet(key)
+        
+        encrypted = ENV_FILE.read_bytes()
+        decrypted = fernet.decrypt(encrypted)
+        env_vars = json.loads(decrypted.decode())
+        return env_vars
+    except Exception as e:
+        print(f"[env] 복호화 실패: {e}")
+        return None
+
+
+def encrypt_session(payload: dict) -> bool:
+    """로그인 세션 스냅샷을 환경변수와 같은 키로 암호화하여 저장합니다."""
+    try:
+        fernet = Fernet(get_encryption_key())
+        encrypted = fernet.encrypt(json.dumps(payload, ensure_ascii=False).encode())
+        SESSION_FILE.write_bytes(encrypted)
+        SESSION_FILE.chmod(0o600)  # 소유자만 읽기/쓰기
+        return True
+    except Exception as e:
+        print(f"[session] 암호화 저장 실패: {e}")
+        return False
+
+
+def decrypt_session() -> Optional[dict]:
+    """암호화된 로그인 세션 스냅샷을 복호화하여 반환합니다."""
+    if not SESSION_FILE.exists():
+        return None
+    try:
+        fernet = Fernet(get_encryption_key())
+        return json.loads(fernet.decrypt(SESSION_FILE.read_bytes()).decode())
+    except Exception as e:
+        print(f"[session] 복호화 실패: {e}")
+        return None
+
+
+def clear_session() -> None:
+    """저장된 로그인 세션 스냅샷을 삭제합니다."""
+    try:
+        SESSION_FILE.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,77 @@
+"""HAR 재생 지원.
+
+`context.route_from_har`로 기록된 세션을 오프라인에서 그대로 돌려주고,
+HAR에 기록된 응답 시간에 배율(time_scale)을 곱한 만큼 지연시켜
+느린/빠른 서버 상황을 재현합니다.
+"""
+
+import asyncio
+import json
+import zipfile
+from typing import Dict, List, Tuple
+
+from playwright.async_api import BrowserContext, Route
+
+DEFAULT_HAR_PATH = "srt_session.har"
+
+HarTimings = Dict[Tuple[str, str], List[float]]
+
+
+def _read_har(path: str) -> dict:
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            name = next(n for n in archive.namelist() if n.endswith(".har"))
+            return json.loads(archive.read(name))
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_har_timings(path: str) -> HarTimings:
+    """HAR의 (method, url)별 응답 시간(초) 목록을 기록 순서대로 읽습니다."""
+    timings: HarTimings = {}
+    for entry in _read_har(path).get("log", {}).get("entries", []):
+        request = entry.get("request") or {}
+        elapsed = entry.get("time")
+        if elapsed is None or elapsed < 0:
+            elapsed = sum(v for v in (entry.get("timings") or {}).values() if isinstance(v, (int, float)) and v > 0)
+        key = (request.get("method", "GET"), request.get("url", ""))
+        timings.setdefault(key, []).append(elapsed / 1000)
+    return timings
+
+
+class HarLatency:
+    """기록된 응답 시간 × time_scale만큼 기다린 뒤 HAR 라우터로 넘기는 route 핸들러."""
+
+    def __init__(self, timings: HarTimings, time_scale: float) -> None:
+        self.timings = timings
+        self.time_scale = time_scale
+        self._cursor: Dict[Tuple[str, str], int] = {}
+
+    def delay_for(self, method: str, url: str) -> float:
+        """같은 요청이 반복되면 기록된 시간들을 순서대로 돌려 씁니다."""
+        samples = self.timings.get((method, url))
+        if not samples:
+            return 0.0
+        index = self._cursor.get((method, url), 0)
+        self._cursor[(method, url)] = index + 1
+        return samples[index % len(samples)] * self.time_scale
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        delay = self.delay_for(request.method, request.url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await route.fallback()
+
+
+async def install_har_replay(
+    context: BrowserContext,
+    har_path: str = DEFAULT_HAR_PATH,
+    time_scale: float = 1.0,
+    not_found: str = "abort",
+) -> None:
+    """컨텍스트의 모든 요청을 HAR에서 응답합니다. time_scale=0이면 지연 없이 즉시 응답."""
+    await context.route_from_har(har_path, not_found=not_found)
+    if time_scale > 0:
+        # 나중에 등록한 route가 먼저 실행되므로 지연 후 fallback으로 HAR 라우터에 넘어감
+        await context.route("**/*", HarLatency(load_har_timings(har_path), time_scale).handle)
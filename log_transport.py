@@ -0,0 +1,76 @@
+"""워커 프로세스 → API 서버 로그 전송.
+
+줄마다 logs_q.put을 하는 대신 (순번, 시각, 텍스트) 레코드를 모아
+flush_interval마다 또는 max_batch개가 차면 리스트 하나로 보냅니다.
+"""
+
+import threading
+import time
+from typing import List, Tuple
+
+# (seq, timestamp, text)
+LogRecord = Tuple[int, float, str]
+
+DEFAULT_FLUSH_INTERVAL = 0.02
+DEFAULT_MAX_BATCH = 64
+
+
+class LogBatcher:
+    """logs_q 앞단의 배치 전송기. put()은 큐와 같은 인터페이스라 logs_q 자리에 그대로 넘길 수 있습니다."""
+
+    def __init__(
+        self,
+        q,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        self.q = q
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._seq = 0
+        self._pending: List[LogRecord] = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, text) -> None:
+        """여러 줄이면 줄 단위 레코드로 나눠 쌓습니다. 빈 줄은 버립니다."""
+        now = time.time()
+        with self._lock:
+            for line in str(text).splitlines():
+                if not line.strip():
+                    continue
+                self._seq += 1
+                self._pending.append((self._seq, now, line))
+            if len(self._pending) >= self.max_batch:
+                self._send_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._send_locked()
+
+    def close(self) -> None:
+        """플러시 스레드를 멈추고 남은 레코드를 보냅니다."""
+        self._closed.set()
+        self.flush()
+
+    def _send_locked(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            self.q.put(batch)
+        except Exception:
+            pass
+
+    def _run(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+
+def unpack(item) -> List[LogRecord]:
+    """logs_q에서 꺼낸 항목을 레코드 목록으로 변환합니다 (배치가 아닌 문자열은 seq 0 레코드)."""
+    if isinstance(item, list):
+        return item
+    return [(0, time.time(), str(item))]
@@ -1,132 +1,227 @@
 # edit date : 2024-04-26
 # version : 2.0.0-playwright
 
+import asyncio
+import contextlib
 import os
-import random
+import queue
 import sys
 import time
 import webbrowser
-from typing import Iterable, Optional, List, Dict, Any
+from contextvars import ContextVar
+from typing import Iterable, Optional, List, Dict, Any, Tuple
+from urllib.parse import urlparse
 
 import dotenv
-import requests
-from playwright.sync_api import Browser, BrowserContext, Page, Playwright, sync_playwright
-from playwright.sync_api import Error as PlaywrightError
-from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, Response, Route, async_playwright
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from cycle_metrics import (
+    COUNTER_BLOCKED_REQUESTS,
+    COUNTER_RECEIVED_BYTES,
+    COUNTER_RECEIVED_RESPONSES,
+    PHASE_CYCLE,
+    PHASE_HTTP_FETCH,
+    PHASE_RESERVE_CLICK,
+    PHASE_RESPONSE,
+    PHASE_SCAN,
+    PHASE_SLEEP,
+    PHASE_SUBMIT,
+    PHASE_SUCCESS_CHECK,
+    PHASE_TABLE_READY,
+    PHASE_WAITING_POPUP,
+    PhaseTimer,
+)
+from env_crypto import clear_session, decrypt_session, encrypt_session
+from har_replay import DEFAULT_HAR_PATH, install_har_replay
+from notifier import NOTIFIER
+from preference import Preference, ScanPlan
+from refresh_governor import RefreshGovernor
+from seat_history import HISTORY
+from seat_snapshot import SnapshotTracker
+from scan_engine import (
+    RESULT_TABLE_SELECTOR,
+    SUBMIT_SEARCH_JS,
+    ReserveOutcome,
+    TrainRow,
+    click_reserve_button,
+    install_seat_watcher,
+    parse_result_html,
+    pin_seat_watcher,
+    scan_result_table,
+    wait_for_reserve_outcome,
+    wait_for_watch_settled,
+)
+from srt_http import HttpScheduleClient, SessionExpiredError, build_search_fields
 
 dotenv.load_dotenv()
 
 # Constants
-RESERVATION_URL = "https://etk.srail.kr/hpg/hra/02/selectReservationList.do?pageId=TK0102010000"
-LOGIN_URL = "https://etk.srail.co.kr/cmc/01/selectLoginForm.do"
-SEARCH_URL = "https://etk.srail.kr/hpg/hra/01/selectScheduleList.do"
+# SRT_BASE_URL을 지정하면 모든 SRT 주소의 scheme/host를 바꿉니다 (예: 로컬 목 서버 http://127.0.0.1:8800)
+SRT_BASE_URL = os.getenv("SRT_BASE_URL", "").rstrip("/")
+RESERVATION_URL = (SRT_BASE_URL or "https://etk.srail.kr") + "/hpg/hra/02/selectReservationList.do?pageId=TK0102010000"
+LOGIN_URL = (SRT_BASE_URL or "https://etk.srail.co.kr") + "/cmc/01/selectLoginForm.do"
+SEARCH_URL = (SRT_BASE_URL or "https://etk.srail.kr") + "/hpg/hra/01/selectScheduleList.do"
+SCHEDULE_LIST_PATH = "selectScheduleList.do"
 
 DEFAULT_TIMEOUT = 15000
 SHORT_TIMEOUT = 5000
+# 풀 워커가 대기 중 세션을 유지하기 위해 조회 페이지를 다시 불러오는 주기 (초)
+WARM_KEEPALIVE_SECONDS = float(os.getenv("MACRO_POOL_KEEPALIVE", "300"))
+
+# 작업별 로깅 큐 (status_q, logs_q). api_server.py에서 전달되며,
+# 한 이벤트 루프에서 여러 작업이 돌 때 태스크마다 따로 설정됩니다.
+_job_queues: ContextVar[Tuple[Optional[object], Optional[object]]] = ContextVar("_job_queues", default=(None, None))
+
+
+def set_job_queues(status_q: Optional[object], logs_q: Optional[object]) -> None:
+    """현재 작업(태스크)의 status_q/logs_q를 설정합니다."""
+    _job_queues.set((status_q, logs_q))
+
+
+# 로그 앞에 붙일 탭 표시 (여러 시간대를 탭으로 나눠 볼 때 태스크마다 설정)
+_log_tag: ContextVar[str] = ContextVar("_log_tag", default="")
 
-# 전역 변수: 로깅 큐 (api_server.py에서 전달됨)
-_status_q: Optional[object] = None
-_logs_q: Optional[object] = None
+# 현재 조회 루프의 구간 타이머 (run_search가 설정)
+_phase_timer: ContextVar[Optional[PhaseTimer]] = ContextVar("_phase_timer", default=None)
+
+
+def timed(phase: str):
+    """현재 조회 루프의 타이머로 구간 시간을 잽니다. 타이머가 없으면 아무것도 하지 않습니다."""
+    timer = _phase_timer.get()
+    return timer.phase(phase) if timer is not None else contextlib.nullcontext()
+
+
+def observe_phase(phase: str, seconds: float) -> None:
+    """with 블록으로 감쌀 수 없는 구간 시간을 현재 조회 루프의 타이머에 기록합니다."""
+    timer = _phase_timer.get()
+    if timer is not None:
+        timer.observe(phase, seconds)
+
+
+def _flush_logs() -> None:
+    """배치 전송 중인 로그(LogBatcher)를 바로 보냅니다.
+
+    status_q의 error/finished를 받으면 서버가 프로세스를 종료하므로, 그보다 먼저 로그가 도착해야 합니다.
+    """
+    flush = getattr(_job_queues.get()[1], "flush", None)
+    if flush is not None:
+        try:
+            flush()
+        except Exception:
+            pass
 
 
 def log_error(message: str, error: Optional[Exception] = None, exit_on_error: bool = False) -> None:
     """에러 로그를 기록하고 필요시 종료합니다."""
-    error_msg = f"[ERROR] {message}"
+    error_msg = f"[ERROR] {_log_tag.get()}{message}"
+    _status_q, _logs_q = _job_queues.get()
     
     if error:
         error_msg += f"\n예외 정보: {type(error).__name__}: {str(error)}"
     
-    # 콘솔 출력
-    print(error_msg, file=sys.stderr)
-    
-    # logs_q에 전달 (api_server.py에서 사용)
+    # logs_q에 전달 (api_server.py에서 사용). 워커의 stderr도 logs_q로 가므로 둘 중 하나만
     if _logs_q is not None:
         try:
             _logs_q.put(error_msg)
         except Exception:
             pass
+    else:
+        print(error_msg, file=sys.stderr)
     
-    # status_q에 에러 전달 (치명적 오류인 경우에만)
-    if _status_q is not None and exit_on_error:
+    if not exit_on_error:
+        return
+
+    # Discord 웹훅으로 오류 알림 전송
+    discord_msg = f"❌ SRT 매크로 오류 발생\n\n{message}"
+    if error:
+        discord_msg += f"\n\n오류 상세: {type(error).__name__}: {str(error)}"
+    # 오류가 연달아 나면 한 메시지로 합쳐 보냄
+    NOTIFIER.notify(discord_msg, coalesce=True)
+    # 서버는 error/finished를 받는 즉시 프로세스를 종료하므로 알림과 좌석 이력을 먼저 보냄
+    _flush_pending_now()
+
+    # status_q에 에러와 종료 전달 (api_server.py가 종료 상태를 인식하도록)
+    if _status_q is not None:
+        _flush_logs()
         try:
+            _status_q.put({"status": "stage", "stage": STAGE_FAILED, "at": time.time(), "message": message})
             _status_q.put({"status": "error", "message": message})
+            _status_q.put({"status": "finished"})
         except Exception:
             pass
-    
-    if exit_on_error:
-        # Discord 웹훅으로 오류 알림 전송
-        discord_msg = f"❌ SRT 매크로 오류 발생\n\n{message}"
-        if error:
-            discord_msg += f"\n\n오류 상세: {type(error).__name__}: {str(error)}"
-        try:
-            send_discord_notification(discord_msg)
-        except Exception:
-            pass
-        
-        # 상태를 finished로 변경하여 api_server.py가 종료 상태를 인식하도록 함
-        if _status_q is not None:
-            try:
-                _status_q.put({"status": "finished"})
-            except Exception:
-                pass
-        # 예외를 발생시켜서 api_server.py의 except 블록에서 처리되도록 함
-        raise RuntimeError(message) from error if error else RuntimeError(message)
+    # 예외를 발생시켜서 api_server.py의 except 블록에서 처리되도록 함
+    raise RuntimeError(message) from error if error else RuntimeError(message)
 
 
 def log_info(message: str) -> None:
     """정보 로그를 기록합니다."""
-    print(message)
+    message = _log_tag.get() + message
     
-    # logs_q에 전달
+    # logs_q에 전달 (워커의 stdout도 logs_q로 가므로 없을 때만 콘솔 출력)
+    _logs_q = _job_queues.get()[1]
     if _logs_q is not None:
         try:
             _logs_q.put(message)
         except Exception:
             pass
+    else:
+        print(message)
 
 
-def send_discord_notification(message: str) -> bool:
-    webhook_url = os.getenv("DISCORD_WEB_HOOK")
-    if not webhook_url:
-        return False
-    try:
-        data = {"content": message}
-        response = requests.post(webhook_url, json=data, timeout=5)
-        return response.status_code == 204
-    except Exception:
-        return False
+def notify(message: str) -> bool:
+    """Discord 알림을 백그라운드 전송 큐에 넣습니다. 예약 경로를 막지 않습니다."""
+    return NOTIFIER.notify(message)
+
 
+async def flush_pending() -> None:
+    """종료 전에 남은 알림과 좌석 이력을 보냅니다 (워커 프로세스는 atexit이 실행되지 않음)."""
+    await asyncio.gather(asyncio.to_thread(NOTIFIER.flush), asyncio.to_thread(HISTORY.flush))
 
-def wait_for_page_idle(page: Page, timeout: int = SHORT_TIMEOUT) -> None:
+
+def _flush_pending_now() -> None:
+    """flush_pending의 동기 버전. 이벤트 루프를 막으므로 프로세스를 끝낼 때(log_error)만 씁니다."""
+    for flush in (NOTIFIER.flush, HISTORY.flush):
+        try:
+            flush()
+        except Exception:
+            pass
+
+
+async def wait_for_page_idle(page: Page, timeout: int = SHORT_TIMEOUT) -> None:
     try:
-        page.wait_for_load_state("networkidle", timeout=timeout)
+        await page.wait_for_load_state("networkidle", timeout=timeout)
     except PlaywrightTimeoutError:
         pass
 
 
-def handle_waiting_popup(page: Page) -> None:
-    """'접속대기 중입니다' 팝업이 뜨면 사라질 때까지 대기합니다."""
-    try:
-        # 팝업 텍스트가 포함된 요소 찾기
-        popup = page.get_by_text("접속대기", exact=False)
-        if popup.count() > 0 and popup.first.is_visible():
-            log_info("접속 대기 팝업 감지. 대기 중...")
-            popup.first.wait_for(state="hidden", timeout=30000)  # 최대 30초 대기
-            log_info("접속 대기 해제됨.")
-    except Exception:
-        pass
+async def handle_waiting_popup(page: Page) -> bool:
+    """'접속대기 중입니다' 팝업이 뜨면 사라질 때까지 대기합니다. 팝업이 떴으면 True."""
+    with timed(PHASE_WAITING_POPUP):
+        try:
+            # 팝업 텍스트가 포함된 요소 찾기
+            popup = page.get_by_text("접속대기", exact=False)
+            if await popup.count() > 0 and await popup.first.is_visible():
+                log_info("접속 대기 팝업 감지. 대기 중...")
+                await popup.first.wait_for(state="hidden", timeout=30000)  # 최대 30초 대기
+                log_info("접속 대기 해제됨.")
+                return True
+        except Exception:
+            pass
+        return False
 
 
-def get_cell_text(page: Page, selector: str, required: bool = False) -> str:
+async def get_cell_text(page: Page, selector: str, required: bool = False) -> str:
     """셀 텍스트를 가져옵니다. required=True일 경우 요소를 찾지 못하면 에러 발생."""
     locator = page.locator(selector)
     try:
-        count = locator.count()
+        count = await locator.count()
         if count == 0:
             if required:
                 log_error(f"필수 요소를 찾을 수 없습니다: {selector}", exit_on_error=True)
             return ""
-        text = locator.inner_text(timeout=1000)
+        text = await locator.inner_text(timeout=1000)
         return (text or "").strip()
     except (PlaywrightTimeoutError, PlaywrightError) as e:
         if required:
@@ -134,10 +229,10 @@ def get_cell_text(page: Page, selector: str, required: bool = False) -> str:
         return ""
 
 
-def has_element(page: Page, selector: str, required: bool = False) -> bool:
+async def has_element(page: Page, selector: str, required: bool = False) -> bool:
     """요소 존재 여부를 확인합니다. required=True일 경우 요소를 찾지 못하면 에러 발생."""
     try:
-        count = page.locator(selector).count()
+        count = await page.locator(selector).count()
         if required and count == 0:
             log_error(f"필수 요소를 찾을 수 없습니다: {selector}", exit_on_error=True)
         return count > 0
@@ -147,6 +242,62 @@ def has_element(page: Page, selector: str, required: bool = False) -> bool:
         return False
 
 
+async def submit_search(page: Page) -> None:
+    """조회 버튼을 JS로 클릭합니다 (버튼이 없으면 새로고침)."""
+    with timed(PHASE_SUBMIT):
+        submit_btn = page.locator("#submit, input[value='조회하기']")
+        if await submit_btn.count() > 0:
+            await submit_btn.first.evaluate(SUBMIT_SEARCH_JS)
+        else:
+            await page.reload()
+
+
+async def submit_search_and_parse(
+    page: Page,
+    plan: ScanPlan,
+    governor: Optional[RefreshGovernor] = None,
+    log_timing: bool = True,
+) -> List[TrainRow]:
+    """조회 후 selectScheduleList.do 응답을 직접 파싱합니다. 잔여석이 있으면 테이블 렌더링을 기다리지 않습니다.
+
+    log_timing이 False면 구간 시간 로그를 남기지 않습니다 (매 사이클 로그 방지).
+    """
+    started = time.perf_counter()
+    # 조회 버튼 클릭은 submit_search가 PHASE_SUBMIT으로 재므로, 응답 구간은 클릭 이후부터
+    # (expect_response 블록을 빠져나올 때 응답을 기다림)
+    async with page.expect_response(lambda r: SCHEDULE_LIST_PATH in r.url, timeout=DEFAULT_TIMEOUT) as response_info:
+        await submit_search(page)
+        submitted = time.perf_counter()
+    response = await response_info.value
+    body = await response.text()
+    observe_phase(PHASE_RESPONSE, time.perf_counter() - submitted)
+    response_ms = (time.perf_counter() - started) * 1000
+    with timed(PHASE_SCAN):
+        rows = parse_result_html(body)
+    parsed_ms = (time.perf_counter() - started) * 1000
+
+    if plan.rank(rows):
+        if log_timing:
+            log_info(f"[응답 파싱] 응답 수신 {response_ms:.0f}ms, 파싱 완료 {parsed_ms:.0f}ms → 잔여석 감지, 렌더링 대기 생략")
+        return rows
+
+    if await handle_waiting_popup(page) and governor is not None:
+        governor.note_waiting_popup()
+    try:
+        with timed(PHASE_TABLE_READY):
+            await page.wait_for_selector(
+                f"{RESULT_TABLE_SELECTOR} > tr:nth-child({plan.preference.from_train_number})", timeout=8000
+            )
+        table_visible = f"{(time.perf_counter() - started) * 1000:.0f}ms"
+    except PlaywrightTimeoutError:
+        table_visible = "시간 초과"
+        if governor is not None:
+            governor.note_timeout()
+    if log_timing:
+        log_info(f"[응답 파싱] 응답 수신 {response_ms:.0f}ms, 파싱 완료 {parsed_ms:.0f}ms, 테이블 표시 {table_visible} (행 {len(rows)}개)")
+    return rows
+
+
 def iter_browser_commands() -> Iterable[str]:
     custom_command = os.getenv("BROWSER_OPEN_COMMAND")
     if custom_command:
@@ -179,6 +330,47 @@ DEFAULT_SEAT_TYPES = "both"
 DEFAULT_FROM_TRAIN_NUMBER = 1
 DEFAULT_TO_TRAIN_NUMBER = 3
 
+# 잔여석 감지 방식
+# - dom: 새로고침마다 결과 테이블을 한 번의 evaluate로 스캔
+# - watch: MutationObserver가 예약 버튼 등장을 binding으로 push
+SCAN_MODE_DOM = "dom"
+SCAN_MODE_WATCH = "watch"
+# - response: selectScheduleList.do 응답 HTML을 렌더링과 병렬로 파싱
+SCAN_MODE_RESPONSE = "response"
+# - http: 로그인 쿠키를 옮긴 keep-alive HTTP 세션으로 조회 폼만 POST (브라우저는 예약 클릭만)
+SCAN_MODE_HTTP = "http"
+DEFAULT_SCAN_MODE = SCAN_MODE_DOM
+
+# 여러 시간대를 탭으로 나눠 볼 때 모든 탭을 합친 분당 새로고침 한도
+DEFAULT_REFRESH_BUDGET = float(os.getenv("MACRO_REFRESH_BUDGET", "60"))
+# 새로고침 조절기 상태와 구간별 소요 시간을 status_q로 보내는 주기 (초)
+STATS_REPORT_INTERVAL = 5.0
+# 좌석 변동이 없을 때 "새로고침 N회" 로그를 남기는 간격 (회)
+REFRESH_LOG_INTERVAL = 10
+
+# 예약 클릭 후 이동을 어디서 처리할지
+# - inline: 조회 페이지에서 그대로 이동, 실패하면 뒤로 가기
+# - tab: 이동 요청을 보조 탭에서 다시 보내 조회 페이지는 결과 화면에 그대로 둠
+RESERVE_MODE_INLINE = "inline"
+RESERVE_MODE_TAB = "tab"
+DEFAULT_RESERVE_MODE = RESERVE_MODE_INLINE
+
+# 작업 시작 단계 (status_q로 {"status": "stage", "stage": ..., "at": ...} 전달)
+STAGE_BROWSER_LAUNCHED = "browser_launched"
+STAGE_LOGGED_IN = "logged_in"
+STAGE_SEARCH_READY = "search_ready"
+STAGE_SCANNING = "scanning"
+STAGE_RESERVED = "reserved"
+STAGE_FAILED = "failed"
+STAGES = (
+    STAGE_BROWSER_LAUNCHED,
+    STAGE_LOGGED_IN,
+    STAGE_SEARCH_READY,
+    STAGE_SCANNING,
+    STAGE_RESERVED,
+    STAGE_FAILED,
+)
+
 
 def get_launch_options() -> dict:
     headless = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower() == "true"
@@ -194,10 +386,11 @@ def get_launch_options() -> dict:
     return launch_options
 
 
-def launch_browser(playwright: Playwright) -> tuple[Browser, BrowserContext]:
+async def launch(playwright: Playwright) -> Browser:
+    """Chromium을 실행합니다. 실패하면 PLAYWRIGHT_BROWSER_FALLBACK 경로(또는 chromium 채널)로 재시도합니다."""
     launch_options = get_launch_options()
     try:
-        browser = playwright.chromium.launch(**launch_options)
+        return await playwright.chromium.launch(**launch_options)
     except PlaywrightError:
         fallback_options = {"headless": launch_options.get("headless", False)}
         browser_path = os.getenv("PLAYWRIGHT_BROWSER_FALLBACK", "/usr/bin/google-chrome")
@@ -205,26 +398,52 @@ def launch_browser(playwright: Playwright) -> tuple[Browser, BrowserContext]:
             fallback_options["executable_path"] = browser_path
         else:
             fallback_options["channel"] = "chromium"
-        browser = playwright.chromium.launch(**fallback_options)
-    
+        return await playwright.chromium.launch(**fallback_options)
+
+
+# HAR 기록/재생 (PLAYWRIGHT_HAR_MODE)
+# - record: 컨텍스트의 모든 요청/응답을 PLAYWRIGHT_HAR_PATH에 기록 (컨텍스트를 닫을 때 저장)
+# - replay: PLAYWRIGHT_HAR_PATH의 기록으로 응답, 기록된 응답 시간 × PLAYWRIGHT_HAR_TIME_SCALE 만큼 지연
+HAR_MODE_RECORD = "record"
+HAR_MODE_REPLAY = "replay"
+
+
+async def new_context(
+    browser: Browser,
+    storage_state: Optional[dict] = None,
+    har_mode: Optional[str] = None,
+    har_path: Optional[str] = None,
+    har_time_scale: Optional[float] = None,
+) -> BrowserContext:
+    """iPhone Safari로 위장한 브라우저 컨텍스트를 만듭니다."""
+    har_mode = (har_mode or os.getenv("PLAYWRIGHT_HAR_MODE") or "").strip().lower()
+    har_path = har_path or os.getenv("PLAYWRIGHT_HAR_PATH") or DEFAULT_HAR_PATH
+    if har_time_scale is None:
+        har_time_scale = float(os.getenv("PLAYWRIGHT_HAR_TIME_SCALE", "1.0"))
+    har_options: dict = {}
+    if har_mode == HAR_MODE_RECORD:
+        har_options = {"record_har_path": har_path, "record_har_mode": "full"}
+
     # iPhone Safari User-Agent 및 viewport 설정
     IPHONE_USER_AGENT = (
         "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
         "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
     )
-    
-    context = browser.new_context(
+
+    context = await browser.new_context(
         user_agent=IPHONE_USER_AGENT,
         viewport={"width": 390, "height": 844},  # iPhone 14 해상도
         device_scale_factor=3,
         is_mobile=True,
         has_touch=True,
+        storage_state=storage_state,
+        **har_options,
     )
     context.set_default_timeout(DEFAULT_TIMEOUT)
     context.set_default_navigation_timeout(DEFAULT_TIMEOUT)
-    
+
     # Prevent window.open
-    context.add_init_script(
+    await context.add_init_script(
         """
         (() => {
             const noop = () => null;
@@ -236,10 +455,461 @@ def launch_browser(playwright: Playwright) -> tuple[Browser, BrowserContext]:
         })();
         """
     )
+    if har_mode == HAR_MODE_REPLAY:
+        log_info(f"HAR 재생: {har_path} (시간 배율 x{har_time_scale})")
+        await install_har_replay(context, har_path, time_scale=har_time_scale)
+    elif har_mode == HAR_MODE_RECORD:
+        log_info(f"HAR 기록: {har_path} (컨텍스트 종료 시 저장)")
+    return context
+
+
+async def launch_browser(
+    playwright: Playwright,
+    storage_state: Optional[dict] = None,
+    har_mode: Optional[str] = None,
+    har_path: Optional[str] = None,
+    har_time_scale: Optional[float] = None,
+) -> tuple[Browser, BrowserContext]:
+    browser = await launch(playwright)
+    context = await new_context(
+        browser,
+        storage_state=storage_state,
+        har_mode=har_mode,
+        har_path=har_path,
+        har_time_scale=har_time_scale,
+    )
     return browser, context
 
 
-def main(
+# 리소스 차단 프로필 (PLAYWRIGHT_BLOCK_PROFILE 또는 main(block_profile=...))
+# - none: 차단 없음
+# - media: 이미지/미디어/폰트 차단
+# - aggressive: media + 스타일시트 + 외부 도메인(트래커 등) 요청 차단
+BLOCK_PROFILE_NONE = "none"
+BLOCK_PROFILE_MEDIA = "media"
+BLOCK_PROFILE_AGGRESSIVE = "aggressive"
+BLOCK_PROFILES: Dict[str, frozenset] = {
+    BLOCK_PROFILE_NONE: frozenset(),
+    BLOCK_PROFILE_MEDIA: frozenset({"image", "media", "font"}),
+    BLOCK_PROFILE_AGGRESSIVE: frozenset({"image", "media", "font", "stylesheet"}),
+}
+DEFAULT_BLOCK_PROFILE = BLOCK_PROFILE_NONE
+
+
+def _site_suffix(url: str) -> str:
+    """etk.srail.kr → srail.kr (IP나 2단계 이하 호스트는 그대로)."""
+    host = urlparse(url).hostname or ""
+    labels = host.split(".")
+    if len(labels) <= 2 or host.replace(".", "").isdigit():
+        return host
+    return ".".join(labels[1:])
+
+
+class ResourceBlocker:
+    """page.route 기반 리소스 차단기. 차단/수신 통계를 take_cycle_stats()를 부를 때마다 끊어 집계합니다.
+
+    컨텍스트를 공유하는 작업마다 통계가 섞이지 않도록 페이지 단위로 설치합니다.
+    """
+
+    def __init__(self, profile: str) -> None:
+        self.profile = profile if profile in BLOCK_PROFILES else DEFAULT_BLOCK_PROFILE
+        self.blocked_types = BLOCK_PROFILES[self.profile]
+        self.block_third_party = self.profile == BLOCK_PROFILE_AGGRESSIVE
+        self.first_party = tuple({_site_suffix(url) for url in (LOGIN_URL, SEARCH_URL, RESERVATION_URL)})
+        self._blocked: Dict[str, int] = {}
+        self._received_bytes = 0
+        self._received_count = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.profile != BLOCK_PROFILE_NONE
+
+    async def install(self, page: Page) -> None:
+        if not self.enabled:
+            return
+        await page.route("**/*", self._handle_route)
+        page.on("response", self._on_response)
+
+    def _is_third_party(self, url: str) -> bool:
+        host = urlparse(url).hostname or ""
+        return not any(host == suffix or host.endswith("." + suffix) for suffix in self.first_party)
+
+    async def _handle_route(self, route: Route) -> None:
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type in self.blocked_types:
+            key = resource_type
+        elif self.block_third_party and resource_type != "document" and self._is_third_party(request.url):
+            key = "third_party"
+        else:
+            await route.fallback()
+            return
+        self._blocked[key] = self._blocked.get(key, 0) + 1
+        await route.abort("blockedbyclient")
+
+    def _on_response(self, response: Response) -> None:
+        self._received_count += 1
+        try:
+            self._received_bytes += int(response.headers.get("content-length") or 0)
+        except ValueError:
+            pass
+
+    def take_cycle_stats(self) -> Dict[str, Any]:
+        """직전 호출 이후(run_search는 새로고침 사이클마다 호출)의 통계를 반환하고 카운터를 초기화합니다."""
+        stats = {
+            "blocked": dict(self._blocked),
+            "blocked_total": sum(self._blocked.values()),
+            "received": self._received_count,
+            "received_bytes": self._received_bytes,
+        }
+        self._blocked = {}
+        self._received_bytes = 0
+        self._received_count = 0
+        return stats
+
+    def record_cycle(self, timer: PhaseTimer) -> Dict[str, Any]:
+        """이번 사이클의 통계를 타이머 카운터에 더하고 반환합니다 (status_q의 metrics로 /metrics, /status에 전달)."""
+        stats = self.take_cycle_stats()
+        for resource_type, count in stats["blocked"].items():
+            timer.count(COUNTER_BLOCKED_REQUESTS, count, resource_type)
+        timer.count(COUNTER_RECEIVED_RESPONSES, stats["received"])
+        timer.count(COUNTER_RECEIVED_BYTES, stats["received_bytes"])
+        return stats
+
+    @staticmethod
+    def format_stats(stats: Dict[str, Any]) -> str:
+        detail = ", ".join(f"{k} {v}" for k, v in sorted(stats["blocked"].items()))
+        return (
+            f"차단 {stats['blocked_total']}건" + (f" ({detail})" if detail else "")
+            + f", 수신 {stats['received']}건/{stats['received_bytes'] / 1024:.1f}KB"
+        )
+
+
+LOGGED_IN_JS = """
+(loginPath) => !location.href.includes(loginPath) && !!document.body && document.body.textContent.includes('로그아웃')
+"""
+
+
+async def is_logged_in(page: Page) -> bool:
+    """현재 페이지가 로그인 상태인지 한 번의 evaluate로 확인합니다."""
+    try:
+        return bool(await page.evaluate(LOGGED_IN_JS, urlparse(LOGIN_URL).path))
+    except PlaywrightError:
+        return False
+
+
+async def login(page: Page, member_number: str, password: str) -> None:
+    """로그인 페이지에서 회원번호/비밀번호로 로그인합니다."""
+    try:
+        log_info("로그인 페이지로 이동 중...")
+        await page.goto(LOGIN_URL, wait_until="domcontentloaded")
+        await wait_for_page_idle(page)
+    except Exception as e:
+        log_error("로그인 페이지 로드 실패", error=e, exit_on_error=True)
+
+    await has_element(page, "#srchDvNm01", required=True)
+    await has_element(page, "#hmpgPwdCphd01", required=True)
+
+    try:
+        log_info("로그인 정보 입력 중...")
+        await page.fill("#srchDvNm01", member_number)
+        await page.fill("#hmpgPwdCphd01", password)
+
+        # Click login button (using class or more robust selector if possible, fallback to xpath)
+        # The original xpath was brittle. Let's try to find by text or class if possible.
+        # Usually login button is input[type=submit] or similar.
+        # Based on original code: xpath=/html/body/div/div[4]/div/div[2]/form/fieldset/div[1]/div[2]/div[2]/div/div[2]/input
+        # Let's try a CSS selector for the submit button in the login form
+        login_btn = page.locator("form fieldset .login_wrap input[type='submit'], form fieldset input[alt='확인'], form fieldset .btn_login")
+        if await login_btn.count() > 0:
+            await login_btn.first.click()
+        else:
+            # Fallback to the specific xpath if generic fails
+            await page.locator("xpath=/html/body/div/div[4]/div/div[2]/form/fieldset/div[1]/div[2]/div[2]/div/div[2]/input").click()
+
+        await wait_for_page_idle(page)
+    except Exception as e:
+        log_error("로그인 실패", error=e, exit_on_error=True)
+
+
+async def search_schedule(
+    page: Page,
+    arrival: str,
+    departure: str,
+    standard_date: str,
+    standard_time: str,
+    navigate: bool = True,
+) -> None:
+    """일정 조회 페이지에서 조건을 입력하고 조회합니다. navigate=False면 이미 조회 페이지에 있는 것으로 간주합니다."""
+    try:
+        if navigate:
+            log_info("일정 조회 페이지로 이동 중...")
+            await page.goto(SEARCH_URL, wait_until="domcontentloaded")
+        await wait_for_page_idle(page)
+    except Exception as e:
+        log_error("일정 조회 페이지 로드 실패", error=e, exit_on_error=True)
+
+    await has_element(page, "#dptRsStnCdNm", required=True)
+    await has_element(page, "#arvRsStnCdNm", required=True)
+
+    try:
+        await page.fill("#dptRsStnCdNm", arrival)
+        await page.fill("#arvRsStnCdNm", departure)
+        await page.select_option("#dptDt", value=standard_date)
+
+        # Time selection
+        try:
+            await page.select_option("#dptTm", label=standard_time)
+        except PlaywrightError:
+            await page.select_option("#dptTm", value=standard_time)
+    except Exception as e:
+        log_error("일정 조회 조건 입력 실패", error=e, exit_on_error=True)
+
+    # Click search button
+    try:
+        log_info("조회 버튼 클릭...")
+        await page.click("input[value='조회하기']")
+        await handle_waiting_popup(page)
+        await wait_for_page_idle(page, timeout=10000)
+    except Exception as e:
+        log_error("조회 버튼 클릭 실패", error=e, exit_on_error=True)
+
+
+def load_storage_state(member_number: str) -> Optional[dict]:
+    """저장된 로그인 세션(storage_state)을 불러옵니다. 다른 회원번호의 세션은 무시합니다."""
+    payload = decrypt_session()
+    if not payload or payload.get("member_number") != member_number:
+        return None
+    return payload.get("storage_state")
+
+
+async def save_storage_state(context: BrowserContext, member_number: str) -> None:
+    """현재 컨텍스트의 로그인 세션을 암호화하여 저장합니다."""
+    try:
+        state = await context.storage_state()
+    except PlaywrightError as e:
+        log_error("로그인 세션 저장 실패", error=e)
+        return
+    if encrypt_session({"member_number": member_number, "saved_at": time.time(), "storage_state": state}):
+        log_info("로그인 세션 저장 완료")
+
+
+def resolve_seat_type_list(seat_types: str) -> List[int]:
+    """좌석 선호를 결과 테이블 컬럼 번호 목록으로 변환합니다 (특실: 6, 일반: 7)."""
+    seat_preference = (seat_types or DEFAULT_SEAT_TYPES).strip().lower()
+    if seat_preference == "standard":
+        return [7]
+    if seat_preference == "special":
+        return [6]
+    return [6, 7]
+
+
+def load_preference(from_train_number: int, to_train_number: int, seat_type_list: List[int]) -> Preference:
+    """환경변수의 선호 조건을 읽습니다. 형식이 틀리면 어느 변수인지 알려 주고 에러로 종료합니다."""
+    try:
+        return Preference.from_env(from_train_number, to_train_number, seat_type_list)
+    except ValueError as e:
+        log_error(f"선호 조건 설정 오류: {e}", exit_on_error=True)
+
+
+def report_status(payload: dict) -> None:
+    """status_q로 진행 상태를 전달합니다 (api_server.py에서 사용)."""
+    _status_q = _job_queues.get()[0]
+    if _status_q is not None:
+        # 상태보다 앞서 남긴 로그가 먼저 도착하도록
+        _flush_logs()
+        try:
+            _status_q.put(payload)
+        except Exception:
+            pass
+
+
+def report_metrics(timer: PhaseTimer) -> None:
+    """모은 구간 샘플과 카운터 증가분을 status_q로 보내고 비웁니다."""
+    report_status({"status": "metrics", "samples": timer.drain(), "counters": timer.drain_counters()})
+
+
+def report_stage(stage: str, **extra) -> None:
+    """작업 시작 단계 도달 시각을 status_q로 전달합니다."""
+    report_status({"status": "stage", "stage": stage, "at": time.time(), **extra})
+
+
+async def ensure_logged_in(
+    page: Page,
+    context: BrowserContext,
+    member_number: str,
+    password: str,
+    check_first: bool = True,
+) -> None:
+    """로그인 상태를 확인하고 필요할 때만 로그인합니다. 끝나면 일정 조회 페이지에 있습니다."""
+    persist_session = os.getenv("MACRO_PERSIST_SESSION", "true").lower() == "true"
+    logged_in = False
+    if check_first:
+        try:
+            log_info("로그인 세션 확인 중...")
+            await page.goto(SEARCH_URL, wait_until="domcontentloaded")
+            logged_in = await is_logged_in(page)
+        except Exception:
+            logged_in = False
+        log_info("로그인 세션 유효" if logged_in else "로그인 세션이 없거나 만료되었습니다. 다시 로그인합니다.")
+
+    if logged_in:
+        return
+    if check_first:
+        # 만료된 저장 세션은 다음 시작 때 다시 불러오지 않도록 삭제 (로그인 성공 시 새로 저장)
+        clear_session()
+
+    await login(page, member_number, password)
+    if persist_session and await is_logged_in(page):
+        await save_storage_state(context, member_number)
+
+    try:
+        log_info("일정 조회 페이지로 이동 중...")
+        await page.goto(SEARCH_URL, wait_until="domcontentloaded")
+    except Exception as e:
+        log_error("일정 조회 페이지 로드 실패", error=e, exit_on_error=True)
+
+
+async def _close_popup(popup: Page) -> None:
+    try:
+        await popup.close()
+    except PlaywrightError:
+        pass
+
+
+async def new_search_page(context: BrowserContext, navigate: bool = True) -> Page:
+    """컨텍스트에 작업용 페이지를 하나 더 열고 일정 조회 페이지를 불러옵니다. 팝업은 바로 닫습니다."""
+    page = await context.new_page()
+    # Close extra pages
+    page.on("popup", _close_popup)
+    if navigate:
+        await page.goto(SEARCH_URL, wait_until="domcontentloaded")
+    return page
+
+
+class ReserveTab:
+    """예약 클릭으로 생기는 조회 페이지의 이동을 막고, 같은 요청을 보조 탭에서 보냅니다.
+
+    조회 페이지는 결과 화면을 떠나지 않으므로 예약이 실패해도 뒤로 가기 없이 다음 사이클을 시작합니다.
+    """
+
+    def __init__(self, context: BrowserContext, scan_page: Page) -> None:
+        self.context = context
+        self.scan_page = scan_page
+        self.page: Optional[Page] = None
+        self._captured: Optional[asyncio.Future] = None
+
+    async def open(self) -> None:
+        # 예약 순간에 탭을 여는 비용을 피하려고 미리 열어 둠
+        self.page = await new_search_page(self.context, navigate=False)
+
+    async def close(self) -> None:
+        if self.page is not None:
+            try:
+                await self.page.close()
+            except PlaywrightError:
+                pass
+            self.page = None
+
+    async def click(self, row_idx: int, seat_type: int, selector: str) -> bool:
+        """조회 페이지의 다음 이동 요청을 가로채도록 한 뒤 예약 버튼을 클릭합니다."""
+        self._captured = asyncio.get_running_loop().create_future()
+        await self.scan_page.route("**/*", self._intercept)
+        clicked = False
+        try:
+            clicked = await click_reserve_button(self.scan_page, row_idx, seat_type, selector)
+        finally:
+            # 클릭하지 못했으면(예외 포함) wait_outcome이 불리지 않으므로 여기서 해제
+            if not clicked:
+                await self._disarm()
+        return clicked
+
+    async def wait_outcome(self, selector: str, timeout: float = 5000) -> ReserveOutcome:
+        """가로챈 요청을 보조 탭에서 보내고 그 탭의 결과를 판정합니다. 이동 없이 alert만 뜨면 RESULTS.
+
+        timeout(ms)은 클릭 직후부터 보조 탭 판정까지 전체에 한 번만 적용되고, 넘기면 TIMEOUT입니다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+        captured = self._captured
+        in_place = asyncio.ensure_future(wait_for_reserve_outcome(self.scan_page, selector, timeout=timeout))
+        try:
+            done, _ = await asyncio.wait({captured, in_place}, timeout=timeout / 1000, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            await self._disarm()
+        in_place.cancel()
+        if captured not in done:
+            return in_place.result() if in_place in done else ReserveOutcome.TIMEOUT
+        try:
+            return await asyncio.wait_for(self._follow(captured.result(), selector, deadline), deadline - loop.time())
+        except asyncio.TimeoutError:
+            return ReserveOutcome.TIMEOUT
+
+    async def _follow(self, request, selector: str, deadline: float) -> ReserveOutcome:
+        """가로챈 요청을 보조 탭에서 보내고 deadline까지 남은 시간 안에 결과를 판정합니다."""
+        if self.page is None:
+            await self.open()
+        await self._replay(request)
+        await handle_waiting_popup(self.page)
+        # Playwright는 timeout=0을 '무제한'으로 보므로 최소 1ms
+        remaining = max(1.0, (deadline - asyncio.get_running_loop().time()) * 1000)
+        return await wait_for_reserve_outcome(self.page, selector, timeout=remaining)
+
+    async def _intercept(self, route: Route) -> None:
+        request = route.request
+        captured = self._captured
+        if (
+            captured is not None
+            and not captured.done()
+            and request.is_navigation_request()
+            and request.frame == self.scan_page.main_frame
+        ):
+            captured.set_result(request)
+            # ERR_ABORTED: 오류 페이지 없이 이동만 취소되어 결과 화면이 그대로 남음
+            await route.abort("aborted")
+            return
+        await route.fallback()
+
+    async def _disarm(self) -> None:
+        self._captured = None
+        try:
+            await self.scan_page.unroute("**/*", self._intercept)
+        except PlaywrightError:
+            pass
+
+    async def _replay(self, request) -> None:
+        """원래 요청의 method/body/content-type/referer로 보조 탭을 이동시킵니다 (쿠키는 컨텍스트 공유)."""
+        original = await request.all_headers()
+
+        async def override(route: Route) -> None:
+            headers = await route.request.all_headers()
+            for key in ("content-type", "referer"):
+                if key in original:
+                    headers[key] = original[key]
+            await route.continue_(method=request.method, post_data=request.post_data_buffer, headers=headers)
+
+        await self.page.route(lambda url: url == request.url, override, times=1)
+        await self.page.goto(request.url, wait_until="commit")
+
+
+async def open_session(browser: Browser, member_number: str, password: str) -> tuple[BrowserContext, Page]:
+    """컨텍스트 생성 → 로그인(저장된 세션 우선) → 일정 조회 페이지 로드까지 수행합니다."""
+    persist_session = os.getenv("MACRO_PERSIST_SESSION", "true").lower() == "true"
+    # 저장된 로그인 세션 (같은 회원번호일 때만)
+    storage_state = load_storage_state(member_number) if persist_session else None
+    if not persist_session:
+        # 세션 저장을 끄면 이전에 저장된 세션도 남기지 않음
+        clear_session()
+    context = await new_context(browser, storage_state=storage_state)
+    page = await new_search_page(context, navigate=False)
+
+    await ensure_logged_in(page, context, member_number, password, check_first=storage_state is not None)
+    return context, page
+
+
+async def run_search(
+    context: BrowserContext,
+    page: Page,
     arrival: Optional[str] = None,
     departure: Optional[str] = None,
     from_train_number: Optional[int] = None,
@@ -247,14 +917,14 @@ def main(
     standard_date: Optional[str] = None,
     standard_time: Optional[str] = None,
     seat_types: Optional[str] = None,
-    status_q: Optional[object] = None,
-    logs_q: Optional[object] = None,
-) -> None:
-    """메인 함수. status_q와 logs_q는 api_server.py에서 전달됩니다."""
-    global _status_q, _logs_q
-    _status_q = status_q
-    _logs_q = logs_q
-    
+    scan_mode: Optional[str] = None,
+    block_profile: Optional[str] = None,
+    coordinator: Optional["TabCoordinator"] = None,
+) -> bool:
+    """로그인된 일정 조회 페이지에서 조회 → 잔여석 스캔 → 예약까지 반복합니다. 예약 성공 시 True.
+
+    coordinator가 있으면 다른 탭과 새로고침 예산·예약 잠금을 공유하고, 다른 탭이 예약하면 False로 끝납니다.
+    """
     # Defaults
     arrival = arrival or DEFAULT_ARRIVAL
     departure = departure or DEFAULT_DEPARTURE
@@ -263,234 +933,620 @@ def main(
     standard_date = standard_date or DEFAULT_STANDARD_DATE
     standard_time = standard_time or DEFAULT_STANDARD_TIME
     seat_types = seat_types or DEFAULT_SEAT_TYPES
-    
-    reserved = False
+    scan_mode = (scan_mode or os.getenv("MACRO_SCAN_MODE") or DEFAULT_SCAN_MODE).strip().lower()
+    block_profile = (block_profile or os.getenv("PLAYWRIGHT_BLOCK_PROFILE") or DEFAULT_BLOCK_PROFILE).strip().lower()
 
-    log_info("--------------- Start SRT Macro ---------------")
     log_info(f"설정: {arrival} -> {departure}, {standard_date} {standard_time}시, 좌석: {seat_types}")
     log_info(f"열차 범위: {from_train_number} ~ {to_train_number}")
-    
-    # Load env vars
-    member_number = os.getenv("MEMBER_NUMBER")
-    password = os.getenv("PASSWORD")
-    
-    if not member_number or not password:
-        log_error("환경변수 MEMBER_NUMBER 또는 PASSWORD가 설정되지 않았습니다.", exit_on_error=True)
-
-    # Seat type mapping (Special: 6, Standard: 7)
-    seat_preference = (seat_types or DEFAULT_SEAT_TYPES).strip().lower()
-    if seat_preference == "standard":
-        seat_type_list: list[int] = [7]
-    elif seat_preference == "special":
-        seat_type_list = [6]
-    else:
-        seat_type_list = [6, 7]
+    log_info(f"스캔 모드: {scan_mode}, 리소스 차단: {block_profile}")
 
+    seat_type_list = resolve_seat_type_list(seat_types)
+    # 선호 조건은 작업 시작 시 한 번만 스캔 계획으로 컴파일
+    plan = ScanPlan(load_preference(from_train_number, to_train_number, seat_type_list))
+    log_info(f"선호 조건: {plan.preference.describe()}")
+    # 직전 스캔과 비교해 좌석 상태가 바뀐 셀만 로그/알림
+    tracker = SnapshotTracker()
+    # 변동 이력은 백그라운드 워커가 모아서 SQLite에 기록
+    history = HISTORY.session(f"{arrival}-{departure}", standard_date)
+    notify_changes = os.getenv("MACRO_NOTIFY_SEAT_CHANGES", "false").lower() == "true"
+    reserved = False
     refresh_count = 0
+    first_scan_reported = False
+
+    # 새로고침 간격 조절기 (여러 탭이면 탭 전체가 하나를 공유)
+    governor = coordinator.governor if coordinator is not None else RefreshGovernor()
+    stats_reported_at = 0.0
+
+    # 구간별 소요 시간 (sleep/submit/waiting_popup/table_ready/scan/reserve_click/success_check)
+    timer = PhaseTimer()
+    _phase_timer.set(timer)
 
+    blocker = ResourceBlocker(block_profile)
+    await blocker.install(page)
+    # 직전 새로고침 사이클의 차단/수신 통계 (차단 프로필이 있을 때만)
+    cycle_stats: Optional[Dict[str, Any]] = None
+
+    # 취소(다른 탭이 예약)되거나 예외로 끝나도 finally에서 정리할 자원
+    reserve_tab: Optional[ReserveTab] = None
+    http_client: Optional[HttpScheduleClient] = None
     try:
-        with sync_playwright() as playwright:
-            try:
-                browser, context = launch_browser(playwright)
-            except Exception as e:
-                log_error("브라우저 실행 실패", error=e, exit_on_error=True)
+        reserve_mode = (os.getenv("MACRO_RESERVE_MODE") or DEFAULT_RESERVE_MODE).strip().lower()
+        if reserve_mode == RESERVE_MODE_TAB:
+            reserve_tab = ReserveTab(context, page)
+            await reserve_tab.open()
 
-            page = context.new_page()
-            
-            # Close extra pages
-            context.on("page", lambda p: p.close() if p != page else None)
+        def observe(rows: List[TrainRow], taken_at: Optional[float] = None) -> None:
+            """스냅샷 하나로 감시 열차를 고정하고, 직전 스냅샷과의 변동만 로그/이력/알림으로 남깁니다."""
+            nonlocal plan
+            if plan.pinned is None and rows:
+                # 첫 스냅샷의 열차번호로 감시 범위 고정 (행이 밀려도 같은 열차를 추적)
+                plan = plan.pin(rows)
+                log_info(f"감시 열차: {', '.join(sorted(plan.pinned, key=plan.pinned.get)) or '없음'}")
+            changes = tracker.update(rows, taken_at)
+            if not history.started and tracker.last is not None:
+                history.start(tracker.last)
+            history.record(changes)
+            for change in changes:
+                log_info(f"[변동] {change.describe()}")
+                if notify_changes and change.opened:
+                    NOTIFIER.notify(f"SRT 잔여석 감지: {change.describe()}", coalesce=True)
 
-            # 1. Login
-            try:
-                log_info("로그인 페이지로 이동 중...")
-                page.goto(LOGIN_URL, wait_until="domcontentloaded")
-                wait_for_page_idle(page)
-            except Exception as e:
-                log_error("로그인 페이지 로드 실패", error=e, exit_on_error=True)
+        # watch 모드: 이후 모든 페이지 로드에 좌석 감시 스크립트 설치
+        seat_hits: Optional[List[dict]] = None
+        seat_snapshots: List[Tuple[float, List[TrainRow]]] = []
+        # 감시 스크립트를 열차번호로 고정했는지 (계획은 첫 스냅샷에서 고정됨)
+        watch_pinned = False
+        if scan_mode == SCAN_MODE_WATCH:
+            seat_hits = await install_seat_watcher(
+                page, from_train_number, to_train_number, seat_type_list, snapshots=seat_snapshots
+            )
 
-            has_element(page, "#srchDvNm01", required=True)
-            has_element(page, "#hmpgPwdCphd01", required=True)
-            
+        await search_schedule(page, arrival, departure, standard_date, standard_time, navigate=False)
+        report_stage(STAGE_SEARCH_READY)
+
+        # 3. Loop for reservation
+        result_table_selector = RESULT_TABLE_SELECTOR
+        log_info("결과 테이블 대기 중...")
+        try:
+            await page.wait_for_selector(result_table_selector, timeout=15000)
+        except PlaywrightTimeoutError:
+            log_error(f"결과 테이블을 찾을 수 없습니다. URL: {page.url}", exit_on_error=True)
+
+        async def try_reserve(row_idx: int, seat_type: int, train_label: str) -> Optional[bool]:
+            """예약 버튼을 클릭하고 결과를 확인합니다. 버튼이 사라졌으면 None."""
             try:
-                log_info("로그인 정보 입력 중...")
-                page.fill("#srchDvNm01", member_number)
-                page.fill("#hmpgPwdCphd01", password)
-                
-                # Click login button (using class or more robust selector if possible, fallback to xpath)
-                # The original xpath was brittle. Let's try to find by text or class if possible.
-                # Usually login button is input[type=submit] or similar.
-                # Based on original code: xpath=/html/body/div/div[4]/div/div[2]/form/fieldset/div[1]/div[2]/div[2]/div/div[2]/input
-                # Let's try a CSS selector for the submit button in the login form
-                login_btn = page.locator("form fieldset .login_wrap input[type='submit'], form fieldset input[alt='확인'], form fieldset .btn_login")
-                if login_btn.count() > 0:
-                    login_btn.first.click()
+                seat_name = "특실" if seat_type == 6 else "일반실"
+                log_info(f"[{row_idx}번 열차 {train_label}/{seat_name}] 예약 버튼 발견! 즉시 클릭...")
+
+                # === 최적화 2: JS 직접 클릭 (actionability 체크 생략) ===
+                with timed(PHASE_RESERVE_CLICK):
+                    if reserve_tab is not None:
+                        clicked = await reserve_tab.click(row_idx, seat_type, result_table_selector)
+                    else:
+                        clicked = await click_reserve_button(page, row_idx, seat_type, result_table_selector)
+                if not clicked:
+                    # 스냅샷 이후 버튼이 사라짐 → 다음 후보
+                    return None
+
+                if reserve_tab is not None:
+                    # 보조 탭에서 이동·판정 (waiting 팝업도 보조 탭에서 처리)
+                    with timed(PHASE_SUCCESS_CHECK):
+                        outcome = await reserve_tab.wait_outcome(result_table_selector, timeout=5000)
                 else:
-                    # Fallback to the specific xpath if generic fails
-                    page.locator("xpath=/html/body/div/div[4]/div/div[2]/form/fieldset/div[1]/div[2]/div[2]/div/div[2]/input").click()
-                
-                wait_for_page_idle(page)
-            except Exception as e:
-                log_error("로그인 실패", error=e, exit_on_error=True)
+                    # === 최적화 3: 최소한의 대기 ===
+                    await handle_waiting_popup(page)
+                    with timed(PHASE_SUCCESS_CHECK):
+                        # 성공 표시/실패 메시지/결과 테이블 복귀 중 먼저 나타나는 것으로 바로 판정
+                        outcome = await wait_for_reserve_outcome(page, result_table_selector, timeout=5000)
+                if outcome == ReserveOutcome.SUCCESS:
+                    log_info(">>> 예약 성공! <<<")
+                    notify("SRT 예약 성공! 10분 내에 결제하세요.")
+                    await asyncio.to_thread(open_reservation_page, RESERVATION_URL)
+                    return True
+
+                if reserve_tab is not None or outcome == ReserveOutcome.RESULTS or (
+                    outcome == ReserveOutcome.TIMEOUT and await has_element(page, result_table_selector)
+                ):
+                    # 조회 페이지가 결과 화면에 그대로 있으므로 뒤로 가기 없이 다음 사이클로
+                    log_info(f"예약 실패 ({'응답 없음' if outcome == ReserveOutcome.TIMEOUT else '잔여석 선점됨'}). 다시 검색...")
+                    return False
+                log_info(f"예약 실패 ({'잔여석 선점됨' if outcome == ReserveOutcome.SOLD_OUT else '응답 없음'}). 다시 검색...")
+                await page.go_back(wait_until="domcontentloaded")
+                # 테이블이 다시 로드될 때까지만 대기
+                try:
+                    await page.wait_for_selector(result_table_selector, timeout=5000)
+                except PlaywrightTimeoutError:
+                    pass
+                return False  # 다음 새로고침 사이클로
 
-            # 2. Search Schedule
-            try:
-                log_info("일정 조회 페이지로 이동 중...")
-                page.goto(SEARCH_URL, wait_until="domcontentloaded")
-                wait_for_page_idle(page)
             except Exception as e:
-                log_error("일정 조회 페이지 로드 실패", error=e, exit_on_error=True)
+                log_error("예약 클릭 중 오류", error=e)
+                if reserve_tab is None:
+                    try:
+                        await page.go_back(wait_until="domcontentloaded")
+                    except Exception:
+                        pass
+                return False
+
+        # response/http 모드: 직전 새로고침 응답에서 파싱한 행 (첫 사이클은 DOM 스캔)
+        response_rows: Optional[List[TrainRow]] = None
 
-            has_element(page, "#dptRsStnCdNm", required=True)
-            has_element(page, "#arvRsStnCdNm", required=True)
-            
+        # http 모드: 로그인된 컨텍스트의 쿠키와 조회 폼을 HTTP 세션으로 이전
+        if scan_mode == SCAN_MODE_HTTP:
             try:
-                page.fill("#dptRsStnCdNm", arrival)
-                page.fill("#arvRsStnCdNm", departure)
-                page.select_option("#dptDt", value=standard_date)
-                
-                # Time selection
-                try:
-                    page.select_option("#dptTm", label=standard_time)
-                except PlaywrightError:
-                    page.select_option("#dptTm", value=standard_time)
+                http_client = await HttpScheduleClient.from_page(
+                    page,
+                    SEARCH_URL,
+                    build_search_fields(arrival, departure, standard_date, standard_time),
+                )
+                log_info(f"HTTP 폴링 세션 준비 완료 (필드 {len(http_client.fields)}개)")
             except Exception as e:
-                log_error("일정 조회 조건 입력 실패", error=e, exit_on_error=True)
+                log_error("HTTP 폴링 세션 준비 실패, DOM 스캔으로 진행", error=e)
 
-            # Click search button
+        while True:
+            if coordinator is not None and coordinator.reserved.is_set():
+                log_info("다른 탭에서 예약을 진행했습니다. 조회를 종료합니다.")
+                break
             try:
-                log_info("조회 버튼 클릭...")
-                page.click("input[value='조회하기']")
-                handle_waiting_popup(page)
-                wait_for_page_idle(page, timeout=10000)
+                if seat_hits is not None:
+                    # watch 모드: MutationObserver가 binding으로 알려준 셀만 클릭 (DOM 스캔 없음)
+                    candidates = plan.rank_hits(seat_hits)
+                    seat_hits.clear()
+                    # 변동 감지는 페이지가 push한 스냅샷으로 (클릭 경로와 무관)
+                    for taken_at, snapshot_rows in seat_snapshots:
+                        observe(snapshot_rows, taken_at)
+                    seat_snapshots.clear()
+                    if plan.pinned is not None and not watch_pinned:
+                        # 이후 감지도 행 위치 대신 고정된 열차번호로
+                        await pin_seat_watcher(page, plan.pinned)
+                        watch_pinned = True
+                else:
+                    # === 최적화 1: 테이블 전체를 한 번의 evaluate로 스캔 (좌석 타입 특실: 6, 일반: 7) ===
+                    if response_rows is not None:
+                        rows, response_rows = response_rows, None
+                    else:
+                        with timed(PHASE_SCAN):
+                            rows = await scan_result_table(page, result_table_selector)
+                    observe(rows)
+                    # 선호 조건 점수가 높은 좌석부터
+                    candidates = plan.rank(rows)
+                    if candidates and http_client is not None:
+                        # 잔여석 발견 시에만 브라우저 페이지를 새로 조회해 예약 버튼을 띄움
+                        await submit_search(page)
+                        await handle_waiting_popup(page)
+                if not first_scan_reported:
+                    first_scan_reported = True
+                    report_status({"status": "first_scan", "at": time.time()})
+                    report_stage(STAGE_SCANNING)
+                for candidate in candidates:
+                    row_idx, seat_type, train_label = candidate.row_idx, candidate.seat_type, candidate.train_label
+                    if scan_mode == SCAN_MODE_RESPONSE or http_client is not None:
+                        # 응답에서 찾은 버튼이 DOM에 그려질 때까지만 대기 (셀렉터는 계획에 미리 만들어 둠)
+                        try:
+                            await page.wait_for_selector(candidate.selector, timeout=SHORT_TIMEOUT)
+                        except PlaywrightTimeoutError:
+                            continue
+                    # 여러 탭 중 먼저 잠금을 잡은 탭만 예약 진행
+                    async with (coordinator.lock if coordinator is not None else contextlib.nullcontext()):
+                        if coordinator is not None and coordinator.reserved.is_set():
+                            break
+                        outcome = await try_reserve(row_idx, seat_type, train_label)
+                        if outcome and coordinator is not None:
+                            coordinator.reserved.set()
+                    if outcome is None:
+                        continue
+                    reserved = outcome
+                    break
+
+                if reserved:
+                    break
+
             except Exception as e:
-                log_error("조회 버튼 클릭 실패", error=e, exit_on_error=True)
+                log_error("잔여석 조회 루프 중 오류", error=e)
+                # 매크로가 종료되지 않고 계속 실행되므로 Discord 알림은 보내지 않음
 
-            # 3. Loop for reservation
-            result_table_selector = "#result-form table tbody"
-            log_info("결과 테이블 대기 중...")
-            try:
-                page.wait_for_selector(result_table_selector, timeout=15000)
-            except PlaywrightTimeoutError:
-                log_error(f"결과 테이블을 찾을 수 없습니다. URL: {page.url}", exit_on_error=True)
-
-            # 좌석 타입별 CSS selector 생성 (특실: 6, 일반: 7)
-            def build_reserve_btn_selectors() -> List[tuple[str, int, int]]:
-                """예약 버튼 셀렉터 목록 생성 (우선순위 순) - (selector, row_idx, seat_type)"""
-                selectors = []
-                for row_idx in range(from_train_number, to_train_number + 1):
-                    for seat_type in seat_type_list:
-                        # "예약하기" 텍스트가 포함된 버튼만 찾음 (:has-text 사용)
-                        selector = (
-                            f"{result_table_selector} > tr:nth-child({row_idx}) "
-                            f"> td:nth-child({seat_type}) a:has-text('예약하기')"
+            # Refresh logic
+            if not reserved:
+                refresh_count += 1
+
+                # === 최적화 4: 목표 조회 수(토큰 버킷) + 백오프로 딜레이 결정 ===
+                with timed(PHASE_SLEEP):
+                    delay = await governor.wait()
+
+                # 좌석 변동은 스캔 시 바로 로그하므로 새로고침 로그는 REFRESH_LOG_INTERVAL회마다만
+                if refresh_count % REFRESH_LOG_INTERVAL == 0:
+                    backoff = f", 백오프 x{governor.backoff:.1f}" if governor.backoff > 1 else ""
+                    if cycle_stats is not None:
+                        log_info(
+                            f"새로고침 {refresh_count}회 (딜레이: {delay:.2f}s{backoff}, "
+                            f"직전 사이클 {ResourceBlocker.format_stats(cycle_stats)})"
                         )
-                        selectors.append((selector, row_idx, seat_type))
-                return selectors
+                    else:
+                        log_info(f"새로고침 {refresh_count}회 (딜레이: {delay:.2f}s{backoff})")
 
-            while True:
+                cycle_started = time.perf_counter()
                 try:
-                    # === 최적화 1: 모든 예약 버튼 한번에 탐지 (텍스트 확인 포함) ===
-                    for btn_selector, row_idx, seat_type in build_reserve_btn_selectors():
-                        btn = page.locator(btn_selector)
-                        if btn.count() > 0:
-                            # "예약하기" 텍스트가 있는 버튼만 매칭됨
-                            try:
-                                seat_name = "특실" if seat_type == 6 else "일반실"
-                                log_info(f"[{row_idx}번 열차/{seat_name}] 예약 버튼 발견! 즉시 클릭...")
-                                
-                                # === 최적화 2: JS 직접 클릭 (actionability 체크 생략) ===
-                                btn.first.evaluate("el => el.click()")
-                                
-                                # === 최적화 3: 최소한의 대기 ===
-                                handle_waiting_popup(page)
-                                # networkidle 대신 특정 요소만 확인
-                                try:
-                                    page.wait_for_selector(
-                                        "#isFalseGotoMain, .payment, input[value='결제하기']",
-                                        timeout=5000
-                                    )
-                                except PlaywrightTimeoutError:
-                                    pass  # 타임아웃이어도 계속 진행
-                                
-                                # 예약 성공 여부 확인
-                                if has_element(page, "#isFalseGotoMain") or "결제" in page.title() or page.get_by_text("결제하기").count() > 0:
-                                    reserved = True
-                                    log_info(">>> 예약 성공! <<<")
-                                    send_discord_notification("SRT 예약 성공! 10분 내에 결제하세요.")
-                                    open_reservation_page(RESERVATION_URL)
-                                    break
-                                else:
-                                    log_info("예약 실패 (잔여석 선점됨). 다시 검색...")
-                                    page.go_back(wait_until="domcontentloaded")
-                                    # 테이블이 다시 로드될 때까지만 대기
-                                    try:
-                                        page.wait_for_selector(result_table_selector, timeout=5000)
-                                    except PlaywrightTimeoutError:
-                                        pass
-                                    break  # 다음 새로고침 사이클로
-                                    
-                            except Exception as e:
-                                log_error("예약 클릭 중 오류", error=e)
-                                try:
-                                    page.go_back(wait_until="domcontentloaded")
-                                except Exception:
-                                    pass
-                                break
-                    
-                    if reserved:
-                        break
-
-                except Exception as e:
-                    log_error("잔여석 조회 루프 중 오류", error=e)
-                    # 매크로가 종료되지 않고 계속 실행되므로 Discord 알림은 보내지 않음
-
-                # Refresh logic
-                if not reserved:
-                    refresh_count += 1
-                    
-                    # === 최적화 4: 랜덤 딜레이 조정 (0.3~1.5초) ===
-                    delay = random.uniform(0.3, 1.5)
-                    time.sleep(delay)
-                    
-                    log_info(f"새로고침 {refresh_count}회 (딜레이: {delay:.2f}s)")
-                    
-                    try:
+                    if http_client is not None:
+                        try:
+                            with timed(PHASE_HTTP_FETCH):
+                                response_rows = await asyncio.to_thread(http_client.search)
+                        except SessionExpiredError:
+                            # 세션 쿠키 갱신 후 다음 사이클에서 재시도
+                            log_info("HTTP 조회 응답에 결과가 없습니다. 브라우저 쿠키로 세션 갱신...")
+                            governor.note_waiting_popup()
+                            http_client.update_cookies(await context.cookies())
+                    elif scan_mode == SCAN_MODE_RESPONSE:
+                        response_rows = await submit_search_and_parse(
+                            page, plan, governor=governor, log_timing=refresh_count % REFRESH_LOG_INTERVAL == 0
+                        )
+                    else:
                         # 조회 버튼 JS 클릭 (더 빠름)
-                        submit_btn = page.locator("#submit, input[value='조회하기']")
-                        if submit_btn.count() > 0:
-                            submit_btn.first.evaluate("el => el.click()")
-                        else:
-                            page.reload()
-                        
-                        handle_waiting_popup(page)
-                        
+                        await submit_search(page)
+
+                        if await handle_waiting_popup(page):
+                            governor.note_waiting_popup()
+
                         # === 최적화 3: networkidle 대신 테이블만 기다림 ===
                         try:
-                            page.wait_for_selector(
-                                f"{result_table_selector} > tr:nth-child({from_train_number})",
-                                timeout=8000
-                            )
+                            with timed(PHASE_TABLE_READY):
+                                if seat_hits is not None:
+                                    # 파싱 완료 또는 예약 버튼 감지 시점에 바로 깨어남
+                                    await wait_for_watch_settled(page, timeout=8000)
+                                else:
+                                    await page.wait_for_selector(
+                                        f"{result_table_selector} > tr:nth-child({from_train_number})",
+                                        timeout=8000
+                                    )
                         except PlaywrightTimeoutError:
                             log_info("테이블 로딩 지연, 계속 진행...")
-                            
-                    except Exception as e:
-                        log_error("새로고침 실패, 페이지 재로딩", error=e)
-                        page.reload()
-                        try:
-                            page.wait_for_selector(result_table_selector, timeout=10000)
-                        except PlaywrightTimeoutError:
-                            pass
-                else:
+                            governor.note_timeout()
+
+                except Exception as e:
+                    log_error("새로고침 실패, 페이지 재로딩", error=e)
+                    governor.note_timeout()
+                    await page.reload()
+                    try:
+                        await page.wait_for_selector(result_table_selector, timeout=10000)
+                    except PlaywrightTimeoutError:
+                        pass
+
+                cycle_latency = time.perf_counter() - cycle_started
+                timer.observe(PHASE_CYCLE, cycle_latency)
+                governor.record_cycle(cycle_latency)
+                if blocker.enabled:
+                    cycle_stats = blocker.record_cycle(timer)
+                if time.time() - stats_reported_at >= STATS_REPORT_INTERVAL:
+                    stats_reported_at = time.time()
+                    report_status({"status": "governor", "at": stats_reported_at, **governor.snapshot()})
+                    report_metrics(timer)
+            else:
+                break
+    finally:
+        # 관측 종료 표시 (작업이 멈춰 있던 동안이 열림 구간에 포함되지 않도록)
+        history.end(tracker.last)
+        report_metrics(timer)
+        # 예약한 탭은 결제 화면이므로 남겨 둠
+        if reserve_tab is not None and not reserved:
+            await reserve_tab.close()
+        if http_client is not None:
+            http_client.close()
+    if reserved:
+        report_stage(STAGE_RESERVED)
+    return reserved
+
+
+def parse_time_windows(spec: Optional[str], standard_date: str, standard_time: str) -> List[Tuple[str, str]]:
+    """추가 조회 시간대 문자열을 (날짜, 시간) 목록으로 변환합니다. 첫 항목은 항상 기본 시간대입니다.
+
+    spec 예: "20, 22, 20251025 08" (시간만 쓰면 standard_date 기준)
+    """
+    windows = [(standard_date, standard_time)]
+    for item in (spec or "").replace(";", ",").split(","):
+        parts = item.replace(":", " ").split()
+        if not parts:
+            continue
+        window = (parts[0], parts[1]) if len(parts) >= 2 else (standard_date, parts[0])
+        if window not in windows:
+            windows.append(window)
+    return windows
+
+
+class TabCoordinator:
+    """한 작업의 여러 탭이 공유하는 예약 잠금과 분당 새로고침 예산."""
+
+    def __init__(self, refresh_budget: float) -> None:
+        self.lock = asyncio.Lock()
+        self.reserved = asyncio.Event()
+        # burst=1: 탭들의 새로고침이 한꺼번에 몰리지 않고 엇갈리도록 함
+        self.governor = RefreshGovernor(refresh_budget, burst=1.0)
+
+
+async def _run_tab(
+    context: BrowserContext,
+    page: Optional[Page],
+    window: Tuple[str, str],
+    coordinator: TabCoordinator,
+    params: dict,
+) -> bool:
+    """시간대 하나를 탭 하나에서 조회합니다. page가 없으면 새 탭을 열고, 예약하지 못하면(취소 포함) 닫습니다."""
+    standard_date, standard_time = window
+    _log_tag.set(f"[{standard_date} {standard_time}시] ")
+    opened = page is None
+    reserved = False
+    try:
+        if page is None:
+            page = await new_search_page(context)
+        reserved = await run_search(
+            context,
+            page,
+            standard_date=standard_date,
+            standard_time=standard_time,
+            coordinator=coordinator,
+            **params,
+        )
+        return reserved
+    finally:
+        if opened and page is not None and not reserved:
+            await _close_popup(page)
+
+
+async def run_search_windows(
+    context: BrowserContext,
+    page: Page,
+    standard_date: Optional[str] = None,
+    standard_time: Optional[str] = None,
+    time_windows: Optional[str] = None,
+    refresh_budget: Optional[float] = None,
+    **params,
+) -> bool:
+    """기본 시간대와 time_windows의 시간대를 같은 컨텍스트의 탭 여러 개에서 동시에 조회합니다.
+
+    시간대가 하나뿐이면 run_search와 같습니다. 한 탭이 예약에 성공하면 나머지 탭은 중단합니다.
+    """
+    standard_date = standard_date or DEFAULT_STANDARD_DATE
+    standard_time = standard_time or DEFAULT_STANDARD_TIME
+    windows = parse_time_windows(time_windows, standard_date, standard_time)
+    if len(windows) == 1:
+        return await run_search(context, page, standard_date=standard_date, standard_time=standard_time, **params)
+
+    refresh_budget = refresh_budget or DEFAULT_REFRESH_BUDGET
+    log_info(f"시간대 {len(windows)}개를 탭으로 나눠 조회 (전체 새로고침 한도 {refresh_budget:.0f}회/분)")
+    coordinator = TabCoordinator(refresh_budget)
+    tasks = [
+        asyncio.create_task(_run_tab(context, page if i == 0 else None, window, coordinator, params))
+        for i, window in enumerate(windows)
+    ]
+    reserved = False
+    pending = set(tasks)
+    try:
+        while pending and not reserved:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    log_error("탭 조회 중 오류", error=task.exception())
+                elif task.result():
+                    reserved = True
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return reserved
+
+
+def get_credentials() -> tuple[Optional[str], Optional[str]]:
+    """환경변수의 회원번호/비밀번호를 확인합니다. 없으면 에러로 종료합니다."""
+    member_number = os.getenv("MEMBER_NUMBER")
+    password = os.getenv("PASSWORD")
+
+    if not member_number or not password:
+        log_error("환경변수 MEMBER_NUMBER 또는 PASSWORD가 설정되지 않았습니다.", exit_on_error=True)
+    return member_number, password
+
+
+def check_preference_env() -> None:
+    """선호 조건 환경변수를 브라우저를 띄우기 전에 검사합니다. 틀리면 에러로 종료합니다."""
+    load_preference(DEFAULT_FROM_TRAIN_NUMBER, DEFAULT_FROM_TRAIN_NUMBER, resolve_seat_type_list(DEFAULT_SEAT_TYPES))
+
+
+async def main_async(
+    arrival: Optional[str] = None,
+    departure: Optional[str] = None,
+    from_train_number: Optional[int] = None,
+    to_train_number: Optional[int] = None,
+    standard_date: Optional[str] = None,
+    standard_time: Optional[str] = None,
+    seat_types: Optional[str] = None,
+    scan_mode: Optional[str] = None,
+    block_profile: Optional[str] = None,
+    time_windows: Optional[str] = None,
+    refresh_budget: Optional[float] = None,
+    status_q: Optional[object] = None,
+    logs_q: Optional[object] = None,
+) -> None:
+    """비동기 메인 함수. 브라우저 실행 → 로그인 → 조회 → 예약을 한 이벤트 루프에서 수행합니다."""
+    set_job_queues(status_q, logs_q)
+
+    log_info("--------------- Start SRT Macro ---------------")
+
+    # Load env vars
+    member_number, password = get_credentials()
+    check_preference_env()
+
+    try:
+        async with async_playwright() as playwright:
+            try:
+                browser = await launch(playwright)
+            except Exception as e:
+                log_error("브라우저 실행 실패", error=e, exit_on_error=True)
+            report_stage(STAGE_BROWSER_LAUNCHED)
+            context, page = await open_session(browser, member_number, password)
+            report_stage(STAGE_LOGGED_IN)
+            try:
+                await run_search_windows(
+                    context,
+                    page,
+                    arrival=arrival,
+                    departure=departure,
+                    from_train_number=from_train_number,
+                    to_train_number=to_train_number,
+                    standard_date=standard_date,
+                    standard_time=standard_time,
+                    seat_types=seat_types,
+                    scan_mode=scan_mode,
+                    block_profile=block_profile,
+                    time_windows=time_windows,
+                    refresh_budget=refresh_budget,
+                )
+            finally:
+                # 중단되어도 컨텍스트를 닫아야 HAR 기록이 저장됨
+                await context.close()
+            await browser.close()
+
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        log_info("사용자에 의해 중단되었습니다.")
+        report_status({"status": "finished"})
+        raise
+    except Exception as e:
+        log_error("치명적 오류 발생", error=e, exit_on_error=True)
+    finally:
+        log_info("--------------- SRT Macro 종료 ---------------")
+        await flush_pending()
+
+
+def main(
+    arrival: Optional[str] = None,
+    departure: Optional[str] = None,
+    from_train_number: Optional[int] = None,
+    to_train_number: Optional[int] = None,
+    standard_date: Optional[str] = None,
+    standard_time: Optional[str] = None,
+    seat_types: Optional[str] = None,
+    scan_mode: Optional[str] = None,
+    block_profile: Optional[str] = None,
+    time_windows: Optional[str] = None,
+    refresh_budget: Optional[float] = None,
+    status_q: Optional[object] = None,
+    logs_q: Optional[object] = None,
+) -> None:
+    """메인 함수. status_q와 logs_q는 api_server.py에서 전달됩니다. (main_async의 동기 래퍼)"""
+    asyncio.run(
+        main_async(
+            arrival=arrival,
+            departure=departure,
+            from_train_number=from_train_number,
+            to_train_number=to_train_number,
+            standard_date=standard_date,
+            standard_time=standard_time,
+            seat_types=seat_types,
+            scan_mode=scan_mode,
+            block_profile=block_profile,
+            time_windows=time_windows,
+            refresh_budget=refresh_budget,
+            status_q=status_q,
+            logs_q=logs_q,
+        )
+    )
+
+
+async def _run_job(context: BrowserContext, params: dict) -> bool:
+    """공유 컨텍스트에 페이지를 하나 열어 작업 하나를 실행합니다. 로그 큐는 이 태스크에만 적용됩니다."""
+    params = dict(params)
+    set_job_queues(params.pop("status_q", None), params.pop("logs_q", None))
+    page: Optional[Page] = None
+    try:
+        page = await new_search_page(context)
+        return await run_search_windows(context, page, **params)
+    except Exception as e:
+        try:
+            log_error("작업 실행 중 오류", error=e, exit_on_error=True)
+        except RuntimeError:
+            pass
+        return False
+    finally:
+        report_status({"status": "finished"})
+        if page is not None:
+            try:
+                await page.close()
+            except PlaywrightError:
+                pass
+
+
+async def run_jobs(jobs: Iterable[dict]) -> List[bool]:
+    """여러 조회 작업을 브라우저 하나, 로그인된 컨텍스트 하나에서 동시에 실행합니다.
+
+    각 작업은 run_search_windows 인자(+ 선택적으로 status_q/logs_q) dict이며, 작업마다 페이지(시간대별 탭)를 씁니다.
+    """
+    jobs = list(jobs)
+    member_number, password = get_credentials()
+    check_preference_env()
+
+    async with async_playwright() as playwright:
+        browser = await launch(playwright)
+        try:
+            context, login_page = await open_session(browser, member_number, password)
+            await login_page.close()
+            return list(await asyncio.gather(*(_run_job(context, params) for params in jobs)))
+        finally:
+            await browser.close()
+            await flush_pending()
+
+
+async def run_warm_worker_async(job_q: object, keepalive: float = WARM_KEEPALIVE_SECONDS) -> None:
+    """run_warm_worker의 비동기 본체. job_q 대기는 스레드로 넘겨 이벤트 루프를 막지 않습니다."""
+    log_info("--------------- SRT Macro 워커 준비 ---------------")
+
+    member_number, password = get_credentials()
+    check_preference_env()
+
+    try:
+        async with async_playwright() as playwright:
+            try:
+                browser = await launch(playwright)
+            except Exception as e:
+                log_error("브라우저 실행 실패", error=e, exit_on_error=True)
+            context, page = await open_session(browser, member_number, password)
+            await wait_for_page_idle(page)
+            report_status({"status": "warm", "at": time.time()})
+            log_info("워커 준비 완료. 작업 대기 중...")
+
+            while True:
+                try:
+                    params = await asyncio.to_thread(job_q.get, True, keepalive)
                     break
+                except queue.Empty:
+                    # 세션 유지: 조회 페이지를 다시 불러와 로그인 상태 확인
+                    await ensure_logged_in(page, context, member_number, password)
 
-            context.close()
-            browser.close()
+            if params is not None:
+                log_info("--------------- Start SRT Macro ---------------")
+                # 브라우저 실행과 로그인은 작업을 받기 전에 끝나 있음
+                report_stage(STAGE_BROWSER_LAUNCHED, warm=True)
+                report_stage(STAGE_LOGGED_IN, warm=True)
+                await run_search_windows(context, page, **params)
+            await context.close()
+            await browser.close()
 
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         log_info("사용자에 의해 중단되었습니다.")
-        if _status_q: _status_q.put({"status": "finished"})
+        report_status({"status": "finished"})
         raise
     except Exception as e:
         log_error("치명적 오류 발생", error=e, exit_on_error=True)
     finally:
         log_info("--------------- SRT Macro 종료 ---------------")
+        await flush_pending()
+
+
+def run_warm_worker(
+    job_q: object,
+    status_q: Optional[object] = None,
+    logs_q: Optional[object] = None,
+    keepalive: float = WARM_KEEPALIVE_SECONDS,
+) -> None:
+    """풀 워커: 브라우저 실행·로그인·조회 페이지 로드까지 마친 뒤 job_q로 조회 조건을 기다립니다.
+
+    대기 중에는 keepalive 초마다 조회 페이지를 다시 불러와 로그인 세션을 유지합니다.
+    job_q에서 None을 받으면 작업 없이 종료합니다.
+    """
+    set_job_queues(status_q, logs_q)
+    asyncio.run(run_warm_worker_async(job_q, keepalive=keepalive))
@@ -0,0 +1,186 @@
+"""Discord 웹훅 알림 백그라운드 전송.
+
+알림은 제한된 크기의 큐에 넣기만 하고, 워커 스레드가 keep-alive 세션으로 보냅니다.
+실패하면 백오프하며 재시도하고, 전송 중에 쌓인 오류 알림은 한 메시지로 합칩니다.
+프로세스 종료 전에 flush()로 남은 알림을 보냅니다.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import requests
+
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_FLUSH_TIMEOUT = 5.0
+# Discord 메시지 content 최대 길이
+MAX_CONTENT_LENGTH = 2000
+
+# (message, coalesce)
+_Item = Tuple[str, bool]
+# 워커 종료 신호
+_STOP = object()
+
+
+class Notifier:
+    """웹훅 알림 큐와 전송 워커. notify()는 큐에 넣기만 하고 바로 돌아옵니다."""
+
+    def __init__(
+        self,
+        webhook_url: Optional[str] = None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        # None이면 보낼 때마다 DISCORD_WEB_HOOK을 읽음 (api_server가 실행 중에 환경변수를 적용하므로)
+        self.webhook_url = webhook_url
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self._q: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._session = requests.Session()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def url(self) -> Optional[str]:
+        return self.webhook_url or os.getenv("DISCORD_WEB_HOOK")
+
+    def notify(self, message: str, coalesce: bool = False) -> bool:
+        """알림을 큐에 넣습니다. 웹훅이 없거나 큐가 가득 차면 False.
+
+        coalesce=True인 알림(오류)은 전송 대기 중인 다른 coalesce 알림과 합쳐 보냅니다.
+        """
+        if not self.url:
+            return False
+        self._ensure_worker()
+        with self._idle:
+            self._pending += 1
+        try:
+            self._q.put_nowait((message, coalesce))
+        except queue.Full:
+            self.dropped += 1
+            self._done(1)
+            return False
+        return True
+
+    def flush(self, timeout: float = DEFAULT_FLUSH_TIMEOUT) -> bool:
+        """큐에 남은 알림을 모두 보낼 때까지 최대 timeout초 기다립니다. 다 보냈으면 True."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._pending > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout: float = DEFAULT_FLUSH_TIMEOUT) -> None:
+        self.flush(timeout)
+        if self._thread is not None and self._thread.is_alive():
+            self._q.put(_STOP)
+            self._thread.join(timeout=1)
+        self._session.close()
+
+    def _ensure_worker(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+                self._thread.start()
+
+    def _done(self, count: int) -> None:
+        with self._idle:
+            self._pending -= count
+            if self._pending <= 0:
+                self._idle.notify_all()
+
+    def _run(self) -> None:
+        carry = None
+        while True:
+            item = carry if carry is not None else self._q.get()
+            carry = None
+            if item is _STOP:
+                return
+            message, coalesce = item
+            messages = [message]
+            if coalesce:
+                carry = self._collect(messages)
+            try:
+                content = _merge(messages)
+                if self._post(content):
+                    self.sent += 1
+                else:
+                    self.failed += 1
+            finally:
+                self.coalesced += len(messages) - 1
+                self._done(len(messages))
+
+    def _collect(self, messages: List[str]):
+        """큐에 이미 쌓인 coalesce 알림을 messages에 모읍니다. 합칠 수 없는 항목이 나오면 돌려줍니다."""
+        while True:
+            try:
+                item = self._q.get_nowait()
+            except queue.Empty:
+                return None
+            if item is _STOP or not item[1]:
+                return item
+            messages.append(item[0])
+
+    def _post(self, content: str) -> bool:
+        """2xx면 성공. 429/5xx/연결 오류는 backoff * 2^n초 후 재시도, 그 밖의 4xx는 포기."""
+        url = self.url
+        if not url:
+            return False
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * (2 ** attempt)
+            try:
+                response = self._session.post(url, json={"content": content}, timeout=self.timeout)
+                if 200 <= response.status_code < 300:
+                    return True
+                if response.status_code == 429:
+                    delay = max(delay, _retry_after(response))
+                elif response.status_code < 500:
+                    return False
+            except requests.RequestException:
+                pass
+            if attempt < self.retries:
+                time.sleep(delay)
+        return False
+
+
+def _retry_after(response: requests.Response) -> float:
+    try:
+        return float(response.json().get("retry_after", 0))
+    except Exception:
+        try:
+            return float(response.headers.get("Retry-After", 0))
+        except (TypeError, ValueError):
+            return 0.0
+
+
+def _merge(messages: List[str]) -> str:
+    if len(messages) == 1:
+        content = messages[0]
+    else:
+        content = f"(알림 {len(messages)}건)\n\n" + "\n\n---\n\n".join(messages)
+    if len(content) > MAX_CONTENT_LENGTH:
+        content = content[:MAX_CONTENT_LENGTH - 1] + "…"
+    return content
+
+
+NOTIFIER = Notifier()
+# multiprocessing 워커는 atexit을 실행하지 않으므로 macro_core가 종료 전에 flush()를 직접 호출함
+atexit.register(NOTIFIER.close)
@@ -0,0 +1,273 @@
+"""열차/좌석 선호 조건과 미리 컴파일한 스캔 계획.
+
+선호 조건(출발 시각 범위, 최대 소요 시간, 좌석 등급 가중치, 지정 열차번호)을
+작업 시작 시 한 번 ScanPlan으로 컴파일해 두고, 스캔할 때는 예약 가능한 좌석에
+점수를 매겨 가장 좋은 좌석부터 클릭합니다. 예약 버튼 셀렉터도 이때 만들어 둡니다.
+
+환경변수 (모두 선택):
+- MACRO_DEPART_AFTER / MACRO_DEPART_BEFORE: 출발 시각 범위 (HH:MM)
+- MACRO_MAX_TRAVEL_MINUTES: 최대 소요 시간 (분)
+- MACRO_SEAT_WEIGHTS: 좌석 등급 가중치 (예: "special=2,standard=1")
+- MACRO_PREFERRED_TRAINS: 우선 예약할 열차번호 (예: "301,305")
+"""
+
+import os
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from scan_engine import (
+    RESULT_TABLE_SELECTOR,
+    SEAT_AVAILABLE,
+    SPECIAL_SEAT_COL,
+    STANDARD_SEAT_COL,
+    TrainRow,
+    reserve_button_selector,
+    train_key,
+)
+
+SEAT_CLASS_COLS = {"special": SPECIAL_SEAT_COL, "standard": STANDARD_SEAT_COL}
+# 기본 가중치: seat_type_list 순서대로 1.0, 0.9 ...
+DEFAULT_SEAT_WEIGHT = 1.0
+DEFAULT_SEAT_WEIGHT_STEP = 0.1
+# 행이 하나 뒤로 갈 때마다 감점 (기본 가중치에서는 예전처럼 앞 행의 좌석이 먼저)
+ROW_PENALTY = 1.0
+# 지정 열차번호 가산점 (행 순서보다 우선)
+PREFERRED_TRAIN_BONUS = 100.0
+
+
+def parse_clock(value: Optional[str]) -> Optional[int]:
+    """"HH:MM" 또는 "HH"를 자정 기준 분으로 변환합니다. 비어 있으면 None, 형식이 틀리면 ValueError."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    hour, _, minute = value.partition(":")
+    try:
+        hour_value, minute_value = int(hour), int(minute or 0)
+    except ValueError:
+        raise ValueError(f"시각은 HH:MM 형식이어야 합니다: {value!r}") from None
+    if not (0 <= hour_value <= 24 and 0 <= minute_value < 60):
+        raise ValueError(f"시각 범위를 벗어났습니다: {value!r}")
+    return hour_value * 60 + minute_value
+
+
+def _env_clock(name: str) -> Optional[int]:
+    try:
+        return parse_clock(os.getenv(name))
+    except ValueError as e:
+        raise ValueError(f"{name}: {e}") from None
+
+
+def _env_seat_weights(weights: Dict[int, float]) -> None:
+    """MACRO_SEAT_WEIGHTS("special=2,standard=1")로 weights를 덮어씁니다. 형식이 틀리면 ValueError."""
+    for item in (os.getenv("MACRO_SEAT_WEIGHTS") or "").split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        col = SEAT_CLASS_COLS.get(name.strip().lower())
+        if col is None:
+            raise ValueError(f"MACRO_SEAT_WEIGHTS: 좌석 등급은 special/standard 중 하나여야 합니다: {item.strip()!r}")
+        try:
+            value = float(weight)
+        except ValueError:
+            raise ValueError(f"MACRO_SEAT_WEIGHTS: 가중치는 숫자여야 합니다: {item.strip()!r}") from None
+        if col in weights:
+            weights[col] = value
+
+
+def _env_max_travel() -> Optional[int]:
+    value = (os.getenv("MACRO_MAX_TRAVEL_MINUTES") or "").strip()
+    if not value:
+        return None
+    try:
+        minutes = int(value)
+    except ValueError:
+        raise ValueError(f"MACRO_MAX_TRAVEL_MINUTES: 분 단위 정수여야 합니다: {value!r}") from None
+    if minutes <= 0:
+        raise ValueError(f"MACRO_MAX_TRAVEL_MINUTES: 0보다 커야 합니다: {value!r}")
+    return minutes
+
+
+class Preference(NamedTuple):
+    """작업 하나의 선호 조건. 시각은 자정 기준 분."""
+
+    from_train_number: int
+    to_train_number: int
+    # (좌석 컬럼, 가중치). 가중치가 같으면 이 순서대로
+    seat_weights: Tuple[Tuple[int, float], ...]
+    depart_after: Optional[int] = None
+    depart_before: Optional[int] = None
+    max_travel_minutes: Optional[int] = None
+    train_numbers: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_env(cls, from_train_number: int, to_train_number: int, seat_type_list: List[int]) -> "Preference":
+        """환경변수에서 선호 조건을 읽습니다. 값의 형식이 틀리면 어느 변수인지 담은 ValueError."""
+        weights: Dict[int, float] = {
+            seat_type: DEFAULT_SEAT_WEIGHT - DEFAULT_SEAT_WEIGHT_STEP * i for i, seat_type in enumerate(seat_type_list)
+        }
+        _env_seat_weights(weights)
+        return cls(
+            from_train_number=from_train_number,
+            to_train_number=to_train_number,
+            seat_weights=tuple((seat_type, weights[seat_type]) for seat_type in seat_type_list),
+            depart_after=_env_clock("MACRO_DEPART_AFTER"),
+            depart_before=_env_clock("MACRO_DEPART_BEFORE"),
+            max_travel_minutes=_env_max_travel(),
+            train_numbers=tuple(
+                key for key in (train_key(t) for t in (os.getenv("MACRO_PREFERRED_TRAINS") or "").split(",")) if key
+            ),
+        )
+
+    def describe(self) -> str:
+        parts = [", ".join(f"{'특실' if col == SPECIAL_SEAT_COL else '일반실'} x{w:g}" for col, w in self.seat_weights)]
+        if self.depart_after is not None or self.depart_before is not None:
+            after = self.depart_after if self.depart_after is not None else 0
+            before = self.depart_before if self.depart_before is not None else 24 * 60
+            parts.append(f"출발 {after // 60:02d}:{after % 60:02d}~{before // 60:02d}:{before % 60:02d}")
+        if self.max_travel_minutes is not None:
+            parts.append(f"최대 {self.max_travel_minutes}분")
+        if self.train_numbers:
+            parts.append(f"우선 열차 {','.join(self.train_numbers)}")
+        return ", ".join(parts)
+
+
+class Target(NamedTuple):
+    """스캔 계획의 (행, 좌석) 셀 하나."""
+
+    row_idx: int
+    seat_type: int
+    weight: float
+    selector: str
+
+
+class Candidate(NamedTuple):
+    """스냅샷에서 찾은 예약 가능 좌석과 점수."""
+
+    row_idx: int
+    seat_type: int
+    train_label: str
+    selector: str
+    score: float
+
+
+class ScanPlan:
+    """Preference를 한 번 컴파일한 불변 스캔 계획. 행별 대상 셀과 예약 버튼 셀렉터를 미리 만들어 둡니다.
+
+    pin()으로 감시 범위를 열차번호에 고정하면 이후 행이 추가/삭제되어 위치가 밀려도 같은 열차를 찾습니다.
+    """
+
+    __slots__ = ("preference", "selector", "targets", "pinned", "_by_row", "_by_cell", "_train_numbers")
+
+    def __init__(
+        self,
+        preference: Preference,
+        selector: str = RESULT_TABLE_SELECTOR,
+        pinned: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.preference = preference
+        self.selector = selector
+        # 열차번호 키 -> 고정 시점의 행 번호 (None이면 행 번호로 감시)
+        self.pinned = pinned
+        targets = tuple(
+            Target(
+                row_idx,
+                seat_type,
+                weight - ROW_PENALTY * (row_idx - preference.from_train_number),
+                reserve_button_selector(row_idx, seat_type, selector),
+            )
+            for row_idx in range(preference.from_train_number, preference.to_train_number + 1)
+            for seat_type, weight in preference.seat_weights
+        )
+        self.targets = targets
+        by_row: Dict[int, Tuple[Target, ...]] = {}
+        for target in targets:
+            by_row[target.row_idx] = by_row.get(target.row_idx, ()) + (target,)
+        self._by_row = by_row
+        self._by_cell = {(t.row_idx, t.seat_type): t for t in targets}
+        self._train_numbers: FrozenSet[str] = frozenset(preference.train_numbers)
+
+    @property
+    def seat_types(self) -> List[int]:
+        return [seat_type for seat_type, _ in self.preference.seat_weights]
+
+    def pin(self, rows: Iterable[TrainRow]) -> "ScanPlan":
+        """현재 스냅샷에서 감시 범위에 있는 열차번호로 고정한 새 계획을 반환합니다."""
+        pinned = {
+            train_key(row.train_no): row.row_idx
+            for row in rows
+            if row.row_idx in self._by_row and train_key(row.train_no)
+        }
+        return ScanPlan(self.preference, self.selector, pinned)
+
+    def _anchor(self, row_idx: int, train_no: str) -> Optional[int]:
+        """점수 계산에 쓸 행 번호. 고정된 계획이면 열차번호로 찾고, 열차번호를 못 읽은 행은 현재 위치를 씁니다."""
+        if self.pinned is None:
+            return row_idx
+        key = train_key(train_no)
+        return self.pinned.get(key) if key else row_idx
+
+    def _selector(self, target: Target, row_idx: int) -> str:
+        if row_idx == target.row_idx:
+            return target.selector
+        # 행 위치가 밀린 열차만 셀렉터를 새로 만듦
+        return reserve_button_selector(row_idx, target.seat_type, self.selector)
+
+    def accepts(self, row: TrainRow) -> bool:
+        """출발 시각 범위와 최대 소요 시간 조건. 시각을 읽지 못한 행은 통과시킵니다."""
+        pref = self.preference
+        departure = parse_clock(row.departure) if row.departure else None
+        if departure is not None:
+            if pref.depart_after is not None and departure < pref.depart_after:
+                return False
+            if pref.depart_before is not None and departure > pref.depart_before:
+                return False
+            if pref.max_travel_minutes is not None and row.arrival:
+                travel = (parse_clock(row.arrival) - departure) % (24 * 60)
+                if travel > pref.max_travel_minutes:
+                    return False
+        return True
+
+    def bonus(self, train_no: str) -> float:
+        return PREFERRED_TRAIN_BONUS if self._train_numbers and train_key(train_no) in self._train_numbers else 0.0
+
+    def rank(self, rows: Iterable[TrainRow]) -> List[Candidate]:
+        """스냅샷의 예약 가능 좌석을 점수가 높은 순으로 반환합니다."""
+        found: List[Candidate] = []
+        for row in rows:
+            targets = self._by_row.get(self._anchor(row.row_idx, row.train_no))
+            if not targets or not self.accepts(row):
+                continue
+            bonus = self.bonus(row.train_no)
+            for target in targets:
+                if row.seat_state(target.seat_type) == SEAT_AVAILABLE:
+                    found.append(Candidate(
+                        row.row_idx,
+                        target.seat_type,
+                        f"{row.train_no} {row.departure}",
+                        self._selector(target, row.row_idx),
+                        target.weight + bonus,
+                    ))
+        found.sort(key=lambda c: c.score, reverse=True)
+        return found
+
+    def rank_hits(self, hits: Iterable[dict]) -> List[Candidate]:
+        """watch 모드 감지 결과({row, col, trainNo})를 점수 순으로 반환합니다 (시각 조건은 확인할 수 없음).
+
+        같은 셀이 한 사이클에 여러 번 감지되면(닫혔다가 다시 열림) 한 번만 반환합니다.
+        """
+        found: List[Candidate] = []
+        seen = set()
+        for hit in hits:
+            row_idx, train_no = hit.get("row"), hit.get("trainNo", "")
+            target = self._by_cell.get((self._anchor(row_idx, train_no), hit.get("col")))
+            if target is None or (row_idx, target.seat_type) in seen:
+                continue
+            seen.add((row_idx, target.seat_type))
+            found.append(Candidate(
+                row_idx,
+                target.seat_type,
+                train_no,
+                self._selector(target, row_idx),
+                target.weight + self.bonus(train_no),
+            ))
+        found.sort(key=lambda c: c.score, reverse=True)
+        return found
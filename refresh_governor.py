@@ -0,0 +1,108 @@
+"""새로고침 간격 조절기.
+
+고정 랜덤 딜레이 대신 분당 목표 조회 수를 토큰 버킷으로 지키면서,
+접속대기 팝업이나 테이블 로딩 시간 초과가 보이면 간격을 늘리고(백오프)
+응답이 빠르면 다시 줄입니다. 여러 탭이 하나를 공유하면 전체 예산이 됩니다.
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Deque, Dict
+
+DEFAULT_TARGET_PER_MINUTE = float(os.getenv("MACRO_TARGET_SCANS_PER_MIN", "45"))
+DEFAULT_BURST = 2.0
+DEFAULT_JITTER = 0.2
+MAX_BACKOFF = 16.0
+# 이보다 빨리 끝난 사이클은 "빠른 응답"으로 보고 백오프를 빠르게 줄임
+FAST_CYCLE_SECONDS = 0.8
+
+
+class RefreshGovernor:
+    """토큰 버킷 + 백오프 기반 새로고침 간격 조절기."""
+
+    def __init__(
+        self,
+        target_per_minute: float = DEFAULT_TARGET_PER_MINUTE,
+        burst: float = DEFAULT_BURST,
+        jitter: float = DEFAULT_JITTER,
+    ) -> None:
+        self.target_per_minute = max(target_per_minute, 1.0)
+        self.burst = burst
+        self.jitter = jitter
+        self.backoff = 1.0
+        self.last_delay = 0.0
+        self.last_latency = 0.0
+        self.avg_latency = 0.0
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._popups = 0
+        self._timeouts = 0
+        self._cycles: Deque[float] = deque()
+
+    @property
+    def rate(self) -> float:
+        """백오프를 반영한 초당 토큰 보충 속도."""
+        return self.target_per_minute / 60.0 / self.backoff
+
+    def _take(self) -> float:
+        """토큰 하나를 꺼내고 기다려야 할 시간을 반환합니다. 토큰이 모자라면 빚으로 두고 그만큼 대기."""
+        now = time.monotonic()
+        rate = self.rate
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / rate
+
+    async def wait(self) -> float:
+        """다음 새로고침까지 대기합니다. 실제 대기 시간(초)을 반환합니다."""
+        delay = self._take() + random.uniform(0, self.jitter)
+        self.last_delay = delay
+        await asyncio.sleep(delay)
+        return delay
+
+    def note_waiting_popup(self) -> None:
+        self._popups += 1
+
+    def note_timeout(self) -> None:
+        self._timeouts += 1
+
+    def record_cycle(self, latency: float) -> None:
+        """새로고침 한 사이클의 소요 시간과 그동안 기록된 신호로 백오프를 조정합니다."""
+        now = time.monotonic()
+        self._cycles.append(now)
+        while self._cycles and now - self._cycles[0] > 60:
+            self._cycles.popleft()
+
+        self.last_latency = latency
+        self.avg_latency = latency if not self.avg_latency else self.avg_latency * 0.8 + latency * 0.2
+
+        if self._popups or self._timeouts:
+            self.backoff = min(self.backoff * 2, MAX_BACKOFF)
+        elif latency < FAST_CYCLE_SECONDS:
+            self.backoff = max(1.0, self.backoff * 0.5)
+        else:
+            self.backoff = max(1.0, self.backoff * 0.8)
+        self._popups = 0
+        self._timeouts = 0
+
+    def achieved_per_minute(self) -> float:
+        """최근 60초 동안 완료한 사이클 간격으로 계산한 분당 조회 수."""
+        if len(self._cycles) < 2:
+            return 0.0
+        span = self._cycles[-1] - self._cycles[0]
+        return (len(self._cycles) - 1) * 60.0 / span if span > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "target_per_minute": round(self.target_per_minute, 1),
+            "achieved_per_minute": round(self.achieved_per_minute(), 1),
+            "delay": round(self.last_delay, 3),
+            "cycle_latency": round(self.last_latency, 3),
+            "avg_cycle_latency": round(self.avg_latency, 3),
+            "backoff": round(self.backoff, 2),
+        }
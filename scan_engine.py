@@ -0,0 +1,444 @@
+"""결과 테이블 스캔 엔진.
+
+`#result-form table tbody` 전체를 한 번의 `page.evaluate` 호출로 읽어
+(행 번호, 열차번호, 출발시각, 특실/일반실 상태) 매트릭스를 만들고,
+클릭 여부는 Python 쪽에서 이 스냅샷만 보고 결정합니다.
+"""
+
+import json
+import re
+from enum import Enum
+from html.parser import HTMLParser
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml이 없으면 표준 라이브러리 파서 사용
+    lxml_html = None
+
+RESULT_TABLE_SELECTOR = "#result-form table tbody"
+
+# 결과 테이블 컬럼 번호 (td:nth-child 기준)
+TRAIN_NO_COL = 3
+DEPARTURE_COL = 4
+ARRIVAL_COL = 5
+SPECIAL_SEAT_COL = 6
+STANDARD_SEAT_COL = 7
+
+# 좌석 상태
+SEAT_AVAILABLE = "available"
+SEAT_SOLD_OUT = "soldout"
+SEAT_NONE = "none"
+
+RESERVE_TEXT = "예약하기"
+SOLD_OUT_TEXT = "매진"
+
+_TIME_RE = re.compile(r"\d{1,2}:\d{2}")
+_WS_RE = re.compile(r"\s+")
+_NON_DIGIT_RE = re.compile(r"\D")
+
+
+class TrainRow(NamedTuple):
+    """스캔 결과의 한 행."""
+
+    row_idx: int
+    train_no: str
+    departure: str
+    special: str
+    standard: str
+    arrival: str = ""
+
+    def seat_state(self, seat_type: int) -> str:
+        return self.special if seat_type == SPECIAL_SEAT_COL else self.standard
+
+
+def train_key(train_no: str) -> str:
+    """열차번호 셀 텍스트("SRT 301" 등)에서 숫자만 남긴 키. 행 위치가 바뀌어도 같은 열차를 가리킵니다."""
+    return _NON_DIGIT_RE.sub("", train_no or "")
+
+
+# 테이블 전체를 읽어 [rowIdx, trainNo, departure, special, standard, arrival] 배열로 반환
+SCAN_TABLE_JS = """
+([selector, trainNoCol, departureCol, specialCol, standardCol, reserveText, arrivalCol]) => {
+    const tbody = document.querySelector(selector);
+    if (!tbody) return null;
+    const rows = tbody.children;
+    const out = [];
+    for (let i = 0; i < rows.length; i++) {
+        const cells = rows[i].children;
+        const text = (col) => {
+            const td = cells[col - 1];
+            return td ? td.textContent.replace(/\\s+/g, ' ').trim() : '';
+        };
+        const state = (col) => {
+            const td = cells[col - 1];
+            if (!td) return 'none';
+            for (const a of td.querySelectorAll('a')) {
+                if (a.textContent.includes(reserveText)) return 'available';
+            }
+            return td.textContent.includes('매진') ? 'soldout' : 'none';
+        };
+        const dep = text(departureCol).match(/\\d{1,2}:\\d{2}/);
+        const arr = text(arrivalCol).match(/\\d{1,2}:\\d{2}/);
+        out.push([i + 1, text(trainNoCol), dep ? dep[0] : '', state(specialCol), state(standardCol), arr ? arr[0] : '']);
+    }
+    return out;
+}
+"""
+
+# 스냅샷에서 고른 (행, 좌석) 셀의 예약 버튼을 JS로 직접 클릭
+CLICK_RESERVE_JS = """
+([selector, rowIdx, col, reserveText]) => {
+    const tbody = document.querySelector(selector);
+    const tr = tbody ? tbody.children[rowIdx - 1] : null;
+    const td = tr ? tr.children[col - 1] : null;
+    if (!td) return false;
+    for (const a of td.querySelectorAll('a')) {
+        if (a.textContent.includes(reserveText)) {
+            // 클릭한 문서 표시 (결과 판정에서 '아직 이동 전'과 '결과 페이지로 복귀'를 구분)
+            // + 이동 없이 alert로 실패를 알리는 경우 메시지를 남김
+            const state = window.__srtReserve = { alert: null };
+            window.alert = (message) => { state.alert = String(message); };
+            a.click();
+            return true;
+        }
+    }
+    return false;
+}
+"""
+
+
+class ReserveOutcome(str, Enum):
+    """예약 버튼 클릭 후 판정 결과."""
+
+    SUCCESS = "success"  # 결제 페이지 도달
+    SOLD_OUT = "sold_out"  # 잔여석 없음/오류 메시지 페이지
+    RESULTS = "results"  # 예약 없이 결과 테이블에 있음 (복귀했거나 alert만 뜨고 머무름)
+    TIMEOUT = "timeout"  # 아무 표시도 나타나지 않음
+
+
+RESERVE_SUCCESS_SELECTOR = "#isFalseGotoMain, .payment, input[value='결제하기']"
+PAYMENT_TEXT = "결제하기"
+RESERVE_FAILURE_TEXTS = ("잔여석이 없습니다", "잔여석없음", "좌석이 부족", "매진되었습니다", "오류가 발생")
+
+# 성공/실패/결과 테이블 복귀 중 먼저 나타나는 것을 반환 (없으면 false → 계속 대기)
+# 페이지가 이동하면 wait_for_function이 새 문서에서 다시 평가함
+RESERVE_OUTCOME_JS = """
+([resultSelector, successSelector, paymentText, failureTexts]) => {
+    // 클릭한 문서에 머물러 있는 동안은 alert만 확인
+    const state = window.__srtReserve;
+    if (state) return state.alert !== null ? 'results' : false;
+    if (document.querySelector(successSelector)) return 'success';
+    if (document.title.includes('결제')) return 'success';
+    const text = document.body ? document.body.textContent : '';
+    if (text.includes(paymentText)) return 'success';
+    if (document.querySelector(resultSelector)) return 'results';
+    if (failureTexts.some(t => text.includes(t))) return 'sold_out';
+    return false;
+}
+"""
+
+
+async def scan_result_table(page: Page, selector: str = RESULT_TABLE_SELECTOR) -> List[TrainRow]:
+    """결과 테이블을 한 번의 왕복으로 읽어 행 목록을 반환합니다. 테이블이 없으면 빈 목록."""
+    raw = await page.evaluate(
+        SCAN_TABLE_JS,
+        [selector, TRAIN_NO_COL, DEPARTURE_COL, SPECIAL_SEAT_COL, STANDARD_SEAT_COL, RESERVE_TEXT, ARRIVAL_COL],
+    )
+    if not raw:
+        return []
+    return [TrainRow(*item) for item in raw]
+
+
+def reserve_button_selector(row_idx: int, seat_type: int, selector: str = RESULT_TABLE_SELECTOR) -> str:
+    """(행, 좌석) 셀의 예약 버튼 셀렉터."""
+    return f"{selector} > tr:nth-child({row_idx}) > td:nth-child({seat_type}) a:has-text('{RESERVE_TEXT}')"
+
+
+def _cell_state(text: str, anchor_texts: List[str]) -> str:
+    if any(RESERVE_TEXT in t for t in anchor_texts):
+        return SEAT_AVAILABLE
+    return SEAT_SOLD_OUT if SOLD_OUT_TEXT in text else SEAT_NONE
+
+
+def _row_from_cells(row_idx: int, cells: List[Tuple[str, List[str]]]) -> TrainRow:
+    """(셀 텍스트, 셀 안 앵커 텍스트 목록) 리스트를 TrainRow로 변환합니다. SCAN_TABLE_JS와 같은 규칙."""
+
+    def text(col: int) -> str:
+        return _WS_RE.sub(" ", cells[col - 1][0]).strip() if col <= len(cells) else ""
+
+    def state(col: int) -> str:
+        return _cell_state(*cells[col - 1]) if col <= len(cells) else SEAT_NONE
+
+    dep = _TIME_RE.search(text(DEPARTURE_COL))
+    arr = _TIME_RE.search(text(ARRIVAL_COL))
+    return TrainRow(
+        row_idx,
+        text(TRAIN_NO_COL),
+        dep.group(0) if dep else "",
+        state(SPECIAL_SEAT_COL),
+        state(STANDARD_SEAT_COL),
+        arr.group(0) if arr else "",
+    )
+
+
+class _ResultTableParser(HTMLParser):
+    """`#result-form` 안 첫 번째 테이블의 행을 모으는 표준 라이브러리 파서.
+
+    tbody가 있으면 첫 tbody의 행만, 없으면 테이블 바로 아래 행을 모읍니다 (thead/tfoot 제외, lxml 경로와 같은 규칙).
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.rows: List[List[Tuple[str, List[str]]]] = []
+        self._in_form = False
+        # 결과 테이블 안의 table 중첩 깊이 (1이면 결과 테이블 바로 아래)
+        self._table_depth = 0
+        self._in_head = False
+        self._done = False
+        self._row: Optional[List[Tuple[str, List[str]]]] = None
+        self._cell: Optional[List[str]] = None
+        self._anchors: List[str] = []
+        self._anchor: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self._done:
+            return
+        if tag == "form" and dict(attrs).get("id") == "result-form":
+            self._in_form = True
+        elif self._in_form and tag == "table":
+            self._table_depth += 1
+        elif self._table_depth == 1 and tag in ("thead", "tfoot"):
+            self._in_head = True
+        elif self._table_depth == 1 and tag == "tr" and not self._in_head:
+            self._close_row()
+            self._row = []
+        elif self._row is not None and self._table_depth == 1 and tag in ("td", "th"):
+            self._close_cell()
+            self._cell = []
+            self._anchors = []
+        elif self._cell is not None and tag == "a":
+            self._anchor = []
+
+    def handle_endtag(self, tag):
+        if self._done:
+            return
+        if tag == "a" and self._anchor is not None:
+            self._anchors.append("".join(self._anchor))
+            self._anchor = None
+        elif tag in ("td", "th") and self._table_depth == 1:
+            self._close_cell()
+        elif tag == "tr" and self._table_depth == 1:
+            self._close_row()
+        elif tag in ("thead", "tfoot") and self._table_depth == 1:
+            self._in_head = False
+        elif (tag == "tbody" and self._table_depth == 1) or (tag == "table" and self._table_depth == 1):
+            self._close_row()
+            self._done = True
+        elif tag == "table" and self._table_depth > 1:
+            self._table_depth -= 1
+        elif tag == "form":
+            self._in_form = False
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+            if self._anchor is not None:
+                self._anchor.append(data)
+
+    def _close_cell(self) -> None:
+        if self._row is not None and self._cell is not None:
+            if self._anchor is not None:
+                self._anchors.append("".join(self._anchor))
+                self._anchor = None
+            self._row.append(("".join(self._cell), self._anchors))
+        self._cell = None
+
+    def _close_row(self) -> None:
+        self._close_cell()
+        if self._row is not None:
+            self.rows.append(self._row)
+        self._row = None
+
+
+def _cells_with_lxml(html: str) -> List[List[Tuple[str, List[str]]]]:
+    doc = lxml_html.fromstring(html)
+    tables = doc.xpath("//*[@id='result-form']//table")
+    if not tables:
+        return []
+    tbody = tables[0].find("tbody")
+    container = tbody if tbody is not None else tables[0]
+    rows = []
+    for tr in container:
+        if tr.tag != "tr":
+            continue
+        cells = []
+        for td in tr:
+            if not isinstance(td.tag, str):
+                continue
+            cells.append((td.text_content(), [a.text_content() for a in td.iter("a")]))
+        rows.append(cells)
+    return rows
+
+
+def parse_result_html(html: str) -> List[TrainRow]:
+    """selectScheduleList.do 응답 HTML에서 결과 테이블을 파싱합니다 (브라우저 렌더링 없이)."""
+    if lxml_html is not None:
+        raw_rows = _cells_with_lxml(html)
+    else:
+        parser = _ResultTableParser()
+        parser.feed(html)
+        parser.close()
+        raw_rows = parser.rows
+    return [_row_from_cells(idx, cells) for idx, cells in enumerate(raw_rows, start=1)]
+
+
+async def click_reserve_button(page: Page, row_idx: int, seat_type: int, selector: str = RESULT_TABLE_SELECTOR) -> bool:
+    """예약 버튼을 JS로 클릭합니다. 스냅샷 이후 버튼이 사라졌으면 False."""
+    return bool(await page.evaluate(CLICK_RESERVE_JS, [selector, row_idx, seat_type, RESERVE_TEXT]))
+
+
+async def wait_for_reserve_outcome(
+    page: Page,
+    selector: str = RESULT_TABLE_SELECTOR,
+    timeout: float = 5000,
+) -> ReserveOutcome:
+    """click_reserve_button 직후 호출. 성공 표시/실패 메시지/결과 테이블 복귀 중 먼저 나타나는 것을 한 번의 대기로 판정합니다."""
+    try:
+        handle = await page.wait_for_function(
+            RESERVE_OUTCOME_JS,
+            arg=[selector, RESERVE_SUCCESS_SELECTOR, PAYMENT_TEXT, list(RESERVE_FAILURE_TEXTS)],
+            timeout=timeout,
+        )
+    except PlaywrightTimeoutError:
+        return ReserveOutcome.TIMEOUT
+    return ReserveOutcome(await handle.json_value())
+
+
+# watch 모드: 결과 테이블에 MutationObserver를 걸어 예약 버튼이 나타나는 즉시 binding으로 알림
+SEAT_FOUND_BINDING = "__srtSeatFound"
+SEAT_SNAPSHOT_BINDING = "__srtSeatSnapshot"
+
+WATCH_INIT_JS = """
+(() => {
+    const cfg = %s;
+    const scanTable = %s;
+    // seen: 지금 예약 가능한 감시 셀. 닫혔다가 다시 열리면 다시 알림
+    const state = window.__srtWatch = { settled: false, seen: new Set() };
+    const watched = (r, key) => {
+        // 열차번호로 고정되어 있으면 위치와 무관하게 같은 열차만 (번호를 못 읽은 행은 위치로)
+        const keys = window.__srtWatchKeys || cfg.keys;
+        if (keys && key) return keys.includes(key);
+        return r >= cfg.fromRow && r <= cfg.toRow;
+    };
+    const check = () => {
+        const tbody = document.querySelector(cfg.selector);
+        if (!tbody) return;
+        const open = new Set();
+        const fresh = [];
+        for (let r = 1; r <= tbody.children.length; r++) {
+            const tr = tbody.children[r - 1];
+            const trainTd = tr.children[cfg.trainNoCol - 1];
+            const trainNo = trainTd ? trainTd.textContent.trim() : '';
+            const key = trainNo.replace(/\\D/g, '');
+            if (!watched(r, key)) continue;
+            for (const col of cfg.cols) {
+                const td = tr.children[col - 1];
+                if (!td) continue;
+                if (![...td.querySelectorAll('a')].some(a => a.textContent.includes(cfg.reserveText))) continue;
+                const cell = (key || 'row' + r) + ':' + col;
+                open.add(cell);
+                if (!state.seen.has(cell)) fresh.push({ row: r, col: col, trainNo: trainNo });
+            }
+        }
+        state.seen = open;
+        if (!fresh.length) return;
+        state.settled = true;
+        if (window[cfg.binding]) for (const hit of fresh) window[cfg.binding](hit);
+    };
+    // 감지 후에도 연결해 두어 같은 문서에서 나중에 열리는 좌석도 알림
+    new MutationObserver(check).observe(document, { childList: true, subtree: true, characterData: true });
+    document.addEventListener('DOMContentLoaded', () => {
+        check();
+        state.settled = true;
+        // 변동 감지용 전체 스냅샷 (SCAN_TABLE_JS와 같은 형식)을 binding으로 push
+        if (cfg.snapshotBinding && window[cfg.snapshotBinding]) {
+            const rows = scanTable([
+                cfg.selector, cfg.trainNoCol, cfg.departureCol, cfg.specialCol,
+                cfg.standardCol, cfg.reserveText, cfg.arrivalCol,
+            ]);
+            if (rows) window[cfg.snapshotBinding]({ at: Date.now() / 1000, rows: rows });
+        }
+    });
+})();
+"""
+
+# 감시 범위를 열차번호 키로 고정 (현재 문서용. 이후 문서는 같은 값을 init script로 설정)
+WATCH_PIN_JS = "keys => { window.__srtWatchKeys = keys; }"
+
+# 조회 버튼 클릭 (watch 모드면 현재 페이지의 감시 상태를 먼저 초기화)
+SUBMIT_SEARCH_JS = """
+el => {
+    if (window.__srtWatch) window.__srtWatch.settled = false;
+    el.click();
+}
+"""
+
+WATCH_SETTLED_JS = "() => !!(window.__srtWatch && window.__srtWatch.settled)"
+
+
+async def install_seat_watcher(
+    page: Page,
+    from_train_number: int,
+    to_train_number: int,
+    seat_type_list: List[int],
+    selector: str = RESULT_TABLE_SELECTOR,
+    snapshots: Optional[List[Tuple[float, List[TrainRow]]]] = None,
+    train_keys: Optional[Iterable[str]] = None,
+) -> List[dict]:
+    """감시 대상 셀에 MutationObserver를 설치합니다. 반환된 리스트에 감지 결과가 push됩니다.
+
+    셀마다 예약 가능해질 때 한 번씩 push하고, 닫혔다가 다시 열리면 다시 push합니다.
+    train_keys가 있으면 행 위치 대신 그 열차번호의 행을 감시합니다 (나중에 정해지면 pin_seat_watcher).
+    snapshots를 넘기면 결과 페이지마다 파싱이 끝난 시점의 (시각, 전체 행)도 push됩니다.
+    페이지 이동 전에 호출해야 이후 모든 결과 페이지에 적용됩니다.
+    """
+    hits: List[dict] = []
+    await page.expose_binding(SEAT_FOUND_BINDING, lambda source, hit: hits.append(hit))
+    if snapshots is not None:
+        await page.expose_binding(
+            SEAT_SNAPSHOT_BINDING,
+            lambda source, snap: snapshots.append((snap["at"], [TrainRow(*item) for item in snap["rows"]])),
+        )
+    config = {
+        "selector": selector,
+        "fromRow": from_train_number,
+        "toRow": to_train_number,
+        "cols": list(seat_type_list),
+        "keys": sorted(set(train_keys)) if train_keys is not None else None,
+        "trainNoCol": TRAIN_NO_COL,
+        "reserveText": RESERVE_TEXT,
+        "binding": SEAT_FOUND_BINDING,
+        "snapshotBinding": SEAT_SNAPSHOT_BINDING if snapshots is not None else None,
+        "departureCol": DEPARTURE_COL,
+        "arrivalCol": ARRIVAL_COL,
+        "specialCol": SPECIAL_SEAT_COL,
+        "standardCol": STANDARD_SEAT_COL,
+    }
+    await page.add_init_script(WATCH_INIT_JS % (json.dumps(config, ensure_ascii=False), SCAN_TABLE_JS.strip()))
+    return hits
+
+
+async def pin_seat_watcher(page: Page, train_keys: Iterable[str]) -> None:
+    """설치된 감시를 열차번호 키(train_key)로 고정합니다. 현재 페이지와 이후 모든 결과 페이지에 적용됩니다."""
+    keys = sorted(set(train_keys))
+    await page.add_init_script(f"window.__srtWatchKeys = {json.dumps(keys)};")
+    await page.evaluate(WATCH_PIN_JS, keys)
+
+
+async def wait_for_watch_settled(page: Page, timeout: int) -> None:
+    """결과 페이지 파싱이 끝나거나 예약 버튼이 감지될 때까지 브라우저 안에서 대기합니다."""
+    await page.wait_for_function(WATCH_SETTLED_JS, timeout=timeout)
@@ -0,0 +1,303 @@
+"""좌석 상태 변동 이력 저장소 (SQLite).
+
+스캔마다 나온 좌석 상태 변동(seat_snapshot.SeatChange)을
+(관측 세션, 노선, 날짜, 열차번호, 좌석 등급, 상태, 시각) 행으로 append-only 테이블에 쌓습니다.
+기록은 큐에 넣기만 하고, 워커 스레드가 모아서 한 트랜잭션으로 씁니다.
+/history API는 이 테이블에서 열차별로 잔여석이 열려 있던 구간을 계산합니다.
+
+관측 세션은 조회 루프(run_search) 하나입니다. 세션 시작 시 전체 상태를, 끝날 때
+마지막 관측 시각의 unobserved를 기록하고, 구간은 같은 세션 안에서만 짝지으므로
+작업이 멈춰 있던 동안이 열림 시간에 포함되지 않습니다.
+
+환경변수:
+- MACRO_HISTORY_PATH: DB 파일 경로 (기본 seat_history.db, "off"면 기록 안 함)
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from preference import SEAT_CLASS_COLS
+from scan_engine import SEAT_AVAILABLE, SEAT_NONE
+from seat_snapshot import SEAT_COLS, SeatChange, Snapshot
+
+DEFAULT_HISTORY_PATH = "seat_history.db"
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_BATCH = 500
+DEFAULT_QUERY_LIMIT = 500
+SQLITE_BUSY_TIMEOUT = 5.0
+
+SEAT_CLASS_NAMES = {col: name for name, col in SEAT_CLASS_COLS.items()}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seat_events (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL DEFAULT '',
+    route TEXT NOT NULL,
+    travel_date TEXT NOT NULL,
+    train_no TEXT NOT NULL,
+    seat_class TEXT NOT NULL,
+    state TEXT NOT NULL,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS seat_events_train ON seat_events (train_no, travel_date, seat_class, at);
+CREATE INDEX IF NOT EXISTS seat_events_at ON seat_events (at);
+"""
+
+# 세션이 끝나 더 이상 관측하지 않는 상태 (열린 구간을 마지막 관측 시각에 닫음)
+SEAT_UNOBSERVED = "unobserved"
+
+# (session, route, travel_date, train_no, seat_class, state, at)
+EventRow = Tuple[str, str, str, str, str, str, float]
+# 워커 종료 신호
+_STOP = object()
+
+
+def history_path() -> Optional[str]:
+    path = (os.getenv("MACRO_HISTORY_PATH") or DEFAULT_HISTORY_PATH).strip()
+    return None if path.lower() == "off" else path
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """WAL 모드 연결. 여러 작업 프로세스가 쓰는 동안 API 서버가 읽을 수 있습니다."""
+    conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(seat_events)")}
+    if columns and "session" not in columns:
+        # 세션 컬럼이 없던 DB는 기존 행을 세션 ''로 취급
+        conn.execute("ALTER TABLE seat_events ADD COLUMN session TEXT NOT NULL DEFAULT ''")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class SeatHistory:
+    """변동 이력 쓰기 큐와 배치 기록 워커. 세션의 기록 호출은 큐에 넣기만 하므로 조회 루프를 막지 않습니다."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        # None이면 워커 시작 시 MACRO_HISTORY_PATH를 읽음
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.written = 0
+        self.failed = 0
+        self._q: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path or history_path())
+
+    def session(self, route: str, travel_date: str) -> "HistorySession":
+        """조회 루프 하나의 관측 세션을 만듭니다."""
+        return HistorySession(self, route, travel_date)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """큐에 남은 행을 모두 쓸 때까지 최대 timeout초 기다립니다."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._pending > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        self.flush(timeout)
+        if self._thread is not None and self._thread.is_alive():
+            self._q.put(_STOP)
+            self._thread.join(timeout=1)
+
+    def _put(self, rows: List[EventRow]) -> int:
+        if not rows or not self.enabled:
+            return 0
+        self._ensure_worker()
+        with self._idle:
+            self._pending += len(rows)
+        self._q.put(rows)
+        return len(rows)
+
+    def _ensure_worker(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="seat-history", daemon=True)
+                self._thread.start()
+
+    def _done(self, count: int) -> None:
+        with self._idle:
+            self._pending -= count
+            if self._pending <= 0:
+                self._idle.notify_all()
+
+    def _run(self) -> None:
+        conn = connect(self.path or history_path())
+        try:
+            stop = False
+            while not stop:
+                item = self._q.get()
+                if item is _STOP:
+                    return
+                batch: List[EventRow] = list(item)
+                # flush_interval 동안 들어온 행을 모아 한 트랜잭션으로
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._q.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.extend(item)
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT INTO seat_events (session, route, travel_date, train_no, seat_class, state, at)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            batch,
+                        )
+                    self.written += len(batch)
+                except sqlite3.Error:
+                    self.failed += len(batch)
+                finally:
+                    self._done(len(batch))
+        finally:
+            conn.close()
+
+
+class HistorySession:
+    """관측 세션 하나 (조회 루프 하나). 시작 상태 → 변동 → 종료 표시 순서로 기록합니다."""
+
+    __slots__ = ("history", "route", "travel_date", "session_id", "started")
+
+    def __init__(self, history: SeatHistory, route: str, travel_date: str) -> None:
+        self.history = history
+        self.route = route
+        self.travel_date = travel_date
+        self.session_id = uuid.uuid4().hex[:12]
+        self.started = False
+
+    def start(self, snapshot: Snapshot) -> int:
+        """관측 시작 시점의 상태를 기록합니다. 처음부터 열려 있던 좌석도 구간의 시작을 알 수 있게 됩니다."""
+        self.started = True
+        return self._put_states(snapshot, None)
+
+    def record(self, changes: Iterable[SeatChange]) -> int:
+        """변동을 기록 큐에 넣고 넣은 개수를 반환합니다."""
+        return self.history._put([
+            (self.session_id, self.route, self.travel_date, c.train_key,
+             SEAT_CLASS_NAMES.get(c.seat_type, str(c.seat_type)), c.after, c.at)
+            for c in changes
+        ])
+
+    def end(self, snapshot: Optional[Snapshot]) -> int:
+        """마지막 스냅샷의 셀마다 그 관측 시각으로 unobserved를 기록해 열린 구간을 닫습니다."""
+        if snapshot is None or not self.started:
+            return 0
+        return self._put_states(snapshot, SEAT_UNOBSERVED)
+
+    def _put_states(self, snapshot: Snapshot, state: Optional[str]) -> int:
+        return self.history._put([
+            (self.session_id, self.route, self.travel_date, key, SEAT_CLASS_NAMES[col],
+             state or row.seat_state(col), snapshot.taken_at)
+            for key, row in snapshot.trains.items()
+            for col in SEAT_COLS
+            if row.seat_state(col) != SEAT_NONE
+        ])
+
+
+def seat_openings(
+    path: str,
+    train_no: str,
+    travel_date: Optional[str] = None,
+    route: Optional[str] = None,
+    seat_class: Optional[str] = None,
+    since: Optional[float] = None,
+    limit: int = DEFAULT_QUERY_LIMIT,
+) -> Dict[str, Any]:
+    """열차 하나의 잔여석이 열려 있던 구간 목록 (최근 limit개)과 시간대별 열림 횟수.
+
+    구간은 같은 관측 세션 안에서만 짝짓습니다. 세션 종료로 닫힌 구간은 ended_by가 "session_end"이고
+    duration은 하한값이며, closed_at이 None이면 종료 표시 없이 끊긴 세션의 구간입니다.
+    avg_duration은 실제 매진/소멸로 닫힌 구간만으로 계산합니다.
+    """
+    conditions = ["train_no = ?"]
+    params: List[Any] = [train_no]
+    for column, value in (("travel_date", travel_date), ("route", route), ("seat_class", seat_class)):
+        if value:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    if since is not None:
+        conditions.append("at >= ?")
+        params.append(since)
+    sql = (
+        "SELECT session, route, travel_date, seat_class, state, at FROM seat_events WHERE "
+        + " AND ".join(conditions)
+        + " ORDER BY travel_date, seat_class, at"
+    )
+
+    openings: List[Dict[str, Any]] = []
+    opened: Dict[Tuple[str, str, str, str], float] = {}
+    conn = connect(path)
+    try:
+        for session, row_route, row_date, row_class, state, at in conn.execute(sql, params):
+            key = (session, row_route, row_date, row_class)
+            if state == SEAT_AVAILABLE:
+                opened.setdefault(key, at)
+            elif key in opened:
+                started = opened.pop(key)
+                openings.append(_opening(key, started, at, "session_end" if state == SEAT_UNOBSERVED else state))
+    finally:
+        conn.close()
+    openings.extend(_opening(key, started, None, None) for key, started in opened.items())
+    openings.sort(key=lambda o: o["opened_at"])
+
+    by_hour = Counter(time.localtime(o["opened_at"]).tm_hour for o in openings)
+    closed = [o["duration"] for o in openings if o["duration"] is not None and o["ended_by"] != "session_end"]
+    return {
+        "train_no": train_no,
+        "count": len(openings),
+        "avg_duration": sum(closed) / len(closed) if closed else None,
+        "by_hour": {f"{hour:02d}": by_hour[hour] for hour in sorted(by_hour)},
+        "openings": openings[-limit:] if limit > 0 else openings,
+    }
+
+
+def _opening(
+    key: Tuple[str, str, str, str],
+    opened_at: float,
+    closed_at: Optional[float],
+    ended_by: Optional[str],
+) -> Dict[str, Any]:
+    session, route, travel_date, seat_class = key
+    return {
+        "session": session,
+        "route": route,
+        "travel_date": travel_date,
+        "seat_class": seat_class,
+        "opened_at": opened_at,
+        "closed_at": closed_at,
+        "duration": closed_at - opened_at if closed_at is not None else None,
+        # 닫힌 이유: soldout/none (실제 변동), session_end (관측 종료), None (끊긴 세션)
+        "ended_by": ended_by,
+    }
+
+
+HISTORY = SeatHistory()
@@ -0,0 +1,100 @@
+"""열차번호 기준 좌석 스냅샷과 변동 감지.
+
+스캔 결과를 열차번호 키로 묶어 두고 직전 스냅샷과 비교해
+좌석 상태가 바뀐 셀(매진 → 예약가능, 예약가능 → 매진 등)만 이벤트로 만듭니다.
+로그와 알림은 새로고침마다가 아니라 이 변동이 있을 때만 남깁니다.
+"""
+
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from scan_engine import (
+    SEAT_AVAILABLE,
+    SEAT_NONE,
+    SEAT_SOLD_OUT,
+    SPECIAL_SEAT_COL,
+    STANDARD_SEAT_COL,
+    TrainRow,
+    train_key,
+)
+
+SEAT_COLS = (SPECIAL_SEAT_COL, STANDARD_SEAT_COL)
+SEAT_CLASS_LABELS = {SPECIAL_SEAT_COL: "특실", STANDARD_SEAT_COL: "일반실"}
+SEAT_STATE_LABELS = {SEAT_AVAILABLE: "예약가능", SEAT_SOLD_OUT: "매진", SEAT_NONE: "없음"}
+
+
+class SeatChange(NamedTuple):
+    """열차 하나의 좌석 등급 하나에서 일어난 상태 변화."""
+
+    train_key: str
+    train_label: str
+    seat_type: int
+    before: str
+    after: str
+    at: float
+
+    @property
+    def opened(self) -> bool:
+        return self.after == SEAT_AVAILABLE
+
+    def describe(self) -> str:
+        before = SEAT_STATE_LABELS.get(self.before, self.before)
+        after = SEAT_STATE_LABELS.get(self.after, self.after)
+        return f"{self.train_label} {SEAT_CLASS_LABELS.get(self.seat_type, self.seat_type)} {before} → {after}"
+
+
+class Snapshot:
+    """한 번의 스캔 결과. 열차번호 키 -> TrainRow (열차번호를 읽지 못한 행은 제외)."""
+
+    __slots__ = ("trains", "taken_at")
+
+    def __init__(self, rows: Iterable[TrainRow], taken_at: Optional[float] = None) -> None:
+        self.trains: Dict[str, TrainRow] = {}
+        for row in rows:
+            key = train_key(row.train_no)
+            if key:
+                self.trains[key] = row
+        self.taken_at = taken_at if taken_at is not None else time.time()
+
+    def __len__(self) -> int:
+        return len(self.trains)
+
+    def available(self) -> List[str]:
+        """예약 가능한 좌석이 있는 열차 키."""
+        return [key for key, row in self.trains.items() if any(row.seat_state(col) == SEAT_AVAILABLE for col in SEAT_COLS)]
+
+
+def diff_snapshots(previous: Snapshot, current: Snapshot) -> List[SeatChange]:
+    """두 스냅샷에 모두 있는 열차의 좌석 상태 변화. 새로 나타나거나 사라진 열차는 무시합니다."""
+    changes: List[SeatChange] = []
+    for key, row in current.trains.items():
+        old = previous.trains.get(key)
+        if old is None or old == row:
+            continue
+        for col in SEAT_COLS:
+            before, after = old.seat_state(col), row.seat_state(col)
+            if before != after:
+                changes.append(SeatChange(key, f"{row.train_no} {row.departure}", col, before, after, current.taken_at))
+    return changes
+
+
+class SnapshotTracker:
+    """직전 스냅샷을 들고 있다가 새 스캔 결과와의 변동만 돌려줍니다."""
+
+    __slots__ = ("last", "snapshots", "changes")
+
+    def __init__(self) -> None:
+        self.last: Optional[Snapshot] = None
+        self.snapshots = 0
+        self.changes = 0
+
+    def update(self, rows: Iterable[TrainRow], taken_at: Optional[float] = None) -> List[SeatChange]:
+        """첫 스냅샷은 기준으로만 저장하고 빈 목록을 반환합니다. 빈 스캔(테이블 로딩 실패)은 건너뜁니다."""
+        snapshot = Snapshot(rows, taken_at)
+        if not snapshot:
+            return []
+        changes = diff_snapshots(self.last, snapshot) if self.last is not None else []
+        self.last = snapshot
+        self.snapshots += 1
+        self.changes += len(changes)
+        return changes
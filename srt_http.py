@@ -0,0 +1,117 @@
+"""브라우저 없이 조회 폼을 직접 POST하는 HTTP 폴링 백엔드.
+
+로그인은 Playwright로 하고, 컨텍스트 쿠키를 keep-alive 세션으로 옮겨
+새로고침마다 selectScheduleList.do에 폼만 POST합니다.
+잔여석이 보이면 실제 예약 클릭은 브라우저 페이지가 수행합니다.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+import requests
+from playwright.async_api import Page
+from requests.adapters import HTTPAdapter
+
+from scan_engine import TrainRow, parse_result_html
+
+DEFAULT_HTTP_TIMEOUT = 8.0
+
+# 페이지에서 채우는 조회 조건 필드
+SEARCH_FIELD_NAMES = ("dptRsStnCdNm", "arvRsStnCdNm", "dptDt", "dptTm")
+
+# 조회 폼의 전체 필드(hidden 포함)와 action, User-Agent를 한 번에 추출
+EXPORT_FORM_JS = """
+(fieldSelector) => {
+    const field = document.querySelector(fieldSelector);
+    const form = field ? field.form : null;
+    if (!form) return null;
+    const fields = [];
+    for (const [name, value] of new FormData(form).entries()) {
+        fields.push([name, typeof value === 'string' ? value : '']);
+    }
+    return { action: form.action, fields: fields, userAgent: navigator.userAgent };
+}
+"""
+
+
+class SessionExpiredError(Exception):
+    """응답에 결과 폼이 없음 (로그인 만료 또는 대기 페이지)."""
+
+
+def build_search_fields(arrival: str, departure: str, standard_date: str, standard_time: str) -> List[Tuple[str, str]]:
+    """페이지 없이 조회 조건 필드만으로 폼 데이터를 만듭니다."""
+    return list(zip(SEARCH_FIELD_NAMES, (arrival, departure, standard_date, standard_time)))
+
+
+async def export_search_form(page: Page) -> Optional[dict]:
+    """현재 페이지의 조회 폼을 {action, fields, userAgent}로 추출합니다."""
+    return await page.evaluate(EXPORT_FORM_JS, "#dptRsStnCdNm")
+
+
+class HttpScheduleClient:
+    """쿠키를 공유하는 keep-alive 세션으로 조회 폼을 POST합니다."""
+
+    def __init__(
+        self,
+        url: str,
+        fields: Iterable[Tuple[str, str]],
+        cookies: Iterable[dict] = (),
+        user_agent: Optional[str] = None,
+        timeout: float = DEFAULT_HTTP_TIMEOUT,
+    ) -> None:
+        self.url = url
+        self.fields = list(fields)
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Referer": url})
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+        self.update_cookies(cookies)
+
+    @classmethod
+    async def from_page(cls, page: Page, fallback_url: str, fallback_fields: List[Tuple[str, str]]) -> "HttpScheduleClient":
+        """로그인된 페이지의 쿠키와 조회 폼으로 클라이언트를 만듭니다."""
+        form = await export_search_form(page)
+        if form:
+            url = form.get("action") or fallback_url
+            fields = [tuple(pair) for pair in form.get("fields") or []] or fallback_fields
+            user_agent = form.get("userAgent")
+        else:
+            url, fields, user_agent = fallback_url, fallback_fields, None
+        return cls(url, fields, cookies=await page.context.cookies(), user_agent=user_agent)
+
+    def update_cookies(self, cookies: Iterable[dict]) -> None:
+        """Playwright 쿠키 목록을 세션 쿠키 저장소로 복사합니다."""
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path") or "/",
+            )
+
+    def fetch_schedule(self) -> str:
+        response = self.session.post(self.url, data=self.fields, timeout=self.timeout)
+        response.raise_for_status()
+        if not response.encoding or response.encoding.lower() == "iso-8859-1":
+            response.encoding = response.apparent_encoding or "utf-8"
+        return response.text
+
+    def search(self) -> List[TrainRow]:
+        """조회 폼을 POST하고 결과 테이블을 파싱합니다."""
+        html = self.fetch_schedule()
+        if "result-form" not in html:
+            raise SessionExpiredError("조회 응답에 결과 테이블이 없습니다.")
+        return parse_result_html(html)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "HttpScheduleClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
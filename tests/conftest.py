@@ -0,0 +1,40 @@
+"""테스트 공용 fixture: 로컬 목 SRT 서버, Playwright 브라우저 확인."""
+
+import socket
+from pathlib import Path
+
+import pytest
+
+from bench_e2e import MockServerThread
+from mock_srt_server import MockConfig, MockSrt
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def mock_srt():
+    """uvicorn으로 띄운 목 서버 (base_url, MockSrt). 설정은 mock.reset()이나 /__mock/reset으로 바꿉니다."""
+    mock = MockSrt(MockConfig(latency=0.02, jitter=0.01))
+    with MockServerThread(mock, _free_port()) as server:
+        yield f"http://127.0.0.1:{server.server.config.port}", mock
+
+
+def _browser_installed() -> bool:
+    try:
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as playwright:
+            return Path(playwright.chromium.executable_path).exists()
+    except Exception:
+        return False
+
+
+@pytest.fixture(scope="session")
+def require_browser():
+    """Playwright Chromium이 설치되어 있지 않으면 테스트를 건너뜁니다."""
+    if not _browser_installed():
+        pytest.skip("Playwright 브라우저가 설치되어 있지 않습니다 (playwright install chromium)")
@@ -0,0 +1,29 @@
+"""선호 조건 환경변수가 틀리면 브라우저를 띄우기 전에 설정 오류로 끝나는지 테스트."""
+
+import asyncio
+import queue
+
+import pytest
+
+import macro_core
+
+
+def test_malformed_preference_fails_before_browser_launch(monkeypatch):
+    monkeypatch.setenv("MEMBER_NUMBER", "1234567890")
+    monkeypatch.setenv("PASSWORD", "secret")
+    monkeypatch.setenv("MACRO_SEAT_WEIGHTS", "special=two")
+    monkeypatch.delenv("DISCORD_WEB_HOOK", raising=False)
+
+    def no_browser():
+        pytest.fail("설정 오류인데 브라우저를 띄움")
+
+    monkeypatch.setattr(macro_core, "async_playwright", no_browser)
+    status_q = queue.Queue()
+
+    with pytest.raises(RuntimeError, match="선호 조건 설정 오류"):
+        asyncio.run(macro_core.main_async(status_q=status_q))
+
+    messages = [status_q.get_nowait() for _ in range(status_q.qsize())]
+    (error,) = [m for m in messages if m["status"] == "error"]
+    assert "MACRO_SEAT_WEIGHTS" in error["message"]
+    assert messages[-1] == {"status": "finished"}
@@ -0,0 +1,69 @@
+"""구간별 소요 시간 히스토그램과 /metrics Prometheus 출력 테스트."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api_server
+from cycle_metrics import BUCKETS, METRIC_NAME, PHASE_CYCLE, PHASE_SCAN, Histogram, MetricsRegistry, PhaseTimer
+
+
+def test_phase_timer_collects_and_drains():
+    timer = PhaseTimer()
+    with timer.phase(PHASE_SCAN):
+        pass
+    timer.observe(PHASE_CYCLE, 0.3)
+    samples = timer.drain()
+    assert set(samples) == {PHASE_SCAN, PHASE_CYCLE}
+    assert samples[PHASE_CYCLE] == [0.3]
+    assert timer.drain() == {}
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for value in (0.01, 0.02, 0.03, 0.04, 1.0):
+        histogram.observe(value)
+    assert histogram.percentile(50) == 0.03
+    assert histogram.percentile(99) == 1.0
+    assert Histogram().percentile(50) is None
+
+
+def test_prometheus_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    registry.observe_many({PHASE_SCAN: [0.004, 0.02, 0.02, 40.0]})
+    lines = registry.render_prometheus({"srt_macro_jobs_running": 1}).splitlines()
+
+    assert f"# TYPE {METRIC_NAME} histogram" in lines
+    buckets = [line for line in lines if line.startswith(f'{METRIC_NAME}_bucket{{phase="{PHASE_SCAN}"')]
+    assert len(buckets) == len(BUCKETS) + 1
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert f'{METRIC_NAME}_bucket{{phase="scan",le="0.005"}} 1' in lines
+    assert f'{METRIC_NAME}_bucket{{phase="scan",le="0.025"}} 3' in lines
+    assert f'{METRIC_NAME}_bucket{{phase="scan",le="30.0"}} 3' in lines
+    assert f'{METRIC_NAME}_bucket{{phase="scan",le="+Inf"}} 4' in lines
+    assert f'{METRIC_NAME}_count{{phase="scan"}} 4' in lines
+    assert "srt_macro_jobs_running 1.0" in lines
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(api_server, "METRICS", registry)
+    return registry
+
+
+def test_metrics_endpoint_reports_worker_samples(registry):
+    # 워커가 status_q로 보내는 metrics 메시지를 StatusMonitor와 같은 경로로 반영
+    state = api_server.MacroState("job1")
+    state._handle_status({"status": "metrics", "samples": {PHASE_CYCLE: [0.2, 0.6]}, "counters": {}})
+
+    response = TestClient(api_server.app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert f'{METRIC_NAME}_count{{phase="cycle"}} 2' in body
+    assert f'{METRIC_NAME}_sum{{phase="cycle"}} 0.8' in body
+    assert "srt_macro_jobs_max" in body
+
+    summary = registry.summary()[PHASE_CYCLE]
+    assert summary == {"count": 2, "p50_ms": 200.0, "p95_ms": 600.0, "p99_ms": 600.0}
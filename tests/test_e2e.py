@@ -0,0 +1,55 @@
+"""목 SRT 서버를 대상으로 macro_core.main을 실제 브라우저로 돌리는 end-to-end 벤치마크.
+
+bench_e2e.py와 같은 측정(초당 조회 사이클, time-to-first-scan, 잔여석 오픈 → 예약 클릭 지연)을
+스캔 모드별로 한 번씩 실행합니다. Playwright 브라우저가 설치되어 있지 않으면 건너뜁니다.
+"""
+
+import pytest
+
+from bench_e2e import bench_env, run_mode
+from mock_srt_server import MockConfig
+
+# 잔여석이 풀리기 전에 몇 사이클을 돌도록 2초 뒤에 열고, 예약까지 최대 60초
+RELEASE = "after:2"
+TIMEOUT = 60.0
+
+
+pytestmark = pytest.mark.usefixtures("require_browser")
+
+
+@pytest.fixture(scope="module")
+def mock_server(mock_srt):
+    return mock_srt[0]
+
+
+@pytest.fixture
+def macro_core(mock_server, monkeypatch, tmp_path):
+    for key, value in bench_env(mock_server).items():
+        if value is None:
+            monkeypatch.delenv(key, raising=False)
+        else:
+            monkeypatch.setenv(key, value)
+    # 저장된 로그인 세션 파일을 건드리지 않도록
+    monkeypatch.chdir(tmp_path)
+    import macro_core
+
+    # SRT 주소는 import 시점에 SRT_BASE_URL로 정해지므로 이미 import된 경우 직접 바꿈
+    monkeypatch.setattr(macro_core, "LOGIN_URL", mock_server + "/cmc/01/selectLoginForm.do")
+    monkeypatch.setattr(macro_core, "SEARCH_URL", mock_server + "/hpg/hra/01/selectScheduleList.do")
+    monkeypatch.setattr(
+        macro_core, "RESERVATION_URL", mock_server + "/hpg/hra/02/selectReservationList.do?pageId=TK0102010000"
+    )
+    return macro_core
+
+
+@pytest.mark.parametrize("scan_mode", ["dom", "watch", "response", "http"])
+def test_main_reserves_on_mock_server(macro_core, mock_server, scan_mode):
+    config = MockConfig(latency=0.02, jitter=0.01, rows=4, release=RELEASE, release_row=2, release_col=7)
+    result = run_mode(macro_core, mock_server, config, scan_mode, TIMEOUT, verbose=False)
+
+    assert result["error"] is None
+    assert result["reserved"]
+    assert result["searches"] > 1
+    assert result["cycles_per_s"] is not None and result["cycles_per_s"] > 0
+    assert result["time_to_first_scan"] is not None and 0 < result["time_to_first_scan"] < TIMEOUT
+    assert result["release_to_click"] is not None and result["release_to_click"] >= 0
@@ -0,0 +1,108 @@
+"""/start가 바로 돌아오고, 워커가 보낸 시작 단계가 작업 상태에 쌓이는지 테스트."""
+
+import time
+from typing import Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api_server
+import macro_core
+from api_server import JobManager, StatusMonitor
+
+FORM = {
+    "arrival": "동대구",
+    "departure": "수서",
+    "standard_date": "20261020",
+    "standard_time": "18",
+}
+
+
+def worker_until_scanning(**kwargs) -> None:
+    """브라우저 대신 단계 이벤트만 보내고 조회 중인 척 기다리는 워커."""
+    macro_core.set_job_queues(kwargs["status_q"], kwargs["logs_q"])
+    for stage in (macro_core.STAGE_BROWSER_LAUNCHED, macro_core.STAGE_LOGGED_IN,
+                  macro_core.STAGE_SEARCH_READY, macro_core.STAGE_SCANNING):
+        time.sleep(0.05)
+        macro_core.report_stage(stage)
+    time.sleep(30)
+
+
+def worker_failing_login(**kwargs) -> None:
+    macro_core.set_job_queues(kwargs["status_q"], kwargs["logs_q"])
+    macro_core.report_stage(macro_core.STAGE_BROWSER_LAUNCHED)
+    try:
+        macro_core.log_error("로그인 실패", exit_on_error=True)
+    except RuntimeError:
+        pass
+
+
+def worker_exiting_early(**kwargs) -> None:
+    macro_core.set_job_queues(kwargs["status_q"], kwargs["logs_q"])
+    macro_core.report_stage(macro_core.STAGE_BROWSER_LAUNCHED)
+    macro_core.report_status({"status": "finished"})
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    jobs = JobManager(max_jobs=1)
+    monitor = StatusMonitor(jobs, interval=30)
+    monkeypatch.setattr(api_server, "JOBS", jobs)
+    monkeypatch.setattr(api_server, "MONITOR", monitor)
+    monkeypatch.setattr(api_server, "apply_env_vars_to_os", lambda: None)
+    monkeypatch.setattr(api_server, "check_env_vars", lambda: {"MEMBER_NUMBER": True, "PASSWORD": True})
+    monkeypatch.setenv("DISCORD_WEB_HOOK", "")
+    monitor.start()
+    yield jobs
+    monitor.shutdown()
+    for state in list(jobs.jobs.values()):
+        state.stop()
+
+
+def start(monkeypatch, target) -> Tuple[TestClient, str]:
+    monkeypatch.setattr(api_server, "run_macro", target)
+    client = TestClient(api_server.app)
+    started = time.monotonic()
+    response = client.post("/start", data=FORM)
+    # 예전처럼 status_q를 기다리지 않고 바로 응답
+    assert time.monotonic() - started < 2
+    assert response.status_code == 200 and "매크로가 시작되었습니다" in response.text
+    (job_id,) = api_server.JOBS.jobs
+    return client, job_id
+
+
+def wait_for_status(client: TestClient, job_id: str, predicate, timeout: float = 10) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        status = client.get(f"/jobs/{job_id}/status").json()
+        if predicate(status):
+            return status
+        assert time.monotonic() < deadline, status
+        time.sleep(0.05)
+
+
+def test_stages_are_recorded_in_order(jobs, monkeypatch):
+    client, job_id = start(monkeypatch, worker_until_scanning)
+
+    status = wait_for_status(client, job_id, lambda s: s["job"]["stage"] == macro_core.STAGE_SCANNING)
+    stages = status["job"]["stages"]
+    assert list(stages) == [macro_core.STAGE_BROWSER_LAUNCHED, macro_core.STAGE_LOGGED_IN,
+                            macro_core.STAGE_SEARCH_READY, macro_core.STAGE_SCANNING]
+    assert list(stages.values()) == sorted(stages.values())
+    assert status["running"] and status["last_error"] is None
+
+
+def test_startup_error_marks_failed_stage(jobs, monkeypatch):
+    client, job_id = start(monkeypatch, worker_failing_login)
+
+    status = wait_for_status(client, job_id, lambda s: not s["running"])
+    assert status["last_error"] == "로그인 실패"
+    assert status["job"]["stage"] == macro_core.STAGE_FAILED
+    assert macro_core.STAGE_BROWSER_LAUNCHED in status["job"]["stages"]
+
+
+def test_exit_before_scanning_is_reported(jobs, monkeypatch):
+    client, job_id = start(monkeypatch, worker_exiting_early)
+
+    status = wait_for_status(client, job_id, lambda s: not s["running"])
+    assert "조회를 시작하기 전에 종료" in status["last_error"]
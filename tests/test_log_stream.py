@@ -0,0 +1,94 @@
+"""SSE 로그 스트림의 Last-Event-ID 이어받기와 링 버퍼 재전송 테스트."""
+
+import asyncio
+
+from starlette.requests import Request
+
+from api_server import LogChannel, _log_stream, _resume_seq
+
+
+def make_request(last_event_id: str = "", query: str = "") -> Request:
+    headers = [(b"last-event-id", last_event_id.encode())] if last_event_id else []
+    return Request({"type": "http", "method": "GET", "path": "/logs", "headers": headers, "query_string": query.encode()})
+
+
+def test_resume_seq_reads_header_then_query():
+    assert _resume_seq(make_request("7")) == 7
+    assert _resume_seq(make_request(query="last_event_id=3")) == 3
+    assert _resume_seq(make_request("7", "last_event_id=3")) == 7
+    assert _resume_seq(make_request()) == -1
+    assert _resume_seq(make_request("abc")) == -1
+
+
+def stream(channel: LogChannel, request: Request, after) -> list:
+    """스트림을 열고 after(channel)를 실행한 뒤 이벤트를 꺼냅니다 (ping 제외)."""
+    async def run():
+        body = _log_stream(channel, request).body_iterator
+        events = [await anext(body)]
+        after(channel)
+        events.append(await asyncio.wait_for(anext(body), 5))
+        await body.aclose()
+        return events
+
+    return asyncio.run(run())
+
+
+def test_resume_replays_backlog_then_streams_live_lines():
+    channel = LogChannel()
+    channel.extend(["a", "b", "c", "d"])
+
+    backlog, live = stream(channel, make_request("2"), lambda ch: ch.append("e"))
+
+    assert backlog == "id: 4\ndata: c\ndata: d\n\n"
+    assert live == "id: 5\ndata: e\n\n"
+    # 스트림을 닫으면 구독이 해제됨
+    assert channel._listeners == []
+
+
+def test_resume_reports_lines_pushed_out_of_the_buffer():
+    channel = LogChannel(maxlen=3)
+    channel.extend([str(n) for n in range(1, 11)])
+
+    async def run():
+        body = _log_stream(channel, make_request("2")).body_iterator
+        events = [await anext(body), await anext(body)]
+        await body.aclose()
+        return events
+
+    notice, backlog = asyncio.run(run())
+    assert "5줄은 이어받지 못했습니다" in notice
+    assert backlog == "id: 10\ndata: 8\ndata: 9\ndata: 10\n\n"
+
+
+def test_first_connect_skips_backlog():
+    channel = LogChannel()
+    channel.extend(["old"])
+
+    connected, live = stream(channel, make_request(), lambda ch: ch.append("new"))
+
+    assert connected == "data: [logs] connected\n\n"
+    assert live == "id: 2\ndata: new\n\n"
+
+
+def test_overflowed_listener_refills_from_ring_buffer():
+    channel = LogChannel()
+
+    async def run():
+        body = _log_stream(channel, make_request()).body_iterator
+        events = [await anext(body)]
+        # 구독자 큐가 넘쳐 중간 배치를 잃은 상황
+        (listener,) = channel._listeners
+        listener.queue = asyncio.Queue(maxsize=1)
+        for line in ("a", "b", "c"):
+            channel.append(line)
+            await asyncio.sleep(0)
+        events.append(await asyncio.wait_for(anext(body), 5))
+        channel.append("d")
+        events.append(await asyncio.wait_for(anext(body), 5))
+        await body.aclose()
+        return events
+
+    _, first, refilled = asyncio.run(run())
+    assert first == "id: 1\ndata: a\n\n"
+    assert channel.dropped == 2
+    assert refilled == "id: 4\ndata: b\ndata: c\ndata: d\n\n"
@@ -0,0 +1,59 @@
+"""LogBatcher 배치 전송 테스트."""
+
+import queue
+
+from log_transport import LogBatcher, unpack
+
+
+def drain(q):
+    records = []
+    while True:
+        try:
+            records.extend(unpack(q.get_nowait()))
+        except queue.Empty:
+            return records
+
+
+def test_lines_are_split_numbered_and_batched():
+    q = queue.Queue()
+    batcher = LogBatcher(q, flush_interval=60)
+    batcher.put("첫 줄\n\n둘째 줄")
+    batcher.put("셋째 줄")
+    assert q.empty()
+    batcher.close()
+
+    batch = q.get_nowait()
+    assert [(seq, text) for seq, _, text in batch] == [(1, "첫 줄"), (2, "둘째 줄"), (3, "셋째 줄")]
+    assert q.empty()
+
+
+def test_repeated_lines_are_kept():
+    q = queue.Queue()
+    batcher = LogBatcher(q, flush_interval=60)
+    batcher.put("[변동] x")
+    batcher.put("[변동] x")
+    batcher.close()
+    assert [text for _, _, text in drain(q)] == ["[변동] x", "[변동] x"]
+
+
+def test_full_batch_is_sent_without_waiting():
+    q = queue.Queue()
+    batcher = LogBatcher(q, flush_interval=60, max_batch=3)
+    for i in range(4):
+        batcher.put(f"line {i}")
+    assert [text for _, _, text in q.get_nowait()] == ["line 0", "line 1", "line 2"]
+    batcher.close()
+    assert [seq for seq, _, _ in q.get_nowait()] == [4]
+
+
+def test_background_flush():
+    q = queue.Queue()
+    batcher = LogBatcher(q, flush_interval=0.01)
+    batcher.put("hello")
+    assert [text for _, _, text in unpack(q.get(timeout=2))] == ["hello"]
+    batcher.close()
+
+
+def test_unpack_plain_string():
+    ((seq, _, text),) = unpack("plain")
+    assert (seq, text) == (0, "plain")
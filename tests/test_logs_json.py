@@ -0,0 +1,80 @@
+"""/logs.json 커서(since/limit) 페이지와 long-poll 대기 테스트."""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api_server
+from api_server import JobManager, LogChannel
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    jobs = JobManager(max_jobs=1)
+    monkeypatch.setattr(api_server, "JOBS", jobs)
+    return jobs
+
+
+def logs(**params) -> dict:
+    response = TestClient(api_server.app).get("/logs.json", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_cursor_pages_through_lines(jobs):
+    jobs.logs.extend(["a", "b", "c", "d", "e"])
+
+    first = logs(limit=2)
+    assert first["lines"] == ["a", "b"] and first["cursor"] == 2 and first["more"]
+    second = logs(since=first["cursor"], limit=2)
+    assert second["lines"] == ["c", "d"] and second["more"]
+    last = logs(since=second["cursor"], limit=2)
+    assert last["lines"] == ["e"] and last["cursor"] == 5 and not last["more"]
+    # 새 줄이 없으면 같은 커서를 돌려줌
+    idle = logs(since=5)
+    assert idle["lines"] == [] and idle["cursor"] == 5 and not idle["more"]
+    assert not last["running"] and last["last_error"] is None
+
+
+def test_missed_counts_lines_pushed_out_of_the_buffer(jobs, monkeypatch):
+    monkeypatch.setattr(jobs, "logs", LogChannel(maxlen=3))
+    jobs.logs.extend([str(n) for n in range(1, 11)])
+
+    page = logs(since=2)
+    assert page["lines"] == ["8", "9", "10"]
+    assert page["missed"] == 5
+    # 처음 요청(since 없음)은 밀려난 줄을 놓친 것으로 보지 않음
+    assert logs()["missed"] == 0
+
+
+def test_cursor_ahead_of_server_restarts_from_zero(jobs):
+    jobs.logs.extend(["a", "b"])
+    page = logs(since=99)
+    assert page["lines"] == ["a", "b"] and page["cursor"] == 2
+
+
+def test_long_poll_returns_when_a_line_arrives(jobs):
+    jobs.logs.extend(["a"])
+    timer = threading.Timer(0.2, jobs.logs.append, ("b",))
+    timer.start()
+    started = time.monotonic()
+    page = logs(since=1, wait=5)
+    elapsed = time.monotonic() - started
+    timer.join()
+
+    assert page["lines"] == ["b"] and page["cursor"] == 2
+    assert 0.1 < elapsed < 4
+
+
+def test_long_poll_times_out_and_is_capped(jobs, monkeypatch):
+    monkeypatch.setattr(api_server, "MAX_LOG_WAIT", 0.2)
+    started = time.monotonic()
+    page = logs(since=0, wait=60)
+    elapsed = time.monotonic() - started
+
+    assert page["lines"] == [] and page["cursor"] == 0
+    assert 0.15 < elapsed < 5
+    # 대기가 끝나면 구독이 해제됨
+    assert jobs.logs._listeners == []
@@ -0,0 +1,104 @@
+"""Discord 웹훅 알림을 로컬 웹훅 대역(stand-in) 서버로 보내는 테스트."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import api_server
+import macro_core
+from api_server import JobManager, StatusMonitor
+from notifier import Notifier
+
+FORM = {"arrival": "동대구", "departure": "수서", "standard_date": "20261020", "standard_time": "18"}
+
+
+class WebhookStandIn(ThreadingHTTPServer):
+    """받은 content를 모으고, fail_first번은 500으로 응답하는 웹훅."""
+
+    daemon_threads = True
+
+    def __init__(self, fail_first: int = 0) -> None:
+        super().__init__(("127.0.0.1", 0), _WebhookHandler)
+        self.fail_first = fail_first
+        self.attempts = 0
+        self.received = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/webhook"
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    server: WebhookStandIn
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.attempts += 1
+        if self.server.attempts <= self.server.fail_first:
+            self.send_response(500)
+        else:
+            self.server.received.append(body["content"])
+            self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def webhook():
+    server = WebhookStandIn(fail_first=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_notifier_retries_and_flushes(webhook):
+    notifier = Notifier(webhook.url, backoff=0.05)
+    assert notifier.notify("잔여석 감지")
+    assert notifier.flush(timeout=5)
+    notifier.close()
+
+    assert webhook.received == ["잔여석 감지"]
+    assert webhook.attempts == 2
+    assert notifier.sent == 1 and notifier.failed == 0
+
+
+def test_notifier_without_webhook_does_nothing(monkeypatch):
+    monkeypatch.delenv("DISCORD_WEB_HOOK", raising=False)
+    notifier = Notifier()
+    assert not notifier.notify("보낼 곳 없음")
+    assert notifier.flush(timeout=0.1)
+
+
+def worker_failing_login(**kwargs) -> None:
+    macro_core.set_job_queues(kwargs["status_q"], kwargs["logs_q"])
+    macro_core.log_error("로그인 실패", exit_on_error=True)
+
+
+def test_failing_job_delivers_its_alert(webhook, monkeypatch):
+    # 첫 전송이 500이라 재시도(backoff 0.5초) 전에 서버가 워커를 종료하면 알림이 사라짐
+    monkeypatch.setenv("DISCORD_WEB_HOOK", webhook.url)
+    monkeypatch.setattr(api_server, "run_macro", worker_failing_login)
+    jobs = JobManager(max_jobs=1)
+    monitor = StatusMonitor(jobs, interval=30)
+    monkeypatch.setattr(api_server, "MONITOR", monitor)
+    monitor.start()
+    try:
+        state, ok = jobs.start(**FORM)
+        assert ok
+        deadline = time.monotonic() + 10
+        while state.running:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        monitor.shutdown()
+
+    assert state.last_error == "로그인 실패"
+    assert webhook.received == ["❌ SRT 매크로 오류 발생\n\n로그인 실패"]
@@ -0,0 +1,123 @@
+"""ScanPlan 순위/필터/열차번호 고정 테스트."""
+
+import pytest
+
+from preference import PREFERRED_TRAIN_BONUS, Preference, ScanPlan, parse_clock
+from scan_engine import SEAT_AVAILABLE, SEAT_SOLD_OUT, SPECIAL_SEAT_COL, STANDARD_SEAT_COL, TrainRow
+
+A, S = SEAT_AVAILABLE, SEAT_SOLD_OUT
+ENV_VARS = (
+    "MACRO_DEPART_AFTER",
+    "MACRO_DEPART_BEFORE",
+    "MACRO_MAX_TRAVEL_MINUTES",
+    "MACRO_SEAT_WEIGHTS",
+    "MACRO_PREFERRED_TRAINS",
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+
+
+def rows():
+    return [
+        TrainRow(1, "SRT 301", "06:00", A, A, "08:30"),
+        TrainRow(2, "SRT 305", "07:00", S, A, "09:10"),
+        TrainRow(3, "SRT 309", "08:00", A, A, "10:40"),
+        TrainRow(4, "SRT 311", "09:00", A, A, "11:30"),
+    ]
+
+
+def cells(candidates):
+    return [(c.row_idx, c.seat_type) for c in candidates]
+
+
+def test_default_rank_is_row_major_in_seat_list_order():
+    plan = ScanPlan(Preference.from_env(1, 3, [STANDARD_SEAT_COL, SPECIAL_SEAT_COL]))
+    assert cells(plan.rank(rows())) == [(1, 7), (1, 6), (2, 7), (3, 7), (3, 6)]
+
+
+def test_rows_outside_range_are_ignored():
+    plan = ScanPlan(Preference.from_env(2, 2, [SPECIAL_SEAT_COL, STANDARD_SEAT_COL]))
+    assert cells(plan.rank(rows())) == [(2, 7)]
+
+
+def test_departure_window_and_travel_time(monkeypatch):
+    monkeypatch.setenv("MACRO_DEPART_AFTER", "06:30")
+    monkeypatch.setenv("MACRO_MAX_TRAVEL_MINUTES", "150")
+    plan = ScanPlan(Preference.from_env(1, 4, [STANDARD_SEAT_COL]))
+    # 301은 출발 전, 309는 160분, 311은 150분
+    assert cells(plan.rank(rows())) == [(2, 7), (4, 7)]
+
+
+def test_preferred_train_and_seat_weights(monkeypatch):
+    monkeypatch.setenv("MACRO_PREFERRED_TRAINS", "309")
+    monkeypatch.setenv("MACRO_SEAT_WEIGHTS", "special=2,standard=1")
+    plan = ScanPlan(Preference.from_env(1, 3, [STANDARD_SEAT_COL, SPECIAL_SEAT_COL]))
+    ranked = plan.rank(rows())
+    assert cells(ranked)[:2] == [(3, 6), (3, 7)]
+    assert ranked[0].score >= PREFERRED_TRAIN_BONUS
+
+
+def test_selectors_are_precompiled():
+    plan = ScanPlan(Preference.from_env(1, 1, [STANDARD_SEAT_COL]))
+    (candidate,) = plan.rank(rows())
+    assert candidate.selector == plan.targets[0].selector
+    assert "tr:nth-child(1) > td:nth-child(7)" in candidate.selector
+
+
+def test_pinned_plan_follows_train_numbers_when_rows_shift():
+    plan = ScanPlan(Preference.from_env(1, 2, [STANDARD_SEAT_COL])).pin(rows())
+    assert plan.pinned == {"301": 1, "305": 2}
+    shifted = [TrainRow(1, "SRT 299", "05:30", A, A, "07:30")] + [r._replace(row_idx=r.row_idx + 1) for r in rows()]
+
+    ranked = plan.rank(shifted)
+    assert [(c.row_idx, c.train_label) for c in ranked] == [(2, "SRT 301 06:00"), (3, "SRT 305 07:00")]
+    assert "tr:nth-child(3)" in ranked[1].selector
+
+
+def test_rank_hits_uses_plan_order():
+    plan = ScanPlan(Preference.from_env(1, 3, [STANDARD_SEAT_COL]))
+    hits = [{"row": 3, "col": 7, "trainNo": "SRT 309"}, {"row": 1, "col": 7, "trainNo": "SRT 301"}, {"row": 9, "col": 7}]
+    assert cells(plan.rank_hits(hits)) == [(1, 7), (3, 7)]
+
+
+def test_parse_clock():
+    assert parse_clock("07:30") == 450
+    assert parse_clock("7") == 420
+    assert parse_clock("") is None
+
+
+@pytest.mark.parametrize("value", ["7시", "25:00", "07:75"])
+def test_parse_clock_rejects_malformed(value):
+    with pytest.raises(ValueError):
+        parse_clock(value)
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [
+        ("MACRO_SEAT_WEIGHTS", "special=two"),
+        ("MACRO_SEAT_WEIGHTS", "first=2"),
+        ("MACRO_MAX_TRAVEL_MINUTES", "2h"),
+        ("MACRO_MAX_TRAVEL_MINUTES", "0"),
+        ("MACRO_DEPART_AFTER", "07-30"),
+    ],
+)
+def test_malformed_env_names_the_variable(monkeypatch, name, value):
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError, match=name):
+        Preference.from_env(1, 3, [STANDARD_SEAT_COL])
+
+
+def test_weights_skip_blank_items_and_unselected_classes(monkeypatch):
+    monkeypatch.setenv("MACRO_SEAT_WEIGHTS", "special=2,, standard=0.5 ,")
+    assert Preference.from_env(1, 1, [STANDARD_SEAT_COL]).seat_weights == ((STANDARD_SEAT_COL, 0.5),)
+
+
+def test_rank_hits_reports_a_reopened_cell_once():
+    plan = ScanPlan(Preference.from_env(1, 3, [STANDARD_SEAT_COL]))
+    hits = [{"row": 1, "col": 7, "trainNo": "SRT 301"}, {"row": 1, "col": 7, "trainNo": "SRT 301"}]
+    assert cells(plan.rank_hits(hits)) == [(1, 7)]
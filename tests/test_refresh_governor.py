@@ -0,0 +1,82 @@
+"""새로고침 간격 조절기(토큰 버킷 + 백오프) 테스트."""
+
+import asyncio
+
+import pytest
+
+import refresh_governor
+from refresh_governor import FAST_CYCLE_SECONDS, MAX_BACKOFF, RefreshGovernor
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """refresh_governor가 보는 time.monotonic을 손으로 움직이는 시계."""
+    now = [1000.0]
+    monkeypatch.setattr(refresh_governor.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_token_bucket_allows_burst_then_paces(clock):
+    governor = RefreshGovernor(target_per_minute=60, burst=2, jitter=0)
+    assert governor._take() == 0.0
+    assert governor._take() == 0.0
+    # 토큰이 떨어지면 1초(분당 60회)에 하나씩
+    assert governor._take() == pytest.approx(1.0)
+    clock[0] += 1.0
+    assert governor._take() == pytest.approx(1.0)
+
+
+def test_popup_or_timeout_doubles_backoff_up_to_max(clock):
+    governor = RefreshGovernor(target_per_minute=60, jitter=0)
+    governor.note_waiting_popup()
+    governor.record_cycle(0.1)
+    assert governor.backoff == 2.0
+    assert governor.rate == pytest.approx(0.5)
+    for _ in range(10):
+        governor.note_timeout()
+        governor.record_cycle(0.1)
+    assert governor.backoff == MAX_BACKOFF
+
+
+def test_backoff_recovers_faster_on_fast_cycles(clock):
+    governor = RefreshGovernor(jitter=0)
+    governor.backoff = 8.0
+    governor.record_cycle(FAST_CYCLE_SECONDS + 1)
+    assert governor.backoff == pytest.approx(6.4)
+    governor.record_cycle(FAST_CYCLE_SECONDS / 2)
+    assert governor.backoff == pytest.approx(3.2)
+    for _ in range(5):
+        governor.record_cycle(0.1)
+    assert governor.backoff == 1.0
+
+
+def test_signals_apply_to_one_cycle_only(clock):
+    governor = RefreshGovernor(jitter=0)
+    governor.note_waiting_popup()
+    governor.record_cycle(0.1)
+    governor.record_cycle(0.1)
+    assert governor.backoff == 1.0
+
+
+def test_achieved_rate_and_snapshot(clock):
+    governor = RefreshGovernor(target_per_minute=30, jitter=0)
+    for _ in range(4):
+        governor.record_cycle(0.5)
+        clock[0] += 2.0
+    assert governor.achieved_per_minute() == pytest.approx(30.0)
+    snapshot = governor.snapshot()
+    assert snapshot["target_per_minute"] == 30.0
+    assert snapshot["cycle_latency"] == 0.5
+    assert snapshot["backoff"] == 1.0
+
+
+def test_wait_sleeps_for_the_bucket_delay():
+    governor = RefreshGovernor(target_per_minute=6000, burst=1, jitter=0)
+
+    async def run():
+        return [await governor.wait() for _ in range(3)]
+
+    delays = asyncio.run(run())
+    assert delays[0] == 0.0
+    assert all(0 < delay <= 0.011 for delay in delays[1:])
+    assert governor.last_delay == delays[-1]
@@ -0,0 +1,121 @@
+"""예약 버튼 클릭 후 결과 판정(wait_for_reserve_outcome) 테스트.
+
+판정 스크립트(RESERVE_OUTCOME_JS)는 실제 브라우저에서 확인하고, 브라우저가 없으면 건너뜁니다.
+"""
+
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from scan_engine import (
+    PAYMENT_TEXT,
+    RESERVE_FAILURE_TEXTS,
+    RESERVE_OUTCOME_JS,
+    RESERVE_SUCCESS_SELECTOR,
+    RESULT_TABLE_SELECTOR,
+    STANDARD_SEAT_COL,
+    ReserveOutcome,
+    click_reserve_button,
+    wait_for_reserve_outcome,
+)
+
+ORIGIN = "https://srt.test"
+
+
+class FakeHandle:
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+    async def json_value(self) -> str:
+        return self.value
+
+
+class FakePage:
+    def __init__(self, value: str = "") -> None:
+        self.value = value
+        self.calls = []
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        self.calls.append((script, arg, timeout))
+        if not self.value:
+            raise PlaywrightTimeoutError("timeout")
+        return FakeHandle(self.value)
+
+
+@pytest.mark.parametrize("outcome", [ReserveOutcome.SUCCESS, ReserveOutcome.SOLD_OUT, ReserveOutcome.RESULTS])
+def test_outcome_is_decided_by_a_single_wait(outcome):
+    page = FakePage(outcome.value)
+    assert asyncio.run(wait_for_reserve_outcome(page, timeout=1234)) is outcome
+    (call,) = page.calls
+    assert call == (
+        RESERVE_OUTCOME_JS,
+        [RESULT_TABLE_SELECTOR, RESERVE_SUCCESS_SELECTOR, PAYMENT_TEXT, list(RESERVE_FAILURE_TEXTS)],
+        1234,
+    )
+
+
+def test_nothing_appearing_is_a_timeout():
+    assert asyncio.run(wait_for_reserve_outcome(FakePage(), timeout=10)) is ReserveOutcome.TIMEOUT
+
+
+def results_page(href: str = "/reserve", onclick: str = "") -> str:
+    cells = "<td></td>" * (STANDARD_SEAT_COL - 1)
+    link = f"<a href='{href}' onclick=\"{onclick}\"><span>예약하기</span></a>"
+    return f"<html><body><form id='result-form'><table><tbody><tr>{cells}<td>{link}</td></tr></tbody></table></form></body></html>"
+
+
+PAYMENT_PAGE = "<html><head><title>결제</title></head><body><div class='payment'><input type='button' value='결제하기'></div></body></html>"
+SOLD_OUT_PAGE = "<html><head><title>예약 실패</title></head><body><p>잔여석이 없습니다.</p></body></html>"
+
+
+def run_click(results_html: str, reserve_html: str = "", timeout: float = 5000) -> ReserveOutcome:
+    """결과 페이지에서 예약 버튼을 누르고 판정 결과를 돌려줍니다. /reserve는 reserve_html로 응답."""
+    from playwright.async_api import async_playwright
+
+    async def fulfill(route):
+        path = route.request.url[len(ORIGIN):]
+        body = results_html if path == "/results" else reserve_html
+        await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=body)
+
+    async def run():
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=True)
+            try:
+                page = await browser.new_page()
+                await page.route(f"{ORIGIN}/**", fulfill)
+                await page.goto(f"{ORIGIN}/results")
+                assert await click_reserve_button(page, 1, STANDARD_SEAT_COL)
+                return await wait_for_reserve_outcome(page, timeout=timeout)
+            finally:
+                await browser.close()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.usefixtures("require_browser")
+@pytest.mark.parametrize(
+    "reserve_html, expected",
+    [
+        (PAYMENT_PAGE, ReserveOutcome.SUCCESS),
+        (SOLD_OUT_PAGE, ReserveOutcome.SOLD_OUT),
+        # 예약 없이 결과 테이블로 돌아옴
+        (results_page(), ReserveOutcome.RESULTS),
+    ],
+    ids=["payment", "sold-out", "back-to-results"],
+)
+def test_outcome_after_navigation(reserve_html, expected):
+    assert run_click(results_page(), reserve_html) is expected
+
+
+@pytest.mark.usefixtures("require_browser")
+def test_alert_without_navigation_stays_on_results():
+    html = results_page(href="#", onclick="alert('잔여석이 없습니다'); return false;")
+    assert run_click(html) is ReserveOutcome.RESULTS
+
+
+@pytest.mark.usefixtures("require_browser")
+def test_clicked_page_that_never_changes_times_out():
+    # 클릭한 문서에 머무는 동안은 결과 테이블이 보여도 '복귀'로 보지 않음
+    html = results_page(href="#", onclick="return false;")
+    assert run_click(html, timeout=300) is ReserveOutcome.TIMEOUT
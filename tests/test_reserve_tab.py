@@ -0,0 +1,104 @@
+"""보조 탭 예약(ReserveTab.wait_outcome)이 timeout을 한 번만 쓰는지 테스트 (브라우저 없이 가짜 페이지로)."""
+
+import asyncio
+import time
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+import macro_core
+from macro_core import ReserveTab
+from scan_engine import ReserveOutcome
+
+TIMEOUT_MS = 1000
+
+
+class FakeHandle:
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+    async def json_value(self) -> str:
+        return self.value
+
+
+class FakePage:
+    """wait_for_function이 delay초 뒤 outcome을 돌려주거나, 그 전에 timeout이 지나면 TimeoutError."""
+
+    def __init__(self, outcome: str = "", delay: float = 60.0) -> None:
+        self.outcome = outcome
+        self.delay = delay
+        self.timeouts = []
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        self.timeouts.append(timeout)
+        if not self.outcome or self.delay >= timeout / 1000:
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError("timeout")
+        await asyncio.sleep(self.delay)
+        return FakeHandle(self.outcome)
+
+    async def route(self, *args, **kwargs) -> None:
+        pass
+
+    async def unroute(self, *args, **kwargs) -> None:
+        pass
+
+
+@pytest.fixture
+def no_popup(monkeypatch):
+    async def noop(page):
+        return None
+
+    monkeypatch.setattr(macro_core, "handle_waiting_popup", noop)
+
+
+def run_wait(aux: FakePage, capture_after: float, replay_delay: float = 0.0):
+    """capture_after초 뒤 조회 페이지의 이동 요청을 가로챈 것으로 하고 wait_outcome을 실행합니다."""
+    scan = FakePage()
+    tab = ReserveTab(context=None, scan_page=scan)
+    tab.page = aux
+
+    async def replay(request) -> None:
+        await asyncio.sleep(replay_delay)
+
+    tab._replay = replay
+
+    async def run():
+        tab._captured = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_later(capture_after, tab._captured.set_result, "request")
+        started = time.monotonic()
+        outcome = await tab.wait_outcome("#result", timeout=TIMEOUT_MS)
+        return outcome, time.monotonic() - started
+
+    outcome, elapsed = asyncio.run(run())
+    assert tab._captured is None
+    return outcome, elapsed
+
+
+def test_aux_tab_wait_uses_the_remaining_budget(no_popup):
+    aux = FakePage()
+    outcome, elapsed = run_wait(aux, capture_after=0.6)
+
+    assert outcome is ReserveOutcome.TIMEOUT
+    # 예전에는 가로채기까지 0.6초 + 보조 탭 1초를 기다림
+    assert elapsed < 1.3
+    (aux_timeout,) = aux.timeouts
+    assert aux_timeout <= 450
+
+
+def test_slow_replay_returns_timeout_at_the_deadline(no_popup):
+    outcome, elapsed = run_wait(FakePage("success", delay=0.0), capture_after=0.1, replay_delay=5.0)
+    assert outcome is ReserveOutcome.TIMEOUT
+    assert elapsed < 1.3
+
+
+def test_outcome_within_the_deadline(no_popup):
+    outcome, elapsed = run_wait(FakePage("success", delay=0.1), capture_after=0.2)
+    assert outcome is ReserveOutcome.SUCCESS
+    assert elapsed < 0.9
+
+
+def test_no_capture_times_out_once():
+    outcome, elapsed = run_wait(FakePage(), capture_after=5.0)
+    assert outcome is ReserveOutcome.TIMEOUT
+    assert elapsed < 1.3
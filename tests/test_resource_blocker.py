@@ -0,0 +1,93 @@
+"""리소스 차단 프로필과 사이클별 차단/수신 통계 테스트."""
+
+import asyncio
+
+import pytest
+
+from cycle_metrics import MetricsRegistry, PhaseTimer
+from macro_core import BLOCK_PROFILE_AGGRESSIVE, BLOCK_PROFILE_MEDIA, BLOCK_PROFILE_NONE, ResourceBlocker
+
+
+class FakeRequest:
+    def __init__(self, resource_type: str, url: str) -> None:
+        self.resource_type = resource_type
+        self.url = url
+
+
+class FakeRoute:
+    def __init__(self, resource_type: str, url: str = "https://etk.srail.kr/static/a") -> None:
+        self.request = FakeRequest(resource_type, url)
+        self.result = None
+
+    async def fallback(self) -> None:
+        self.result = "fallback"
+
+    async def abort(self, error_code: str) -> None:
+        self.result = error_code
+
+
+class FakeResponse:
+    def __init__(self, length: int) -> None:
+        self.headers = {"content-length": str(length)}
+
+
+def route(blocker: ResourceBlocker, resource_type: str, url: str = "https://etk.srail.kr/static/a") -> str:
+    fake = FakeRoute(resource_type, url)
+    asyncio.run(blocker._handle_route(fake))
+    return fake.result
+
+
+def test_media_profile_blocks_only_media_types():
+    blocker = ResourceBlocker(BLOCK_PROFILE_MEDIA)
+    assert route(blocker, "image") == "blockedbyclient"
+    assert route(blocker, "font") == "blockedbyclient"
+    assert route(blocker, "stylesheet") == "fallback"
+    assert route(blocker, "script", "https://tracker.example.com/t.js") == "fallback"
+
+
+def test_aggressive_profile_blocks_third_party_but_not_documents():
+    blocker = ResourceBlocker(BLOCK_PROFILE_AGGRESSIVE)
+    assert route(blocker, "stylesheet") == "blockedbyclient"
+    assert route(blocker, "script", "https://tracker.example.com/t.js") == "blockedbyclient"
+    assert route(blocker, "script", "https://etk.srail.kr/js/app.js") == "fallback"
+    assert route(blocker, "document", "https://other.example.com/") == "fallback"
+
+
+def test_unknown_profile_falls_back_to_none():
+    assert not ResourceBlocker("bogus").enabled
+    assert ResourceBlocker("bogus").profile == BLOCK_PROFILE_NONE
+
+
+def test_stats_are_taken_per_cycle_and_reach_metrics():
+    blocker = ResourceBlocker(BLOCK_PROFILE_MEDIA)
+    timer = PhaseTimer()
+    registry = MetricsRegistry()
+
+    route(blocker, "image")
+    route(blocker, "image")
+    blocker._on_response(FakeResponse(1024))
+    first = blocker.record_cycle(timer)
+    assert first == {"blocked": {"image": 2}, "blocked_total": 2, "received": 1, "received_bytes": 1024}
+
+    # 다음 사이클은 0부터 다시 셈
+    route(blocker, "font")
+    second = blocker.record_cycle(timer)
+    assert second["blocked"] == {"font": 1} and second["received"] == 0
+
+    registry.add_counters(timer.drain_counters())
+    assert registry.counter_summary() == {
+        "blocked_requests": {"font": 1, "image": 2},
+        "received_bytes": 1024,
+        "received_responses": 1,
+    }
+    body = registry.render_prometheus()
+    assert 'srt_macro_blocked_requests_total{type="image"} 2.0' in body
+    assert "srt_macro_received_bytes_total 1024.0" in body
+    assert ResourceBlocker.format_stats(first) == "차단 2건 (image 2), 수신 1건/1.0KB"
+
+
+@pytest.mark.parametrize("profile", [BLOCK_PROFILE_MEDIA, BLOCK_PROFILE_AGGRESSIVE])
+def test_first_party_suffix_covers_srt_hosts(profile):
+    blocker = ResourceBlocker(profile)
+    assert not blocker._is_third_party("https://etk.srail.kr/x")
+    assert not blocker._is_third_party("https://etk.srail.co.kr/x")
@@ -0,0 +1,143 @@
+"""run_search/run_search_windows가 취소되어도 탭·HTTP 세션·관측 세션을 정리하는지 (브라우저 없이 가짜 페이지로)."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+import macro_core
+from scan_engine import SEAT_SOLD_OUT, TrainRow
+from seat_history import SEAT_UNOBSERVED, SeatHistory
+
+ROWS = [TrainRow(1, "SRT 301", "06:00", SEAT_SOLD_OUT, SEAT_SOLD_OUT, "08:30")]
+
+
+class FakePage:
+    def __init__(self, context: "FakeContext") -> None:
+        self.context = context
+        self.closed = False
+        self.url = "about:blank"
+
+    def on(self, event, handler) -> None:
+        pass
+
+    async def goto(self, url, **kwargs) -> None:
+        self.url = url
+
+    async def wait_for_selector(self, selector, **kwargs) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.pages = []
+
+    async def new_page(self) -> FakePage:
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+
+class FakeHttpClient:
+    fields = []
+
+    def __init__(self) -> None:
+        self.searches = 0
+        self.closed = False
+
+    def search(self):
+        self.searches += 1
+        return list(ROWS)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fakes(monkeypatch, tmp_path):
+    """조회 페이지 조작을 가짜로 바꾸고, 좌석 이력은 임시 DB에 기록합니다."""
+    clients = []
+
+    async def from_page(page, url, fields):
+        clients.append(FakeHttpClient())
+        return clients[-1]
+
+    async def noop(*args, **kwargs):
+        return None
+
+    async def scan(page, selector):
+        return list(ROWS)
+
+    history = SeatHistory(str(tmp_path / "seat_history.db"), flush_interval=0.01)
+    monkeypatch.setattr(macro_core.HttpScheduleClient, "from_page", staticmethod(from_page))
+    monkeypatch.setattr(macro_core, "search_schedule", noop)
+    monkeypatch.setattr(macro_core, "scan_result_table", scan)
+    monkeypatch.setattr(macro_core, "HISTORY", history)
+    monkeypatch.setattr(macro_core, "DEFAULT_REFRESH_BUDGET", 600.0)
+    monkeypatch.setenv("MACRO_RESERVE_MODE", macro_core.RESERVE_MODE_TAB)
+    yield clients, history
+    history.close()
+
+
+def unobserved_sessions(history: SeatHistory) -> int:
+    assert history.flush(timeout=5)
+    with sqlite3.connect(history.path) as conn:
+        return conn.execute(
+            "SELECT COUNT(DISTINCT session) FROM seat_events WHERE state = ?", (SEAT_UNOBSERVED,)
+        ).fetchone()[0]
+
+
+async def wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_cancelled_search_releases_tab_http_client_and_history(fakes):
+    clients, history = fakes
+    context = FakeContext()
+
+    async def run():
+        page = await context.new_page()
+        task = asyncio.create_task(macro_core.run_search(context, page, scan_mode=macro_core.SCAN_MODE_HTTP))
+        await wait_until(lambda: clients and clients[0].searches >= 1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return page
+
+    scan_page = asyncio.run(run())
+    (client,) = clients
+    assert client.closed
+    # 조회 페이지는 호출한 쪽 소유, 예약용 보조 탭만 닫힘
+    reserve_page = context.pages[1]
+    assert reserve_page.closed and not scan_page.closed
+    assert unobserved_sessions(history) == 1
+
+
+def test_cancelling_windows_closes_every_tab(fakes):
+    clients, history = fakes
+    context = FakeContext()
+
+    async def run():
+        page = await context.new_page()
+        task = asyncio.create_task(macro_core.run_search_windows(
+            context, page, standard_date="20261020", standard_time="18", time_windows="20, 22",
+            scan_mode=macro_core.SCAN_MODE_HTTP,
+        ))
+        await wait_until(lambda: len(clients) == 3 and all(c.searches for c in clients))
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return page
+
+    first_page = asyncio.run(run())
+    assert all(client.closed for client in clients)
+    # 첫 시간대는 넘겨받은 페이지를 그대로 쓰고, 나머지 탭과 예약용 보조 탭은 모두 닫힘
+    assert not first_page.closed
+    assert all(page.closed for page in context.pages if page is not first_page)
+    assert unobserved_sessions(history) == 3
@@ -0,0 +1,75 @@
+"""결과 HTML 파서 테스트 (lxml 경로와 표준 라이브러리 경로가 같은 행을 돌려주는지)."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import scan_engine
+from mock_srt_server import LOGIN_SUBMIT_PATH, SEARCH_PATH, MockConfig, MockSrt, create_app
+from scan_engine import SEAT_AVAILABLE, SEAT_NONE, SEAT_SOLD_OUT, TrainRow, parse_result_html, train_key
+
+PARSERS = ["stdlib", "lxml"]
+
+
+def _row(no: int, dep: str, arr: str, special: str, standard: str) -> str:
+    return (
+        f"<tr><td>일반</td><td>SRT</td><td>SRT {no}</td><td>수서<br>{dep}</td><td>부산<br>{arr}</td>"
+        f"<td>{special}</td><td>{standard}</td></tr>"
+    )
+
+
+RESERVE = "<a href='#'><span>예약하기</span></a>"
+ROWS = _row(301, "06:00", "08:30", "매진", RESERVE) + _row(305, "07:00", "09:10", "매진", "매진")
+EXPECTED = [
+    TrainRow(1, "SRT 301", "06:00", SEAT_SOLD_OUT, SEAT_AVAILABLE, "08:30"),
+    TrainRow(2, "SRT 305", "07:00", SEAT_SOLD_OUT, SEAT_SOLD_OUT, "09:10"),
+]
+
+
+@pytest.fixture(params=PARSERS)
+def parser(request, monkeypatch):
+    if request.param == "lxml":
+        pytest.importorskip("lxml.html")
+    else:
+        monkeypatch.setattr(scan_engine, "lxml_html", None)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        f"<form id='result-form'><table><tbody>{ROWS}</tbody></table></form>",
+        f"<form id='result-form'><table>{ROWS}</table></form>",
+        f"<form id='result-form'><table><thead><tr><th>구분</th></tr></thead><tbody>{ROWS}</tbody></table></form>",
+        f"<form id='result-form'><table><thead><tr><th>구분</th></tr></thead>{ROWS}</table></form>",
+    ],
+    ids=["tbody", "no-tbody", "thead-tbody", "thead-no-tbody"],
+)
+def test_parse_result_html(parser, html):
+    assert parse_result_html(html) == EXPECTED
+
+
+def test_parse_ignores_tables_outside_result_form(parser):
+    html = f"<table><tbody>{_row(999, '01:00', '02:00', RESERVE, RESERVE)}</tbody></table>"
+    html += f"<form id='result-form'><table><tbody>{ROWS}</tbody></table></form>"
+    assert parse_result_html(html) == EXPECTED
+
+
+def test_parse_without_result_form(parser):
+    assert parse_result_html("<p>접속대기 중입니다</p>") == []
+
+
+def test_missing_seat_cells_are_none(parser):
+    html = "<form id='result-form'><table><tbody><tr><td>일반</td><td>SRT</td><td>SRT 309</td></tr></tbody></table></form>"
+    assert parse_result_html(html) == [TrainRow(1, "SRT 309", "", SEAT_NONE, SEAT_NONE, "")]
+
+
+def test_parse_mock_server_schedule(parser):
+    mock = MockSrt(MockConfig(latency=0, jitter=0, rows=4, release="after:0", release_row=2, release_col=7))
+    client = TestClient(create_app(mock))
+    client.post(LOGIN_SUBMIT_PATH, follow_redirects=False)
+    html = client.post(SEARCH_PATH, data={"dptDt": "20260101", "dptTm": "060000"}).text
+
+    rows = parse_result_html(html)
+    assert [train_key(row.train_no) for row in rows] == ["301", "302", "303", "304"]
+    assert [(row.row_idx, row.standard) for row in rows if row.standard == SEAT_AVAILABLE] == [(2, SEAT_AVAILABLE)]
+    assert rows[0].departure == "06:00" and rows[0].arrival == "08:00"
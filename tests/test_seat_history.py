@@ -0,0 +1,82 @@
+"""좌석 변동 이력 저장소와 열림 구간 조회 테스트."""
+
+import pytest
+
+from scan_engine import SEAT_AVAILABLE, SEAT_SOLD_OUT, TrainRow
+from seat_history import SeatHistory, seat_openings
+from seat_snapshot import SnapshotTracker
+
+A, S = SEAT_AVAILABLE, SEAT_SOLD_OUT
+ROUTE, DATE = "수서-부산", "20261020"
+
+
+def table(standard_301: str, special_305: str = S):
+    return [TrainRow(1, "SRT 301", "06:00", S, standard_301), TrainRow(2, "SRT 305", "07:00", special_305, S)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "seat_history.db")
+    history = SeatHistory(path, flush_interval=0.01)
+    yield path, history
+    history.close()
+
+
+def observe(history, snapshots, end=True):
+    """(시각, 행 목록) 순서대로 세션 하나를 기록합니다."""
+    tracker = SnapshotTracker()
+    session = history.session(ROUTE, DATE)
+    for at, rows in snapshots:
+        changes = tracker.update(rows, at)
+        if not session.started:
+            session.start(tracker.last)
+        session.record(changes)
+    if end:
+        session.end(tracker.last)
+    assert history.flush(timeout=5)
+
+
+def test_openings_with_durations(store):
+    path, history = store
+    observe(history, [(1000, table(S)), (1010, table(A)), (1040, table(S, A)), (1045, table(S))])
+
+    result = seat_openings(path, "301")
+    assert [(o["seat_class"], o["opened_at"], o["closed_at"], o["ended_by"]) for o in result["openings"]] == [
+        ("standard", 1010, 1040, S),
+    ]
+    assert result["avg_duration"] == 30
+
+    special = seat_openings(path, "305", seat_class="special")
+    assert [(o["opened_at"], o["duration"]) for o in special["openings"]] == [(1040, 5)]
+    assert seat_openings(path, "305", travel_date="20990101")["count"] == 0
+
+
+def test_openings_do_not_span_sessions(store):
+    path, history = store
+    # 작업 A: 열린 채로 종료, 작업 B: 다시 시작했을 때도 열려 있다가 닫힘
+    observe(history, [(1000, table(A))])
+    observe(history, [(5000, table(A)), (5010, table(S))])
+
+    result = seat_openings(path, "301")
+    assert [(o["opened_at"], o["closed_at"], o["ended_by"]) for o in result["openings"]] == [
+        (1000, 1000, "session_end"),
+        (5000, 5010, S),
+    ]
+    # 관측 종료로 닫힌 구간은 평균에서 제외
+    assert result["avg_duration"] == 10
+
+
+def test_killed_session_leaves_interval_open(store):
+    path, history = store
+    observe(history, [(1000, table(A))], end=False)
+    observe(history, [(5000, table(A)), (5010, table(S))])
+
+    openings = seat_openings(path, "301")["openings"]
+    assert [(o["opened_at"], o["closed_at"]) for o in openings] == [(1000, None), (5000, 5010)]
+
+
+def test_special_seat_class_uses_column_name(store):
+    path, history = store
+    observe(history, [(1, table(S)), (2, table(S, A))])
+    (opening,) = seat_openings(path, "305")["openings"]
+    assert opening["seat_class"] == "special"
@@ -0,0 +1,38 @@
+"""열차번호 기준 스냅샷 변동 감지 테스트."""
+
+from scan_engine import SEAT_AVAILABLE, SEAT_SOLD_OUT, SPECIAL_SEAT_COL, STANDARD_SEAT_COL, TrainRow, train_key
+from seat_snapshot import Snapshot, SnapshotTracker, diff_snapshots
+
+A, S = SEAT_AVAILABLE, SEAT_SOLD_OUT
+
+
+def table(standard_301: str, special_305: str = S):
+    return [TrainRow(1, "SRT 301", "06:00", S, standard_301), TrainRow(2, "SRT 305", "07:00", special_305, S)]
+
+
+def test_train_key():
+    assert train_key("SRT\n 301") == "301"
+    assert train_key("") == ""
+
+
+def test_tracker_reports_only_transitions():
+    tracker = SnapshotTracker()
+    assert tracker.update(table(S), 1) == []
+    assert tracker.update(table(S), 2) == []
+    (change,) = tracker.update(table(A), 3)
+    assert (change.train_key, change.seat_type, change.before, change.after, change.at) == ("301", STANDARD_SEAT_COL, S, A, 3)
+    assert change.opened
+    # 행이 밀려도 열차번호로 비교
+    shifted = [TrainRow(1, "SRT 299", "05:00", A, A)] + [r._replace(row_idx=r.row_idx + 1) for r in table(A)]
+    assert tracker.update(shifted, 4) == []
+    # 빈 스캔은 건너뜀
+    assert tracker.update([], 5) == []
+    assert tracker.snapshots == 4
+
+
+def test_diff_ignores_trains_that_appear_or_disappear():
+    before = Snapshot(table(S), 1)
+    after = Snapshot([TrainRow(1, "SRT 305", "07:00", A, S), TrainRow(2, "SRT 311", "09:00", A, A)], 2)
+    (change,) = diff_snapshots(before, after)
+    assert (change.train_key, change.seat_type, change.after) == ("305", SPECIAL_SEAT_COL, A)
+    assert change.describe() == "SRT 305 07:00 특실 매진 → 예약가능"
@@ -0,0 +1,143 @@
+"""watch 모드 좌석 감시(install_seat_watcher/pin_seat_watcher) 테스트.
+
+감시 스크립트는 실제 브라우저에서 확인하고, 브라우저가 없으면 건너뜁니다.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from scan_engine import (
+    SEAT_FOUND_BINDING,
+    SPECIAL_SEAT_COL,
+    STANDARD_SEAT_COL,
+    WATCH_PIN_JS,
+    install_seat_watcher,
+    pin_seat_watcher,
+)
+
+ORIGIN = "https://srt.test"
+RESERVE = "<a href='#'><span>예약하기</span></a>"
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.bindings = []
+        self.init_scripts = []
+        self.evaluated = []
+
+    async def expose_binding(self, name, callback) -> None:
+        self.bindings.append(name)
+
+    async def add_init_script(self, script) -> None:
+        self.init_scripts.append(script)
+
+    async def evaluate(self, script, arg=None):
+        self.evaluated.append((script, arg))
+
+
+def watch_config(script: str) -> dict:
+    return json.loads(script.split("const cfg = ", 1)[1].split(";\n", 1)[0])
+
+
+def test_install_passes_train_keys_into_the_init_script():
+    page = FakePage()
+    asyncio.run(install_seat_watcher(page, 1, 3, [STANDARD_SEAT_COL], train_keys=["305", "301", "305"]))
+    (script,) = page.init_scripts
+    config = watch_config(script)
+    assert config["keys"] == ["301", "305"]
+    assert (config["fromRow"], config["toRow"], config["cols"]) == (1, 3, [STANDARD_SEAT_COL])
+    assert page.bindings == [SEAT_FOUND_BINDING]
+
+
+def test_unpinned_install_watches_by_position():
+    page = FakePage()
+    asyncio.run(install_seat_watcher(page, 2, 4, [SPECIAL_SEAT_COL]))
+    assert watch_config(page.init_scripts[0])["keys"] is None
+
+
+def test_pin_applies_to_current_and_later_pages():
+    page = FakePage()
+    asyncio.run(pin_seat_watcher(page, {"305": 2, "301": 1}))
+    assert page.init_scripts == ['window.__srtWatchKeys = ["301", "305"];']
+    assert page.evaluated == [(WATCH_PIN_JS, ["301", "305"])]
+
+
+def _row(no: int, standard: str = "매진") -> str:
+    return (
+        f"<tr><td>일반</td><td>SRT</td><td>SRT {no}</td><td>수서<br>06:00</td><td>부산<br>08:30</td>"
+        f"<td>매진</td><td>{standard}</td></tr>"
+    )
+
+
+def results_page(*rows: str) -> str:
+    return f"<html><body><form id='result-form'><table><tbody>{''.join(rows)}</tbody></table></form></body></html>"
+
+
+# row번째 행의 일반실 셀을 바꿈 (같은 문서에서 나중에 열리거나 닫히는 좌석)
+SET_CELL_JS = """
+([row, html]) => {
+    document.querySelector('#result-form table tbody').children[row - 1].children[6].innerHTML = html;
+}
+"""
+
+
+def run_watch(html: str, scenario, train_keys=None, pin=None):
+    """결과 페이지를 감시하며 scenario(page, hits)를 실행합니다."""
+    from playwright.async_api import async_playwright
+
+    async def fulfill(route):
+        await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html)
+
+    async def run():
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=True)
+            try:
+                page = await browser.new_page()
+                await page.route(f"{ORIGIN}/**", fulfill)
+                hits = await install_seat_watcher(page, 1, 2, [STANDARD_SEAT_COL], train_keys=train_keys)
+                if pin is not None:
+                    await pin_seat_watcher(page, pin)
+                await page.goto(f"{ORIGIN}/results")
+                return await scenario(page, hits)
+            finally:
+                await browser.close()
+
+    return asyncio.run(run())
+
+
+async def wait_hits(hits: list, count: int) -> list:
+    for _ in range(100):
+        if len(hits) >= count:
+            break
+        await asyncio.sleep(0.02)
+    return [(hit["row"], hit["trainNo"]) for hit in hits]
+
+
+@pytest.mark.usefixtures("require_browser")
+@pytest.mark.parametrize("keys", [{"train_keys": ["305"]}, {"pin": {"305": 2}}], ids=["install", "pin"])
+def test_pinned_train_is_matched_after_rows_shift(keys):
+    # 고정 시점에 2번째였던 305가 3번째로 밀림. 위치(1~2행)로 보면 놓침
+    html = results_page(_row(299, RESERVE), _row(301), _row(305, RESERVE))
+
+    async def scenario(page, hits):
+        await asyncio.sleep(0.2)
+        return await wait_hits(hits, 1)
+
+    assert run_watch(html, scenario, **keys) == [(3, "SRT 305")]
+
+
+@pytest.mark.usefixtures("require_browser")
+def test_observer_keeps_reporting_later_transitions():
+    html = results_page(_row(301, RESERVE), _row(303), _row(305))
+
+    async def scenario(page, hits):
+        assert await wait_hits(hits, 1) == [(1, "SRT 301")]
+        # 같은 문서에서 305가 열리고, 301이 닫혔다가 다시 열림
+        await page.evaluate(SET_CELL_JS, [3, RESERVE])
+        await page.evaluate(SET_CELL_JS, [1, "매진"])
+        await page.evaluate(SET_CELL_JS, [1, RESERVE])
+        return await wait_hits(hits, 3)
+
+    assert run_watch(html, scenario, train_keys=["301", "305"]) == [(1, "SRT 301"), (3, "SRT 305"), (1, "SRT 301")]
@@ -0,0 +1,62 @@
+"""HTTP 폴링 백엔드(srt_http)를 목 SRT 서버에 대고 조회하는 테스트."""
+
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+from mock_srt_server import LOGIN_SUBMIT_PATH, SEARCH_PATH, SESSION_COOKIE, MockConfig
+from scan_engine import SEAT_AVAILABLE, SEAT_SOLD_OUT
+from srt_http import HttpScheduleClient, SessionExpiredError, build_search_fields
+
+FIELDS = build_search_fields("수서", "동대구", "20261020", "180000")
+
+
+@pytest.fixture
+def server(mock_srt):
+    base_url, mock = mock_srt
+    mock.reset(MockConfig(latency=0, jitter=0, rows=4, release="after:0", release_row=2, release_col=7))
+    return base_url, mock
+
+
+def browser_cookies(base_url: str) -> list:
+    """Playwright context.cookies() 형식의 로그인 쿠키."""
+    response = requests.post(base_url + LOGIN_SUBMIT_PATH, allow_redirects=False, timeout=5)
+    return [{
+        "name": SESSION_COOKIE,
+        "value": response.cookies[SESSION_COOKIE],
+        "domain": urlparse(base_url).hostname,
+        "path": "/",
+    }]
+
+
+def test_search_posts_form_with_browser_cookies(server):
+    base_url, mock = server
+    with HttpScheduleClient(base_url + SEARCH_PATH, FIELDS, cookies=browser_cookies(base_url)) as client:
+        rows = client.search()
+        client.search()
+
+    assert [row.train_no for row in rows] == ["301", "302", "303", "304"]
+    assert [row.standard for row in rows] == [SEAT_SOLD_OUT, SEAT_AVAILABLE, SEAT_SOLD_OUT, SEAT_SOLD_OUT]
+    assert rows[0].departure == "06:00"
+    assert mock.stats.searches == 2
+
+
+def test_search_without_session_raises_until_cookies_are_updated(server):
+    base_url, mock = server
+    client = HttpScheduleClient(base_url + SEARCH_PATH, FIELDS)
+    try:
+        with pytest.raises(SessionExpiredError):
+            client.search()
+        assert mock.stats.searches == 0
+
+        # 브라우저 쿠키로 갱신하면 같은 세션으로 다시 조회됨
+        client.update_cookies(browser_cookies(base_url))
+        assert len(client.search()) == 4
+        assert mock.stats.searches == 1
+    finally:
+        client.close()
+
+
+def test_build_search_fields():
+    assert FIELDS == [("dptRsStnCdNm", "수서"), ("arvRsStnCdNm", "동대구"), ("dptDt", "20261020"), ("dptTm", "180000")]
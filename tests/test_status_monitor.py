@@ -0,0 +1,111 @@
+"""StatusMonitor가 끝난 작업 프로세스를 거두고 status_q 메시지를 반영하는지 테스트."""
+
+import multiprocessing as mp
+import sys
+import threading
+import time
+from multiprocessing.connection import wait as wait_connections
+
+import pytest
+
+import macro_core
+from api_server import JobManager, MacroState, StatusMonitor, queue_reader
+
+
+# 감시 스레드가 도는 중에 fork하지 않도록
+SPAWN = mp.get_context("spawn")
+
+
+def watch(jobs: JobManager, job_id: str, target, args=()) -> MacroState:
+    """start()처럼 프로세스와 status_q를 붙여 StatusMonitor 감시 대상으로 만듭니다."""
+    state = MacroState(job_id)
+    state._status_q = mp.Queue()
+    state.proc = SPAWN.Process(target=target, args=args)
+    state.proc.start()
+    state.started_at = time.time()
+    state.current_job = {"id": job_id, "started_at": state.started_at, "stage": None, "stages": {}}
+    state.monitored = True
+    jobs.jobs[job_id] = state
+    return state
+
+
+def wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def monitor():
+    # interval을 길게 두어 sentinel/큐 핸들로 깨어나는지 확인
+    monitor = StatusMonitor(JobManager(max_jobs=2), interval=30)
+    monitor.start()
+    yield monitor
+    monitor.shutdown()
+    for state in monitor.jobs.jobs.values():
+        state.stop()
+
+
+def test_queue_reader_becomes_readable_when_a_message_arrives():
+    q = mp.Queue()
+    reader = queue_reader(q)
+    assert reader is not None
+    assert wait_connections([reader], timeout=0) == []
+    q.put({"status": "stage"})
+    assert wait_connections([reader], timeout=5) == [reader]
+    # _reader가 없는 큐는 폴링 대상
+    assert queue_reader(object()) is None
+
+
+def test_monitor_reaps_exited_job(monitor):
+    state = watch(monitor.jobs, "job1", sys.exit, (3,))
+    monitor.wake()
+
+    wait_until(lambda: not state.running)
+    assert state.last_error == "프로세스가 종료되었습니다. exitcode=3"
+    assert state.current_job["stage"] == macro_core.STAGE_FAILED
+    assert state._status_q is None
+
+
+def test_monitor_applies_error_sent_on_status_q(monitor):
+    state = watch(monitor.jobs, "job1", time.sleep, (30,))
+    monitor.wake()
+    state._status_q.put({"status": "error", "message": "로그인 실패\nTraceback (most recent call last):"})
+
+    wait_until(lambda: not state.running)
+    assert state.last_error == "로그인 실패"
+
+
+def test_refresh_error_is_logged_and_other_jobs_are_still_reaped(monitor):
+    broken = watch(monitor.jobs, "broken", time.sleep, (30,))
+
+    def explode():
+        raise RuntimeError("boom")
+
+    broken.refresh = explode
+    broken._status_q.put({"status": "stage"})
+    healthy = watch(monitor.jobs, "healthy", sys.exit, (0,))
+    monitor.wake()
+
+    wait_until(lambda: not healthy.running)
+    wait_until(lambda: any("boom" in line for _, line in broken.logs.since(0)))
+    assert monitor._thread.is_alive()
+
+
+def test_stop_waits_for_refresh_in_progress():
+    state = MacroState("job1")
+    state.proc = SPAWN.Process(target=time.sleep, args=(30,))
+    state.proc.start()
+    result = []
+    # StatusMonitor가 refresh 중인 상황
+    with state._lock:
+        stopper = threading.Thread(target=lambda: result.append(state.stop()))
+        stopper.start()
+        stopper.join(timeout=0.2)
+        assert stopper.is_alive() and state.running
+    stopper.join(timeout=10)
+    assert result == [True] and not state.running
+    # 이미 정리된 뒤의 refresh/stop은 아무것도 하지 않음
+    state.refresh()
+    assert not state.stop()